@@ -192,6 +192,7 @@ from .misc.enums import (
     DefectType,
     MagnitudeType,
     MultiCyclicCycleSolutions,
+    MultiStartStatus,
     PhaseDynamics,
     OnlineOptim,
     ContactType,
@@ -234,6 +235,7 @@ from .dynamics.state_space_dynamics import (
     JointAccelerationDynamics,
 )
 from .dynamics.state_space_dynamics import StateDynamics, StateDynamicsWithContacts
+from .optimization.loaded_optimal_control_program import LoadedOptimalControlProgram
 from .optimization.multi_start import MultiStart
 from .optimization.non_linear_program import NonLinearProgram
 from .optimization.optimal_control_program import OptimalControlProgram
@@ -247,7 +249,9 @@ from .optimization.receding_horizon_optimization import (
     MultiCyclicNonlinearModelPredictiveControl,
 )
 from .optimization.receding_horizon_optimization import MovingHorizonEstimator, NonlinearModelPredictiveControl
+from .optimization.receding_horizon_export import ExportSink, MemoryExportSink, FileExportSink
 from .optimization.solution.solution import Solution
+from .optimization.solution.loaded_solution import LoadedSolution
 from .optimization.solution.solution_data import SolutionMerge, TimeAlignment
 from .optimization.stochastic_optimal_control_program import StochasticOptimalControlProgram
 from .optimization.variable_scaling import VariableScalingList, VariableScaling
@@ -88,7 +88,6 @@ class NewVariableConfiguration:
             # Therefore, we can exit now
             return
 
-        self._check_for_n_threads_compatibility()
         self._declare_auto_variable_mapping()
 
         self._declare_initial_guess()
@@ -102,10 +101,6 @@ class NewVariableConfiguration:
             self._declare_legend()
         self._declare_cx_and_plot()
 
-    def _check_for_n_threads_compatibility(self) -> None:
-        if self.ocp.n_threads > 1 and self.nlp.phase_dynamics == PhaseDynamics.ONE_PER_NODE:
-            raise RuntimeError("Multiprocessing is not supported with phase_dynamics=PhaseDynamics.ONE_PER_NODE")
-
     def _check_combine_state_control_plot(self) -> None:
         """Check if combine_state_control_plot and combine_name are defined simultaneously"""
         if self.combine_state_control_plot and self.combine_name is not None:
@@ -83,6 +83,7 @@ class Integrator:
         self.defects_type = ode_opt["defects_type"]
         self.control_type = ode_opt["control_type"]
         self.function = None
+        self._mapped_functions = {}
         self.duplicate_starting_point = ode_opt["duplicate_starting_point"]
 
         # Initialize is expected to set step_time
@@ -167,13 +168,16 @@ class Integrator:
 
     def map(self, *args) -> Function:
         """
-        Get the multithreaded CasADi graph of the integration
+        Get the multithreaded CasADi graph of the integration. The mapped graphs are cached since they are requested
+        again each time a solution is integrated
 
         Returns
         -------
         The multithreaded CasADi graph of the integration
         """
-        return self.function.map(*args)
+        if args not in self._mapped_functions:
+            self._mapped_functions[args] = self.function.map(*args)
+        return self._mapped_functions[args]
 
     @property
     def _integration_time(self):
@@ -19,6 +19,8 @@ class OdeSolverBase:
     -------
     integrator(self, ocp, nlp, node_index) -> list
         The interface of the OdeSolver to the corresponding integrator
+    integrator_structural_key(self, nlp, dynamics_index, node_index, is_extra_dynamics, is_extra_deffects) -> tuple
+        A key describing the structure of the integrator graph at a specific node
     prepare_dynamic_integrator(ocp, nlp)
         Properly set the integration in an nlp
     """
@@ -217,11 +219,76 @@ class OdeSolverBase:
         if dynamics_index > 0 and not is_extra_dynamics:
             raise RuntimeError("dynamics_index should be 0 if is_extra_dynamics is False")
 
+        self._set_node_index(nlp, node_index)
+        dynamics_func, dynamics_defects_func = self._get_dynamics_functions(
+            nlp, dynamics_index, is_extra_dynamics, is_extra_deffects
+        )
+        ode_index = self._ode_index(dynamics_func, node_index)
+
+        ode_opt = {
+            "model": nlp.model,
+            "cx": nlp.cx,
+            "control_type": nlp.control_type,
+            "defects_type": self.defects_type,
+            "ode_index": ode_index,
+            "duplicate_starting_point": self.duplicate_starting_point,
+            **extra_opt,
+        }
+
+        ode = {
+            "t": self.t_ode(nlp),
+            "x": self.x_ode(nlp),
+            "u": self.p_ode(nlp),
+            "a": self.a_ode(nlp),
+            "d": self.d_ode(nlp),
+            "param": self.param_ode(nlp),
+            "ode": dynamics_func,
+            "implicit_ode": dynamics_defects_func,
+        }
+
+        return nlp.dynamics_type.ode_solver.integrator(ode, ode_opt)
+
+    @staticmethod
+    def _set_node_index(nlp, node_index: Int) -> None:
+        """
+        Set the current node of all the variables of the phase
+
+        Parameters
+        ----------
+        nlp
+            The NonLinearProgram handler
+        node_index
+            The index of the node
+        """
+
         nlp.states.node_index = node_index
         nlp.states_dot.node_index = node_index
         nlp.controls.node_index = node_index
         nlp.algebraic_states.node_index = node_index
 
+    @staticmethod
+    def _get_dynamics_functions(
+        nlp, dynamics_index: Int, is_extra_dynamics: Bool, is_extra_deffects: Bool
+    ) -> tuple[Callable | None, Callable | None]:
+        """
+        Get the dynamics and dynamics defects functions to integrate
+
+        Parameters
+        ----------
+        nlp
+            The NonLinearProgram handler
+        dynamics_index
+            The current extra dynamics to resolve (that can be referred to nlp.extra_dynamics_func[index])
+        is_extra_dynamics
+            If the dynamics is an extra dynamics
+        is_extra_deffects
+            If the deffect is an extra deffect
+
+        Returns
+        -------
+        The dynamics function and the dynamics defects function
+        """
+
         if nlp.dynamics_func is None:
             dynamics_func = None
         else:
@@ -238,32 +305,132 @@ class OdeSolverBase:
             else:
                 dynamics_defects_func = nlp.dynamics_defects_func
 
-        ode_index = None
-        if dynamics_func is not None:
-            ode_index = node_index if dynamics_func.size2_out("xdot") > 1 else 0
+        return dynamics_func, dynamics_defects_func
 
-        ode_opt = {
-            "model": nlp.model,
-            "cx": nlp.cx,
-            "control_type": nlp.control_type,
-            "defects_type": self.defects_type,
-            "ode_index": ode_index,
-            "duplicate_starting_point": self.duplicate_starting_point,
-            **extra_opt,
-        }
+    @staticmethod
+    def _ode_index(dynamics_func: Callable | None, node_index: Int) -> Int | None:
+        """
+        The column of the dynamics output to integrate at a specific node
 
-        ode = {
-            "t": self.t_ode(nlp),
-            "x": self.x_ode(nlp),
-            "u": self.p_ode(nlp),
-            "a": self.a_ode(nlp),
-            "d": self.d_ode(nlp),
-            "param": self.param_ode(nlp),
-            "ode": dynamics_func,
-            "implicit_ode": dynamics_defects_func,
-        }
+        Parameters
+        ----------
+        dynamics_func
+            The dynamics function
+        node_index
+            The index of the node
 
-        return nlp.dynamics_type.ode_solver.integrator(ode, ode_opt)
+        Returns
+        -------
+        The column of the dynamics output (None if there is no dynamics function)
+        """
+
+        if dynamics_func is None:
+            return None
+        return node_index if dynamics_func.size2_out("xdot") > 1 else 0
+
+    def integrator_structural_key(
+        self,
+        nlp,
+        dynamics_index: Int,
+        node_index: Int,
+        is_extra_dynamics: Bool = False,
+        is_extra_deffects: Bool = False,
+    ) -> tuple:
+        """
+        A key describing the structure of the integrator graph at a specific node. The integrator of a node is a closed
+        CasADi Function of the (node specific) symbolic variables, so two nodes sharing the same key have identical
+        integrators, even though they are built from different symbols. This typically happens with
+        PhaseDynamics.ONE_PER_NODE when only the numerical values (e.g. the numerical timeseries) differ from one node
+        to another
+
+        Parameters
+        ----------
+        nlp
+            The NonLinearProgram handler
+        dynamics_index
+            The current extra dynamics to resolve (that can be referred to nlp.extra_dynamics_func[index])
+        node_index
+            The index of the node
+        is_extra_dynamics
+            If the dynamics is an extra dynamics
+        is_extra_deffects
+            If the deffect is an extra deffect
+
+        Returns
+        -------
+        The structural key of the integrator
+        """
+
+        def shapes(value) -> tuple:
+            if isinstance(value, (list, tuple)):
+                return tuple(v.shape for v in value)
+            return (value.shape,)
+
+        self._set_node_index(nlp, node_index)
+        dynamics_func, dynamics_defects_func = self._get_dynamics_functions(
+            nlp, dynamics_index, is_extra_dynamics, is_extra_deffects
+        )
+        return (
+            id(dynamics_func),
+            id(dynamics_defects_func),
+            self._ode_index(dynamics_func, node_index),
+            shapes(self.x_ode(nlp)),
+            shapes(self.p_ode(nlp)),
+            shapes(self.a_ode(nlp)),
+            shapes(self.d_ode(nlp)),
+        )
+
+    def _initialize_node_integrators(
+        self,
+        ocp,
+        nlp,
+        dynamics_index: Int,
+        is_extra_dynamics: Bool = False,
+        is_extra_deffects: Bool = False,
+    ) -> list[Callable]:
+        """
+        Initialize the integrators of all the shooting nodes of a phase with PhaseDynamics.ONE_PER_NODE. The nodes
+        which share the same structural key (see integrator_structural_key) share the same integrator
+
+        Parameters
+        ----------
+        ocp
+            The Optimal control program handler
+        nlp
+            The NonLinearProgram handler
+        dynamics_index
+            The current extra dynamics to resolve (that can be referred to nlp.extra_dynamics_func[index])
+        is_extra_dynamics
+            If the dynamics is an extra dynamics
+        is_extra_deffects
+            If the deffect is an extra deffect
+
+        Returns
+        -------
+        The integrators of each shooting node
+        """
+
+        integrators = []
+        unique_integrators = {}
+        for node_index in range(nlp.ns):
+            key = self.integrator_structural_key(
+                nlp,
+                dynamics_index,
+                node_index,
+                is_extra_dynamics=is_extra_dynamics,
+                is_extra_deffects=is_extra_deffects,
+            )
+            if key not in unique_integrators:
+                unique_integrators[key] = self.initialize_integrator(
+                    ocp,
+                    nlp,
+                    dynamics_index=dynamics_index,
+                    node_index=node_index,
+                    is_extra_dynamics=is_extra_dynamics,
+                    is_extra_deffects=is_extra_deffects,
+                )
+            integrators.append(unique_integrators[key])
+        return integrators
 
     def prepare_dynamic_integrator(self, ocp, nlp):
         """
@@ -278,62 +445,41 @@ class OdeSolverBase:
         """
 
         # Primary dynamics
-        dynamics = [nlp.dynamics_type.ode_solver.initialize_integrator(ocp, nlp, dynamics_index=0, node_index=0)]
         if nlp.phase_dynamics == PhaseDynamics.SHARED_DURING_THE_PHASE:
+            dynamics = [nlp.dynamics_type.ode_solver.initialize_integrator(ocp, nlp, dynamics_index=0, node_index=0)]
             dynamics = dynamics * nlp.ns
         else:
-            for node_index in range(1, nlp.ns):
-                dynamics.append(
-                    nlp.dynamics_type.ode_solver.initialize_integrator(
-                        ocp, nlp, dynamics_index=0, node_index=node_index
-                    )
-                )
+            dynamics = nlp.dynamics_type.ode_solver._initialize_node_integrators(ocp, nlp, dynamics_index=0)
         nlp.dynamics = dynamics
 
         # Extra dynamics
         extra_dynamics = []
         for i in range(len(nlp.extra_dynamics_func)):
-            extra_dynamics += [
-                nlp.dynamics_type.ode_solver.initialize_integrator(
-                    ocp, nlp, dynamics_index=i, node_index=0, is_extra_dynamics=True, is_extra_deffects=False
-                )
-            ]
             if nlp.phase_dynamics == PhaseDynamics.SHARED_DURING_THE_PHASE:
+                extra_dynamics += [
+                    nlp.dynamics_type.ode_solver.initialize_integrator(
+                        ocp, nlp, dynamics_index=i, node_index=0, is_extra_dynamics=True, is_extra_deffects=False
+                    )
+                ]
                 extra_dynamics = extra_dynamics * nlp.ns
             else:
-                for node_index in range(1, nlp.ns):
-                    extra_dynamics += [
-                        nlp.dynamics_type.ode_solver.initialize_integrator(
-                            ocp,
-                            nlp,
-                            dynamics_index=i,
-                            node_index=node_index,
-                            is_extra_dynamics=True,
-                            is_extra_deffects=False,
-                        )
-                    ]
+                extra_dynamics += nlp.dynamics_type.ode_solver._initialize_node_integrators(
+                    ocp, nlp, dynamics_index=i, is_extra_dynamics=True, is_extra_deffects=False
+                )
             nlp.extra_dynamics.append(extra_dynamics)
 
         # Extra defects
         extra_dynamics_defects = []
         for i in range(len(nlp.extra_dynamics_defects_func)):
-            extra_dynamics_defects += [
-                nlp.dynamics_type.ode_solver.initialize_integrator(
-                    ocp, nlp, dynamics_index=i, node_index=0, is_extra_dynamics=False, is_extra_deffects=True
-                )
-            ]
             if nlp.phase_dynamics == PhaseDynamics.SHARED_DURING_THE_PHASE:
+                extra_dynamics_defects += [
+                    nlp.dynamics_type.ode_solver.initialize_integrator(
+                        ocp, nlp, dynamics_index=i, node_index=0, is_extra_dynamics=False, is_extra_deffects=True
+                    )
+                ]
                 extra_dynamics_defects = extra_dynamics_defects * nlp.ns
             else:
-                for node_index in range(1, nlp.ns):
-                    extra_dynamics_defects += [
-                        nlp.dynamics_type.ode_solver.initialize_integrator(
-                            ocp,
-                            nlp,
-                            dynamics_index=i,
-                            node_index=node_index,
-                            is_extra_dynamics=False,
-                            is_extra_deffects=True,
-                        )
-                    ]
+                extra_dynamics_defects += nlp.dynamics_type.ode_solver._initialize_node_integrators(
+                    ocp, nlp, dynamics_index=i, is_extra_dynamics=False, is_extra_deffects=True
+                )
             nlp.extra_dynamics_defects.append(extra_dynamics_defects)
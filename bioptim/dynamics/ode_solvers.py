@@ -197,9 +197,6 @@ class OdeSolver:
             return nlp.numerical_timeseries.cx_start
 
         def initialize_integrator(self, ocp, nlp, **kwargs):
-            if ocp.n_threads > 1 and nlp.control_type == ControlType.LINEAR_CONTINUOUS:
-                raise RuntimeError("Piece-wise linear continuous controls cannot be used with multiple threads")
-
             if nlp.model.nb_quaternions > 0:
                 raise NotImplementedError(
                     "Quaternions can't be used with IRK yet. If you get this error, please notify the "
@@ -64,6 +64,32 @@ def prepare_ocp(
     # DynamicsOptions
     dynamics = DynamicsOptions(phase_dynamics=phase_dynamics)
 
+    x_bounds, u_bounds = prepare_bounds(bio_model)
+    x_init, u_init = prepare_initial_guess(bio_model, x_bounds, u_bounds, n_shooting, seed)
+
+    ocp = OptimalControlProgram(
+        bio_model,
+        n_shooting,
+        final_time,
+        dynamics=dynamics,
+        x_init=x_init,
+        u_init=u_init,
+        x_bounds=x_bounds,
+        u_bounds=u_bounds,
+        objective_functions=objective_functions,
+        n_threads=1,  # You cannot use multi-threading for the resolution of the ocp with multi-start
+    )
+
+    ocp.add_plot_penalty(CostType.ALL)
+
+    return ocp
+
+
+def prepare_bounds(bio_model: TorqueBiorbdModel) -> tuple[BoundsList, BoundsList]:
+    """
+    The bounds of the states and the controls
+    """
+
     # Path constraint
     x_bounds = BoundsList()
     x_bounds["q"] = bio_model.bounds_from_ranges("q")
@@ -72,7 +98,23 @@ def prepare_ocp(
     x_bounds["qdot"] = bio_model.bounds_from_ranges("qdot")
     x_bounds["qdot"][:, [0, -1]] = 0
 
-    # Initial guess
+    # Define control path constraint
+    n_tau = bio_model.nb_tau
+    tau_min, tau_max = -100, 100
+    u_bounds = BoundsList()
+    u_bounds["tau"] = [tau_min] * n_tau, [tau_max] * n_tau
+    u_bounds["tau"][1, :] = 0  # Prevent the model from actively rotate
+
+    return x_bounds, u_bounds
+
+
+def prepare_initial_guess(
+    bio_model: TorqueBiorbdModel, x_bounds: BoundsList, u_bounds: BoundsList, n_shooting: int, seed: int
+) -> tuple[InitialGuessList, InitialGuessList]:
+    """
+    The random initial guess of the states and the controls
+    """
+
     n_q = bio_model.nb_q
     n_qdot = bio_model.nb_qdot
     x_init = InitialGuessList()
@@ -86,13 +128,7 @@ def prepare_ocp(
         seed=seed,
     )
 
-    # Define control path constraint
     n_tau = bio_model.nb_tau
-    tau_min, tau_max, tau_init = -100, 100, 0
-    u_bounds = BoundsList()
-    u_bounds["tau"] = [tau_min] * n_tau, [tau_max] * n_tau
-    u_bounds["tau"][1, :] = 0  # Prevent the model from actively rotate
-
     u_init = InitialGuessList()
     u_init["tau"] = [0] * n_tau
     u_init["tau"].add_noise(
@@ -103,22 +139,30 @@ def prepare_ocp(
         seed=seed,
     )
 
-    ocp = OptimalControlProgram(
-        bio_model,
-        n_shooting,
-        final_time,
-        dynamics=dynamics,
-        x_init=x_init,
-        u_init=u_init,
-        x_bounds=x_bounds,
-        u_bounds=u_bounds,
-        objective_functions=objective_functions,
-        n_threads=1,  # You cannot use multi-threading for the resolution of the ocp with multi-start
-    )
+    return x_init, u_init
 
-    ocp.add_plot_penalty(CostType.ALL)
 
-    return ocp
+def update_initial_guess(ocp: OptimalControlProgram, *combinatorial_parameters, **extra_parameters) -> None:
+    """
+    Callback of the update_ocp_callback, this applies a combination to an ocp which was already prepared, so it is
+    not built again. Only the seed is applied this way, the other parameters are structural_parameters
+
+    Parameters
+    ----------
+    ocp: OptimalControlProgram
+        The ocp prepared for the structural parameters of this combination
+    combinatorial_parameters:
+        The current values of the combinatorial_parameters being treated
+    extra_parameters:
+        All the non-combinatorial parameters sent by the user
+    """
+
+    bio_model_path, final_time, n_shooting, seed = combinatorial_parameters
+
+    bio_model = ocp.nlp[0].model
+    x_bounds, u_bounds = prepare_bounds(bio_model)
+    x_init, u_init = prepare_initial_guess(bio_model, x_bounds, u_bounds, n_shooting, seed)
+    ocp.update_initial_guess(x_init=x_init, u_init=u_init)
 
 
 def construct_filepath(save_path, n_shooting, seed):
@@ -175,9 +219,25 @@ def prepare_multi_start(
     combinatorial_parameters: dict,
     save_folder: str = None,
     n_pools: int = 1,
+    build_once: bool = False,
+    manifest_path: str = None,
 ) -> MultiStart:
     """
     The initialization of the multi-start
+
+    Parameters
+    ----------
+    combinatorial_parameters: dict
+        The values of the parameters to combine
+    save_folder: str
+        The folder to save the results to
+    n_pools: int
+        The number of pools to use
+    build_once: bool
+        If the ocp should be prepared once for each model, final time and number of shooting nodes, and then only
+        updated with the initial guess of each seed
+    manifest_path: str
+        The file where the completed combinations are recorded, so an interrupted multi-start can be resumed
     """
     if not isinstance(save_folder, str):
         raise ValueError("save_folder must be an str")
@@ -191,6 +251,9 @@ def prepare_multi_start(
         should_solve_callback=(should_solve, {"save_folder": save_folder}),
         solver=Solver.IPOPT(show_online_optim=False),  # You cannot use show_online_optim with multi-start
         n_pools=n_pools,
+        update_ocp_callback=(update_initial_guess, {}) if build_once else None,
+        structural_parameters=["bio_model_path", "final_time", "n_shooting"] if build_once else None,
+        manifest_path=manifest_path,
     )
 
 
@@ -1,119 +1,292 @@
 import numpy as np
-from casadi import Function, jacobian, hessian, sum1
+from casadi import DM, Function, jacobian, hessian, sum1, vec
 from matplotlib import pyplot as plt
 import matplotlib.colors as mcolors
 import matplotlib.cm as mcm
+from scipy import sparse
+from scipy.sparse.csgraph import structural_rank
+from scipy.sparse.linalg import ArpackError, ArpackNoConvergence, eigsh, svds
+
 from ..interfaces.ipopt_interface import IpoptInterface
 
+# Below this size, the extreme eigen/singular values are computed exactly (the dense matrix is tiny anyway)
+_DENSE_SIZE_THRESHOLD = 50
+
 
 def jacobian_hessian_constraints(variables_vector, all_g):
     """
     Returns
     -------
-    A list with jacobian matrix of constraints evaluates at initial time for each phase
-    A list with the rank of each jacobian matrix
-    A list with the different type of constraints
-    A list with norms of hessian matrix of constraints at initial time for each phase
+    The function of the sparse jacobian of the constraints
+    The function of the second derivatives of all the constraints stacked in a single sparse matrix d(vec(J))/dv.
+    The row i_variable * n_constraints + i_constraint holds a row of the hessian of the constraint i_constraint
     """
 
     # JACOBIAN
+    constraints_jacobian = jacobian(all_g, variables_vector)
     constraints_jac_func = Function(
         "constraints_jacobian",
         [variables_vector],
-        [jacobian(all_g, variables_vector)],
+        [constraints_jacobian],
     )
 
-    # HESSIAN
-    constraints_hess_func = []
-    for i in range(all_g.shape[0]):
-        constraints_hess_func.append(
-            Function(
-                "constraints_hessian",
-                [variables_vector],
-                [hessian(all_g[i], variables_vector)[0]],
-            )
-        )
+    # HESSIAN (all the constraints at once)
+    constraints_hess_func = Function(
+        "constraints_hessian",
+        [variables_vector],
+        [jacobian(vec(constraints_jacobian), variables_vector)],
+    )
 
     return constraints_jac_func, constraints_hess_func
 
 
 def evaluate_jacobian_hessian_constraints(v, ocp):
+    """
+    Returns
+    -------
+    The sparse jacobian matrix of the constraints
+    The structural rank of the jacobian matrix
+    The min, mean and max of the hessian of each constraint
+    """
 
     # JACOBIAN
     constraints_jac_func = ocp.conditioning_plots["constraints_jac_func"]
-    evaluated_constraints_jacobian = constraints_jac_func(v)
-    jacobian_matrix = np.array(evaluated_constraints_jacobian)
+    jacobian_matrix = _to_sparse(constraints_jac_func(v))
 
     # Jacobian rank
-    if jacobian_matrix.size > 0:
-        jacobian_rank = np.linalg.matrix_rank(jacobian_matrix)
+    if jacobian_matrix.shape[0] > 0:
+        jacobian_rank = structural_rank(jacobian_matrix)
     else:
         jacobian_rank = "No constraints"
 
     # HESSIAN
     constraints_hess_func = ocp.conditioning_plots["constraints_hess_func"]
-    hess_min_mean_max = np.zeros((len(constraints_hess_func), 3))
-    for i in range(len(constraints_hess_func)):
-        evaluated_constraints_hessian = constraints_hess_func[i](v)
-        hess_min_mean_max[i, 0] = np.min(evaluated_constraints_hessian)
-        hess_min_mean_max[i, 1] = np.mean(evaluated_constraints_hessian)
-        hess_min_mean_max[i, 2] = np.max(evaluated_constraints_hessian)
+    hess_min_mean_max = _hessian_min_mean_max(
+        _to_sparse(constraints_hess_func(v)).tocoo(), jacobian_matrix.shape[0], jacobian_matrix.shape[1]
+    )
 
     return jacobian_matrix, jacobian_rank, hess_min_mean_max
 
 
-def hessian_objective(variables_vector, all_objectives):
+def hessian_objective(variables_vector, all_objectives, all_g=None):
     """
-
     Returns
     -------
-    A list with the hessian of objectives evaluate at initial time for each phase
-    A list with the condition numbers of each phases
-    A list that indicates if the objective is convexe or not
+    The function of the sparse hessian of the Lagrangian (objectives + lam_g * constraints). With lam_g = 0, this is
+    the hessian of the objectives
     """
 
+    all_g = variables_vector[:0] if all_g is None else all_g
+    lam_g = type(variables_vector).sym("lam_g", all_g.shape[0], 1)
     objectives_hess_func = Function(
         "hessian",
-        [variables_vector],
-        [hessian(sum1(all_objectives), variables_vector)[0]],
+        [variables_vector, lam_g],
+        [hessian(sum1(all_objectives) + sum1(lam_g * all_g), variables_vector)[0]],
     )
 
     return objectives_hess_func
 
 
-def evaluate_hessian_objective(v, ocp):
+def evaluate_hessian_objective(v, ocp, lam_g=None):
     """
 
     Returns
     -------
-    A list with the hessian of objectives evaluate at initial time for each phase
-    A list with the condition numbers of each phases
-    A list that indicates if the objective is convexe or not
+    The sparse hessian of the objectives (or of the Lagrangian if lam_g is provided)
+    The condition number of the hessian
+    A string that indicates if the objective is convexe or not
     """
 
     objectives_hess_func = ocp.conditioning_plots["objectives_hess_func"]
-    evaluated_objectives_hessian = objectives_hess_func(v)
-    hessian_matrix = np.array(evaluated_objectives_hessian)
+    if lam_g is None:
+        lam_g = np.zeros((objectives_hess_func.size1_in(1), 1))
+    hessian_matrix = _to_sparse(objectives_hess_func(v, lam_g))
 
     # Convexity checking (positive semi-definite hessian)
     # On R (convex), the objective is convex if and only if the hessian is positive semi definite (psd)
     # And, as the hessian is symmetric (Schwarz), the hessian is psd if and only if the eigenvalues are positive
-    eigen_values = np.linalg.eigvals(hessian_matrix)
-    ev_max = np.max(eigen_values)
-    ev_min = np.min(eigen_values)
+    ev_min, ev_max = _extreme_eigen_values(hessian_matrix)
     if ev_min == 0:
         condition_number = "/!\\ min eigen value is 0"
     if ev_min != 0:
         condition_number = np.abs(ev_max) / np.abs(ev_min)
-    convexity = (
-        "positive semi-definite"
-        if np.all(eigen_values > 0)
-        else f"not positive semi-definite (min: {ev_min}, max: {ev_max})"
-    )
+    convexity = "positive semi-definite" if ev_min > 0 else f"not positive semi-definite (min: {ev_min}, max: {ev_max})"
 
     return hessian_matrix, condition_number, convexity
 
 
+def conditioning_report(v, ocp, lam_g=None) -> dict:
+    """
+    The conditioning of each block of the decision variables (each phase and each node of each phase), computed
+    without materializing the dense matrices
+
+    Parameters
+    ----------
+    v: np.ndarray
+        The vector of decision variables to evaluate the conditioning at
+    ocp: OptimalControlProgram
+        A reference to the ocp (create_conditioning_plots must have been called)
+    lam_g: np.ndarray
+        The multipliers of the constraints, if provided the hessian is the one of the Lagrangian
+
+    Returns
+    -------
+    A dictionary which keys are ("phase", phase_idx) and ("node", phase_idx, node_idx). Each value is a dictionary
+    with the number of variables, the number of constraints involving them, the structural rank of these constraints
+    on the block, the extreme eigen values of the diagonal block of the hessian and its condition number
+    """
+
+    jacobian_matrix = _to_sparse(ocp.conditioning_plots["constraints_jac_func"](v)).tocsc()
+    hessian_matrix, _, _ = evaluate_hessian_objective(v, ocp, lam_g)
+    hessian_matrix = hessian_matrix.tocsr()
+
+    report = {}
+    for key, indices in _variable_blocks(ocp).items():
+        jacobian_block = jacobian_matrix[:, indices]
+        jacobian_block = jacobian_block[np.unique(jacobian_block.nonzero()[0]), :]
+        hessian_block = hessian_matrix[indices, :][:, indices]
+
+        ev_min, ev_max = _extreme_eigen_values(hessian_block)
+        report[key] = {
+            "n_variables": indices.shape[0],
+            "n_constraints": jacobian_block.shape[0],
+            "jacobian_structural_rank": structural_rank(jacobian_block) if jacobian_block.shape[0] > 0 else 0,
+            "hessian_eigen_values": (ev_min, ev_max),
+            "hessian_condition_number": np.abs(ev_max) / np.abs(ev_min) if ev_min != 0 else np.inf,
+        }
+    return report
+
+
+def _variable_blocks(ocp) -> dict:
+    """
+    The indices in the vector of decision variables of each phase and each node of each phase
+    """
+
+    nodes = {}
+    for key, (sl, _) in ocp.vector_layout.index_map.items():
+        if key[0] == "global":
+            continue
+        phase, _, node = key
+        nodes.setdefault((phase, node), []).append(np.arange(sl.start, sl.stop))
+
+    blocks = {}
+    for (phase, node), indices in nodes.items():
+        blocks.setdefault(("phase", phase), []).extend(indices)
+        blocks[("node", phase, node)] = indices
+    return {key: np.concatenate(indices).astype(int) for key, indices in blocks.items()}
+
+
+def _to_sparse(matrix: DM) -> sparse.csc_matrix:
+    """
+    Convert a CasADi matrix to a scipy one, keeping its sparsity
+    """
+
+    matrix = DM(matrix)
+    colind, row = matrix.sparsity().get_ccs()
+    return sparse.csc_matrix((np.array(matrix.nonzeros()), row, colind), shape=matrix.shape)
+
+
+def _hessian_min_mean_max(second_derivatives: sparse.coo_matrix, n_constraints: int, n_variables: int) -> np.ndarray:
+    """
+    The min, mean and max of the (dense) hessian of each constraint, computed from the non-zeros only
+    """
+
+    if n_constraints == 0:
+        return np.zeros((0, 3))
+
+    constraints_idx = second_derivatives.row % n_constraints
+    values = second_derivatives.data
+    n_entries = n_variables**2
+
+    mins = np.full(n_constraints, np.inf)
+    maxs = np.full(n_constraints, -np.inf)
+    np.minimum.at(mins, constraints_idx, values)
+    np.maximum.at(maxs, constraints_idx, values)
+
+    # The entries out of the sparsity pattern are zeros
+    has_zeros = np.bincount(constraints_idx, minlength=n_constraints) < n_entries
+    mins[has_zeros] = np.minimum(mins[has_zeros], 0)
+    maxs[has_zeros] = np.maximum(maxs[has_zeros], 0)
+    means = np.bincount(constraints_idx, weights=values, minlength=n_constraints) / n_entries
+
+    return np.column_stack((mins, means, maxs))
+
+
+def _extreme_eigen_values(matrix: sparse.spmatrix) -> tuple[float, float]:
+    """
+    The min and max eigen values of a symmetric matrix. ARPACK is used for large matrices, if it does not converge the
+    value is nan
+    """
+
+    if matrix.shape[0] == 0:
+        return np.nan, np.nan
+    if matrix.shape[0] <= _DENSE_SIZE_THRESHOLD:
+        eigen_values = np.linalg.eigvalsh(matrix.toarray())
+        return eigen_values[0], eigen_values[-1]
+
+    def _eigen_value(which: str) -> float:
+        try:
+            return eigsh(matrix, k=1, which=which, return_eigenvectors=False)[0]
+        except ArpackNoConvergence as e:
+            return e.eigenvalues[0] if e.eigenvalues.shape[0] > 0 else np.nan
+        except ArpackError:
+            return np.nan
+
+    return _eigen_value("SA"), _eigen_value("LA")
+
+
+def _extreme_singular_values(matrix: sparse.spmatrix) -> tuple[float, float]:
+    """
+    The min and max singular values of a matrix. ARPACK is used for large matrices, if it does not converge the value
+    is nan
+    """
+
+    if min(matrix.shape) == 0:
+        return np.nan, np.nan
+    if min(matrix.shape) <= _DENSE_SIZE_THRESHOLD:
+        singular_values = np.linalg.svd(matrix.toarray(), compute_uv=False)
+        return singular_values[-1], singular_values[0]
+
+    def _singular_value(which: str) -> float:
+        try:
+            return svds(matrix, k=1, which=which, return_singular_vectors=False)[0]
+        except (ArpackNoConvergence, ArpackError):
+            return np.nan
+
+    return _singular_value("SM"), _singular_value("LM")
+
+
+def _scatter_data(matrix: sparse.spmatrix) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The position (column, row) and value of the non-zeros of a matrix, so it can be plotted without being densified
+    """
+
+    matrix = matrix.tocoo()
+    is_non_zero = matrix.data != 0
+    return np.column_stack((matrix.col[is_non_zero], matrix.row[is_non_zero])), matrix.data[is_non_zero]
+
+
+def _scatter_matrix(axis, shape: tuple[int, int], cmap):
+    """
+    Prepare a scatter plot that shows the non-zeros of a matrix like imshow would (black background = 0)
+    """
+
+    axis.set_facecolor("k")
+    axis.set_xlim(-0.5, shape[1] - 0.5)
+    axis.set_ylim(shape[0] - 0.5, -0.5)
+    return axis.scatter([], [], c=[], cmap=cmap, marker="s", s=4)
+
+
+def _update_scatter_matrix(scatter, matrix: sparse.spmatrix):
+    positions, values = _scatter_data(matrix)
+    value_min = np.min(values) if values.shape[0] != 0 else 0
+    value_max = np.max(values) if values.shape[0] != 0 else 0
+    scatter.set_offsets(positions)
+    scatter.set_array(values)
+    # Only the non-zeros are plotted, so the range is extended to 0 to keep vmin < vcenter < vmax
+    scatter.set_norm(mcolors.TwoSlopeNorm(vmin=min(value_min, 0) - 0.01, vmax=max(value_max, 0) + 0.01, vcenter=0))
+
+
 def create_conditioning_plots(ocp):
 
     cmap = mcm.get_cmap("seismic")
@@ -121,21 +294,21 @@ def create_conditioning_plots(ocp):
     interface = IpoptInterface(ocp)
     variables_vector = ocp.variables_vector
     all_g, _ = interface.dispatch_bounds(include_g=True, include_g_internal=False)
+    all_g_solver, _ = interface.dispatch_bounds(include_g=True, include_g_internal=True)
     all_objectives = interface.dispatch_obj_func()
     nb_variables = variables_vector.shape[0]
     nb_constraints = all_g.shape[0]
 
     constraints_jac_func, constraints_hess_func = jacobian_hessian_constraints(variables_vector, all_g)
-    objectives_hess_func = hessian_objective(variables_vector, all_objectives)
+    objectives_hess_func = hessian_objective(variables_vector, all_objectives, all_g_solver)
 
     # PLOT CONSTRAINTS
     fig_constraints, axis_constraints = plt.subplots(1, 2, num="Check conditioning for constraints")
 
     # Jacobian plot
-    fake_jacobian = np.zeros((nb_constraints, nb_variables))
-    im_constraints_jacobian = axis_constraints[0].imshow(fake_jacobian, aspect="auto", cmap=cmap)
+    im_constraints_jacobian = _scatter_matrix(axis_constraints[0], (nb_constraints, nb_variables), cmap)
     axis_constraints[0].set_title(
-        "Jacobian constraints \nMatrix rank = NA \n Number of constraints = NA", fontweight="bold", fontsize=12
+        "Jacobian constraints \nStructural rank = NA \n Number of constraints = NA", fontweight="bold", fontsize=12
     )
     # colorbar
     cbar_ax = fig_constraints.add_axes([0.02, 0.4, 0.015, 0.3])
@@ -154,7 +327,9 @@ def create_conditioning_plots(ocp):
     fig_constraints.colorbar(im_constraints_hessian, cax=cbar_ax2)
 
     fig_constraints.legend(["Black = 0"], loc="upper left")
-    plt.suptitle("The rank should be equal to the number of constraints", color="b", fontsize=15, fontweight="bold")
+    plt.suptitle(
+        "The structural rank should be equal to the number of constraints", color="b", fontsize=15, fontweight="bold"
+    )
     try:
         figManager = plt.get_current_fig_manager()
         figManager.window.showMaximized()
@@ -165,8 +340,8 @@ def create_conditioning_plots(ocp):
     fig_obj, axis_obj = plt.subplots(1, 1, num="Check conditioning for objectives")
 
     # Hessian objective plot
-    fake_hessian_obj = np.zeros((nb_variables, nb_variables))
-    im_objectives_hessian = axis_obj.imshow(fake_hessian_obj, cmap=cmap)
+    im_objectives_hessian = _scatter_matrix(axis_obj, (nb_variables, nb_variables), cmap)
+    axis_obj.set_aspect("equal")
     axis_obj.set_title("Convexity = NA \n|λmax|/|λmin| = Condition number = NA", fontweight="bold", fontsize=12)
     axis_obj.set_xlabel("Hessian objectives")
     # colobar
@@ -206,14 +381,11 @@ def update_constraints_plot(v, ocp):
     im_constraints_hessian = ocp.conditioning_plots["im_constraints_hessian"]
 
     # Jacobian plot
-    jacobian_matrix[jacobian_matrix == 0] = np.nan
-    jac_min = np.min(jacobian_matrix) if jacobian_matrix.shape[0] != 0 else 0
-    jac_max = np.max(jacobian_matrix) if jacobian_matrix.shape[0] != 0 else 0
-    norm = mcolors.TwoSlopeNorm(vmin=jac_min - 0.01, vmax=jac_max + 0.01, vcenter=0)
-    im_constraints_jacobian.set_data(jacobian_matrix)
-    im_constraints_jacobian.set_norm(norm)
+    _update_scatter_matrix(im_constraints_jacobian, jacobian_matrix)
+    sigma_min, sigma_max = _extreme_singular_values(jacobian_matrix)
     axis_constraints[0].set_title(
-        f"Jacobian constraints \nMatrix rank = {str(jacobian_rank)}\n Number of constraints = {str(jacobian_matrix.shape[0])}",
+        f"Jacobian constraints \nStructural rank = {str(jacobian_rank)}\n Number of constraints = "
+        f"{str(jacobian_matrix.shape[0])}\n|σmax|/|σmin| = {sigma_max / sigma_min if sigma_min != 0 else np.inf}",
         fontweight="bold",
         fontsize=12,
     )
@@ -226,29 +398,25 @@ def update_constraints_plot(v, ocp):
     im_constraints_hessian.set_norm(norm)
 
 
-def update_objective_plot(v, ocp):
+def update_objective_plot(v, ocp, lam_g=None):
 
-    hessian_matrix, condition_number, convexity = evaluate_hessian_objective(v, ocp)
+    hessian_matrix, condition_number, convexity = evaluate_hessian_objective(v, ocp, lam_g)
     axis_obj = ocp.conditioning_plots["axis_obj"]
     im_objectives_hessian = ocp.conditioning_plots["im_objectives_hessian"]
-    cmap = mcm.get_cmap("seismic")
 
     # Hessian objective plot
-    hess_min = np.min(hessian_matrix) if hessian_matrix.shape[0] != 0 else 0
-    hess_max = np.max(hessian_matrix) if hessian_matrix.shape[0] != 0 else 0
-    norm = mcolors.TwoSlopeNorm(vmin=hess_min - 0.01, vmax=hess_max + 0.01, vcenter=0)
-    im_objectives_hessian.set_data(hessian_matrix)
-    im_objectives_hessian.set_norm(norm)
+    _update_scatter_matrix(im_objectives_hessian, hessian_matrix)
     axis_obj.set_title(
-        f"Hessian objective \nConvexity = {convexity} \n|λmax|/|λmin| = Condition number = {condition_number}",
+        f"Hessian {'objective' if lam_g is None else 'Lagrangian'} \nConvexity = {convexity} \n"
+        f"|λmax|/|λmin| = Condition number = {condition_number}",
         fontweight="bold",
         fontsize=12,
     )
 
 
-def update_conditioning_plots(v, ocp):
+def update_conditioning_plots(v, ocp, lam_g=None):
     update_constraints_plot(v, ocp)
-    update_objective_plot(v, ocp)
+    update_objective_plot(v, ocp, lam_g)
     plt.draw()
 
 
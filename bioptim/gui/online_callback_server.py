@@ -31,7 +31,66 @@ from ..misc.parameters_types import (
 
 _DEFAULT_HOST = "localhost"
 _DEFAULT_PORT = 3050
-_HEADER_GENERIC_LEN = 1024
+# Each message starts with its type and its number of data parts, followed by the length (in bytes) of each part
+_MESSAGE_HEADER = struct.Struct("<qq")
+_LENGTH_DTYPE = np.dtype("<i8")
+_DATA_DTYPE = np.dtype("<f8")
+
+
+def _pack_message_header(message_type: "_ServerMessages", data_lengths: AnyIterable) -> Bytes:
+    """
+    Build the header of a message, it is read back by `PlottingServer._recv_message_type_and_data_len`
+
+    Parameters
+    ----------
+    message_type: _ServerMessages
+        The type of the message
+    data_lengths: list
+        The length (in bytes) of each data part following the header
+
+    Returns
+    -------
+    The header
+    """
+
+    return (
+        _MESSAGE_HEADER.pack(message_type.value, len(data_lengths))
+        + np.array(data_lengths, dtype=_LENGTH_DTYPE).tobytes()
+    )
+
+
+def _recv_exactly(
+    client_socket: socket.socket, n_bytes: Int, buffer: bytearray | None = None
+) -> bytearray | memoryview:
+    """
+    Receive exactly n_bytes from the socket
+
+    Parameters
+    ----------
+    client_socket: socket.socket
+        The socket to read from
+    n_bytes: int
+        The number of bytes to receive
+    buffer: bytearray
+        The buffer to receive into (it must hold at least n_bytes), a new one is allocated if None
+
+    Returns
+    -------
+    The received bytes (a view on the first n_bytes of buffer if it is provided), empty if the connexion was closed
+    before anything was received
+    """
+
+    data = bytearray(n_bytes) if buffer is None else memoryview(buffer)[:n_bytes]
+    view = memoryview(data)
+    n_received = 0
+    while n_received < n_bytes:
+        n = client_socket.recv_into(view[n_received:], n_bytes - n_received)
+        if n == 0:
+            if n_received == 0:
+                return bytearray()
+            raise ConnectionError("The connexion was closed while receiving data")
+        n_received += n
+    return data
 
 
 def _serialize_show_options(show_options: AnyDict) -> Bytes:
@@ -108,6 +167,8 @@ class PlottingServer:
         self._plotter: PlotOcp = None
 
         self._should_send_ok_to_client_on_new_data: Bool = False
+        # One receive buffer per data part, reused (and grown if needed) from one message to the next
+        self._recv_buffers: list[bytearray] = []
 
         self._run()
 
@@ -218,7 +279,7 @@ class PlottingServer:
 
         # Receive the actual data
         try:
-            data = client_socket.recv(_HEADER_GENERIC_LEN).decode().strip("\0")
+            data = _recv_exactly(client_socket, _MESSAGE_HEADER.size)
             if not data:
                 return _ServerMessages.EMPTY, None
         except:
@@ -226,9 +287,9 @@ class PlottingServer:
             client_socket.close()
             return _ServerMessages.CLOSE_CONNEXION, None
 
-        data_as_list = data.split("\n")
+        message_type, n_data = _MESSAGE_HEADER.unpack(data)
         try:
-            message_type = _ServerMessages(int(data_as_list[0]))
+            message_type = _ServerMessages(message_type)
         except ValueError:
             self._logger.error("Unknown message type received")
             # Sends failure
@@ -242,7 +303,11 @@ class PlottingServer:
             return _ServerMessages.CLOSE_CONNEXION, None
 
         try:
-            len_all_data = [int(len_data) for len_data in data_as_list[1][1:-1].split(",")]
+            len_all_data = np.frombuffer(
+                _recv_exactly(client_socket, n_data * _LENGTH_DTYPE.itemsize), dtype=_LENGTH_DTYPE
+            ).tolist()
+            if len(len_all_data) != n_data:
+                raise ConnectionError("The connexion was closed while receiving the data lengths")
         except Exception as e:
             self._logger.error("Length of data could not be extracted")
             self._logger.debug(f"Error: {e}")
@@ -281,11 +346,11 @@ class PlottingServer:
 
         data_out = []
         try:
-            for len_data in len_all_data:
+            for part, len_data in enumerate(len_all_data):
                 self._logger.debug(f"Waiting for {len_data} bytes from client")
-                data_tp = b""
-                while len(data_tp) != len_data:
-                    data_tp += client_socket.recv(len_data - len(data_tp))
+                data_tp = _recv_exactly(client_socket, len_data, self._recv_buffer(part, len_data))
+                if len(data_tp) != len_data:
+                    raise ConnectionError("The connexion was closed while receiving data")
                 data_out.append(data_tp)
         except Exception as e:
             self._logger.error("Unknown message type received")
@@ -302,6 +367,28 @@ class PlottingServer:
         self._logger.debug(f"Received data from client: {[len(d) for d in data_out]} bytes")
         return data_out
 
+    def _recv_buffer(self, part: Int, n_bytes: Int) -> bytearray:
+        """
+        The receive buffer of a data part, it is allocated only when a part is larger than all the previous ones
+
+        Parameters
+        ----------
+        part: int
+            The index of the data part in the message
+        n_bytes: int
+            The number of bytes of the data part
+
+        Returns
+        -------
+        A buffer of at least n_bytes
+        """
+
+        while len(self._recv_buffers) <= part:
+            self._recv_buffers.append(bytearray())
+        if len(self._recv_buffers[part]) < n_bytes:
+            self._recv_buffers[part] = bytearray(n_bytes)
+        return self._recv_buffers[part]
+
     def _initialize_plotter(self, client_socket: socket.socket, ocp_raw: AnyIterable) -> None:
         """
         Initializes the plotter
@@ -315,7 +402,7 @@ class PlottingServer:
         """
 
         try:
-            data_json = json.loads(ocp_raw[0])
+            data_json = json.loads(bytes(ocp_raw[0]))
         except Exception as e:
             self._logger.error("Error while converting data to json format, closing connexion")
             client_socket.sendall(_ResponseHeader.NOK.encode())
@@ -346,7 +433,7 @@ class PlottingServer:
             raise e
 
         try:
-            show_options = _deserialize_show_options(ocp_raw[1])
+            show_options = _deserialize_show_options(bytes(ocp_raw[1]))
         except Exception as e:
             self._logger.error("Error while extracting show options, closing connexion")
             client_socket.sendall(_ResponseHeader.NOK.encode())
@@ -501,6 +588,7 @@ class OnlineCallbackServer(OnlineCallbackAbstract):
             )
 
         self._initialize_connexion(**show_options)
+        self._start_sender()
 
     def _initialize_connexion(self, retries: Int = 0, **show_options) -> None:
         """
@@ -542,9 +630,9 @@ class OnlineCallbackServer(OnlineCallbackAbstract):
 
         # Sends message type and dimensions
         self._socket.sendall(
-            f"{_ServerMessages.INITIATE_CONNEXION.value}\n{[len(serialized_ocp), len(serialized_show_options)]}".ljust(
-                _HEADER_GENERIC_LEN, "\0"
-            ).encode()
+            _pack_message_header(
+                _ServerMessages.INITIATE_CONNEXION, [len(serialized_ocp), len(serialized_show_options)]
+            )
         )
         if not self._has_received_ok():
             raise RuntimeError("The server did not acknowledge the connexion")
@@ -562,6 +650,85 @@ class OnlineCallbackServer(OnlineCallbackAbstract):
             self.ocp, only_initialize_variables=True, dummy_phase_times=dummy_phase_times, **show_options
         )
 
+    def _start_sender(self) -> None:
+        """
+        Starts the thread which parses the data and sends them to the server, so the solver only has to copy the
+        current iterate (see eval). The data are copied in two buffers, so the one being parsed is never overwritten
+        """
+
+        self._buffers: AnyList = [None, None]
+        self._latest_slot: IntOptional = None  # The buffer with the most recent data not yet taken by the sender
+        self._parsed_slot: IntOptional = None  # The buffer currently parsed by the sender
+        self._n_received: Int = 0
+        self._n_sent: Int = 0
+        self._is_closing: Bool = False
+        self._is_sender_running: Bool = True
+        self._condition = threading.Condition()
+        self._socket_lock = threading.Lock()
+
+        self._sender = threading.Thread(target=self._send_loop, daemon=True)
+        self._sender.start()
+
+    def _send_loop(self) -> None:
+        """
+        Waits for new data, then for the server to be ready, and sends the most recent data received in the meantime
+        (the previous ones are discarded)
+        """
+
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._latest_slot is not None or self._is_closing)
+                    if self._is_closing:
+                        return
+
+                if self._socket.recv(_ResponseHeader.response_len()).decode() != _ResponseHeader.READY_FOR_NEXT_DATA:
+                    continue
+
+                with self._condition:
+                    slot = self._latest_slot
+                    n_received = self._n_received
+                    self._parsed_slot, self._latest_slot = slot, None
+
+                xdata, ydata = self._plotter.parse_data(**self._buffers[slot])
+                self._send_xydata(xdata, ydata)
+
+                with self._condition:
+                    self._parsed_slot = None
+                    self._n_sent = n_received
+                    self._condition.notify_all()
+        except OSError:
+            # The connexion was closed
+            pass
+        finally:
+            with self._condition:
+                self._is_sender_running = False
+                self._condition.notify_all()
+
+    def _send_xydata(self, xdata: AnyIterable, ydata: AnyIterable) -> None:
+        """
+        Sends the parsed data to the server
+
+        Parameters
+        ----------
+        xdata: list
+            The X data from PlotOcp.parse_data
+        ydata: list
+            The Y data from PlotOcp.parse_data
+        """
+
+        header, data_serialized = _serialize_xydata(xdata, ydata)
+
+        with self._socket_lock:
+            self._socket.sendall(_pack_message_header(_ServerMessages.NEW_DATA, [len(header), len(data_serialized)]))
+            if self._should_wait_ok_to_client_on_new_data and not self._has_received_ok():
+                raise RuntimeError("The server did not acknowledge the connexion")
+
+            self._socket.sendall(header)
+            self._socket.sendall(data_serialized)
+            if self._should_wait_ok_to_client_on_new_data and not self._has_received_ok():
+                raise RuntimeError("The server did not acknowledge the connexion")
+
     def _has_received_ok(self) -> Bool:
         """
         Checks if the server has sent an OK message
@@ -578,19 +745,30 @@ class OnlineCallbackServer(OnlineCallbackAbstract):
         Closes the connexion
         """
 
-        self._socket.sendall(f"{_ServerMessages.CLOSE_CONNEXION.value}\nGoodbye from client!".encode())
-        self._socket.close()
+        with self._condition:
+            self._is_closing = True
+            self._condition.notify_all()
+
+        with self._socket_lock:
+            self._socket.sendall(_pack_message_header(_ServerMessages.CLOSE_CONNEXION, []))
+            try:
+                # Wake up the sender if it is waiting for the server
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._socket.close()
 
     def eval(self, arg: AnyIterable, enforce: Bool = False) -> IntIterableOptional:
         """
-        Sends the current data to the plotter, this method is automatically called by the solver
+        Copies the current data for the sender thread, this method is automatically called by the solver. The parsing
+        and the sending are done by the sender, so the solver is not slowed down by the plots
 
         Parameters
         ----------
         arg: list | tuple
             The current data
         enforce: bool
-            If True, the client will block until the server is ready to receive new data. This is useful at the end of
+            If True, the client will block until these data are sent to the server. This is useful at the end of
             the optimization to make sure the data are plot (and not discarded)
 
         Returns
@@ -598,44 +776,33 @@ class OnlineCallbackServer(OnlineCallbackAbstract):
         A mandatory [0] to respect the CasADi callback signature
         """
 
-        if not enforce:
-            self._socket.setblocking(False)
-
-        try:
-            data = self._socket.recv(_ResponseHeader.response_len()).decode()
-            if data != _ResponseHeader.READY_FOR_NEXT_DATA:
+        with self._condition:
+            if not self._is_sender_running:
                 return [0]
-        except BlockingIOError:
-            # This is to prevent the solving to be blocked by the server if it is not ready to update the plots
-            return [0]
-        finally:
-            self._socket.setblocking(True)
 
-        args_dict = {}
-        for i, s in enumerate(nlpsol_out()):
-            args_dict[s] = arg[i]
-        xdata, ydata = self._plotter.parse_data(**args_dict)
-        header, data_serialized = _serialize_xydata(xdata, ydata)
+            slot = 0 if self._parsed_slot is None else 1 - self._parsed_slot
+            if self._buffers[slot] is None:
+                self._buffers[slot] = {name: np.array(arg[i], dtype=float) for i, name in enumerate(nlpsol_out())}
+            else:
+                for i, name in enumerate(nlpsol_out()):
+                    self._buffers[slot][name][...] = arg[i]
 
-        self._socket.sendall(
-            f"{_ServerMessages.NEW_DATA.value}\n{[len(header), len(data_serialized)]}".ljust(
-                _HEADER_GENERIC_LEN, "\0"
-            ).encode()
-        )
-        if self._should_wait_ok_to_client_on_new_data and not self._has_received_ok():
-            raise RuntimeError("The server did not acknowledge the connexion")
+            self._latest_slot = slot
+            self._n_received += 1
+            self._condition.notify_all()
 
-        self._socket.sendall(header)
-        self._socket.sendall(data_serialized)
-        if self._should_wait_ok_to_client_on_new_data and not self._has_received_ok():
-            raise RuntimeError("The server did not acknowledge the connexion")
+            if enforce:
+                n_received = self._n_received
+                self._condition.wait_for(lambda: self._n_sent >= n_received or not self._is_sender_running)
 
         return [0]
 
 
 def _serialize_xydata(xdata: AnyIterable, ydata: AnyIterable) -> AnyTuple:
     """
-    Serialize the data to send to the server, it will be deserialized by `_deserialize_xydata`
+    Serialize the data to send to the server, it will be deserialized by `_deserialize_xydata`. The header is a buffer
+    of int64 describing the structure (number of phases, nodes and steps) and the data are all the values in one
+    contiguous buffer of float64. Both are returned as views of the arrays, so they are sent without further copy
 
     Parameters
     ----------
@@ -649,30 +816,31 @@ def _serialize_xydata(xdata: AnyIterable, ydata: AnyIterable) -> AnyTuple:
     The serialized data as expected by the server (header, serialized_data)
     """
 
-    header = f"{len(xdata)}"
-    data_serialized = b""
+    header = [len(xdata)]
+    values = []
     for x_nodes in xdata:
-        header += f",{len(x_nodes)}"
+        header.append(len(x_nodes))
         for x_steps in x_nodes:
-            header += f",{x_steps.shape[0]}"
-            x_steps_tp = np.array(x_steps)[:, 0].tolist()
-            data_serialized += struct.pack("d" * len(x_steps_tp), *x_steps_tp)
+            x_steps = np.asarray(x_steps, dtype=_DATA_DTYPE)[:, 0]
+            header.append(x_steps.shape[0])
+            values.append(x_steps)
 
-    header += f",{len(ydata)}"
+    header.append(len(ydata))
     for y_nodes_variable in ydata:
         if isinstance(y_nodes_variable, np.ndarray):
-            header += f",0"
+            header.append(0)
             y_nodes_variable = [y_nodes_variable]
         else:
-            header += f",{len(y_nodes_variable)}"
+            header.append(len(y_nodes_variable))
 
         for y_steps in y_nodes_variable:
-            header += f",{y_steps.shape[0]}"
-            y_steps_tp = y_steps.tolist()
-            data_serialized += struct.pack("d" * len(y_steps_tp), *y_steps_tp)
+            y_steps = np.asarray(y_steps, dtype=_DATA_DTYPE).reshape(-1)
+            header.append(y_steps.shape[0])
+            values.append(y_steps)
 
-    header = header.encode()
-    return header, data_serialized
+    header = np.array(header, dtype=_LENGTH_DTYPE)
+    data = np.concatenate(values) if values else np.zeros(0, dtype=_DATA_DTYPE)
+    return memoryview(header).cast("B"), memoryview(data).cast("B")
 
 
 def _deserialize_xydata(serialized_raw_data: AnyIterable) -> AnyTuple:
@@ -689,12 +857,9 @@ def _deserialize_xydata(serialized_raw_data: AnyIterable) -> AnyTuple:
     The deserialized data as expected by PlotOcp.update_data
     """
 
-    # Header is made of ints comma separated from the first line
-    header = [int(v) for v in serialized_raw_data[0].decode().split(",")]
-
-    # Data is made of doubles (d) from the second line, the length of which is 8 bytes each
-    data = serialized_raw_data[1]
-    all_data = np.array(struct.unpack("d" * (len(data) // 8), data))
+    header = np.frombuffer(serialized_raw_data[0], dtype=_LENGTH_DTYPE).tolist()
+    # The data are copied once since the plotter keeps views on them while the receive buffer is reused
+    all_data = np.frombuffer(serialized_raw_data[1], dtype=_DATA_DTYPE).copy()
 
     # Based on the header, we can now parse the data, assuming the number of phases, nodes and steps from the header
     header_cmp = 0
@@ -829,7 +829,9 @@ class PlotOcp:
 
         sol = Solution.from_vector(self.ocp, args["x"])
         data_states_decision = sol.decision_states(scaled=True, to_merge=SolutionMerge.KEYS)
-        data_states_stepwise = sol.stepwise_states(scaled=True, to_merge=SolutionMerge.KEYS)
+        data_states_stepwise = sol.stepwise_states(
+            scaled=True, to_merge=SolutionMerge.KEYS, from_integrator_outputs=True
+        )
 
         data_controls = sol.stepwise_controls(scaled=True, to_merge=SolutionMerge.KEYS)
         p = sol.decision_parameters(scaled=True, to_merge=SolutionMerge.KEYS)
@@ -922,7 +924,7 @@ class PlotOcp:
         if self.ocp.plot_check_conditioning:
             from ..gui.check_conditioning import update_conditioning_plots
 
-            update_conditioning_plots(args["x"], self.ocp)
+            update_conditioning_plots(args["x"], self.ocp, args["lam_g"])
 
     def _compute_y_from_plot_func(
         self,
@@ -11,6 +11,7 @@ from ..misc.parameters_types import (
     Int,
     Float,
     Str,
+    StrOptional,
     AnyDictOptional,
 )
 
@@ -55,6 +56,9 @@ class FATROP(GenericSolver):
         The valid range for this integer option is 0 ≤ print_level ≤ 12 and its default value is 5.
     _c_compile: bool
         True if you want to compile in C the code.
+    _c_compile_cache_dir: str
+        The folder where the compiled solvers are stored and reloaded from (only used if _c_compile is True). If None,
+        the solver is compiled at each solve
     """
 
     type: SolverType = SolverType.FATROP
@@ -72,6 +76,7 @@ class FATROP(GenericSolver):
     _bound_push: Float = 0.01
     _print_level: Int = 5
     _c_compile: Bool = False
+    _c_compile_cache_dir: StrOptional = None
 
     def __post_init__(self):
         if self.online_optim == OnlineOptim.DEFAULT:
@@ -117,6 +122,10 @@ class FATROP(GenericSolver):
     def c_compile(self) -> Bool:
         return self._c_compile
 
+    @property
+    def c_compile_cache_dir(self) -> StrOptional:
+        return self._c_compile_cache_dir
+
     def set_tol(self, val: Float) -> None:
         self._tol = val
 
@@ -147,6 +156,9 @@ class FATROP(GenericSolver):
     def set_c_compile(self, val: Bool) -> None:
         self._c_compile = val
 
+    def set_c_compile_cache_dir(self, val: StrOptional) -> None:
+        self._c_compile_cache_dir = val
+
     def set_convergence_tolerance(self, val: Float) -> None:
         self._tol = val
         self._acceptable_tol = val
@@ -192,6 +204,7 @@ class FATROP(GenericSolver):
         options = {}
         non_python_options = [
             "_c_compile",
+            "_c_compile_cache_dir",
             "type",
             "show_online_optim",
             "online_optim",
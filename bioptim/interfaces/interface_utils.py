@@ -1,5 +1,10 @@
+from glob import glob
+from hashlib import sha256
+import os
+import shutil
 from time import perf_counter
 
+import casadi
 from casadi import Importer, Function, horzcat, vertcat, sum1, sum2, nlpsol, SX, MX, DM, reshape, jacobian
 import numpy as np
 
@@ -10,7 +15,7 @@ from ..gui.online_callback_server import OnlineCallbackServer
 from ..limits.path_conditions import Bounds
 from ..limits.penalty_helpers import PenaltyHelpers, Slicy
 from ..misc.enums import InterpolationType, OnlineOptim
-from ..misc.parameters_types import AnyDictOptional, Bool, AnyDict, CX, DoubleNpArrayTuple, Int
+from ..misc.parameters_types import AnyDictOptional, Bool, AnyDict, CX, DoubleNpArrayTuple, Int, Str, StrOptional
 from ..optimization.non_linear_program import NonLinearProgram
 from ..optimization.solution.solution import Solution
 
@@ -103,31 +108,42 @@ def generic_solve(interface: SolverInterface, expand_during_shake_tree: Bool = F
     A reference to the solution
     """
 
-    v = interface.ocp.variables_vector
-    v_bounds = interface.ocp.bounds_vectors
-    v_init = interface.ocp.init_vector
-
-    # Shake the tree if needed for objectives
-    raw_objectives = interface.dispatch_obj_func()
-    can_skip_shake_objectives = _vectors_are_equal(
-        interface.pre_shake_tree_objectives, raw_objectives, v=v, v_init=v_init, v_min=v_bounds[0], v_max=v_bounds[1]
-    )
-    interface.pre_shake_tree_objectives = raw_objectives
-    if interface.shaked_objectives is None or not can_skip_shake_objectives:
-        interface.shaked_objectives = _shake_penalties_tree(
-            interface.ocp, raw_objectives, v, v_bounds, expand_during_shake_tree
+    ocp = interface.ocp
+    v = ocp.variables_vector
+    v_bounds = ocp.bounds_vectors
+    v_init = ocp.init_vector
+
+    # Shake the tree if needed for objectives. If only numerical data (bounds, initial guess) changed since the last
+    # solve, the graph is reused as is without being dispatched again
+    can_skip_shake_objectives = interface.shaked_objectives is not None and not ocp.are_objectives_modified
+    if not can_skip_shake_objectives:
+        raw_objectives = interface.dispatch_obj_func()
+        can_skip_shake_objectives = _vectors_are_equal(
+            interface.pre_shake_tree_objectives,
+            raw_objectives,
+            v=v,
+            v_init=v_init,
+            v_min=v_bounds[0],
+            v_max=v_bounds[1],
         )
+        interface.pre_shake_tree_objectives = raw_objectives
+        if interface.shaked_objectives is None or not can_skip_shake_objectives:
+            interface.shaked_objectives = _shake_penalties_tree(
+                ocp, raw_objectives, v, v_bounds, expand_during_shake_tree
+            )
+        ocp.are_objectives_modified = False
 
     # Shake the tree if needed for constraints
-    raw_g, all_g_bounds = interface.dispatch_bounds()
-    can_skip_shake_constraints = _vectors_are_equal(
-        interface.pre_shake_tree_constraints, raw_g, v=v, v_init=v_init, v_min=v_bounds[0], v_max=v_bounds[1]
-    )
-    interface.pre_shake_tree_constraints = raw_g
-    if interface.shaked_constraints is None or not can_skip_shake_constraints:
-        interface.shaked_constraints = _shake_penalties_tree(
-            interface.ocp, raw_g, v, v_bounds, expand_during_shake_tree
+    can_skip_shake_constraints = interface.shaked_constraints is not None and not ocp.are_constraints_modified
+    if not can_skip_shake_constraints:
+        raw_g, interface.all_g_bounds = interface.dispatch_bounds()
+        can_skip_shake_constraints = _vectors_are_equal(
+            interface.pre_shake_tree_constraints, raw_g, v=v, v_init=v_init, v_min=v_bounds[0], v_max=v_bounds[1]
         )
+        interface.pre_shake_tree_constraints = raw_g
+        if interface.shaked_constraints is None or not can_skip_shake_constraints:
+            interface.shaked_constraints = _shake_penalties_tree(ocp, raw_g, v, v_bounds, expand_during_shake_tree)
+        ocp.are_constraints_modified = False
 
     # Set online_optim and show_online_optim options
     if interface.opts.show_online_optim is not None:
@@ -142,8 +158,8 @@ def generic_solve(interface: SolverInterface, expand_during_shake_tree: Bool = F
     interface.limits = {
         "lbx": v_bounds[0],
         "ubx": v_bounds[1],
-        "lbg": all_g_bounds.min,
-        "ubg": all_g_bounds.max,
+        "lbg": interface.all_g_bounds.min,
+        "ubg": interface.all_g_bounds.max,
         "x0": v_init,
     }
     if interface.shaked_ocp_solver is None or not can_skip_shake_objectives or not can_skip_shake_constraints:
@@ -152,8 +168,7 @@ def generic_solve(interface: SolverInterface, expand_during_shake_tree: Bool = F
         options = interface.opts.as_dict(interface)
 
         if interface.c_compile:
-            nlpsol("nlpsol", interface.solver_name.lower(), interface.nlp, options).generate_dependencies("nlp.c")
-            interface.shaked_ocp_solver = nlpsol("nlpsol", interface.solver_name, Importer("nlp.c", "shell"), options)
+            interface.shaked_ocp_solver = _compile_ocp_solver(interface, options)
         else:
             interface.shaked_ocp_solver = nlpsol("solver", interface.solver_name.lower(), interface.nlp, options)
 
@@ -196,6 +211,108 @@ def generic_solve(interface: SolverInterface, expand_during_shake_tree: Bool = F
     return interface.out
 
 
+def _compile_ocp_solver(interface: SolverInterface, options: AnyDict):
+    """
+    Generate the C code of the nlp, compile it and load the resulting solver. If a cache directory is set in the
+    solver options, the compiled library is stored there under a hash of the nlp and of the solver options, so an
+    identical problem is only compiled once and then reloaded by any subsequent solve (even from another process)
+
+    Parameters
+    ----------
+    interface: SolverInterface
+        A reference to the current interface
+    options: dict
+        The options to send to nlpsol
+
+    Returns
+    -------
+    The compiled solver
+    """
+
+    cache_dir = interface.opts.c_compile_cache_dir
+    if cache_dir is None:
+        nlpsol("nlpsol", interface.solver_name.lower(), interface.nlp, options).generate_dependencies("nlp.c")
+        return nlpsol("nlpsol", interface.solver_name.lower(), Importer("nlp.c", "shell"), options)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    lib_name = f"nlp_{_nlp_hash(interface, options)}"
+    lib_path = _find_compiled_library(cache_dir, lib_name)
+    if lib_path is None:
+        # Everything is written under a process-unique name and only renamed once complete, so concurrent jobs sharing
+        # the same cache never load (nor overwrite) a partially written library
+        tmp_name = f"{lib_name}_{os.getpid()}"
+        c_file = nlpsol("nlpsol", interface.solver_name.lower(), interface.nlp, options).generate_dependencies(
+            f"{tmp_name}.c"
+        )
+        # CasADi can only generate the file in the current directory, which may be on another filesystem than the
+        # cache (where os.replace fails)
+        tmp_c_file = os.path.join(cache_dir, f"{tmp_name}.c")
+        shutil.move(c_file, tmp_c_file)
+        Importer(
+            tmp_c_file, "shell", {"directory": cache_dir, "name": tmp_name, "temp_suffix": False, "cleanup": False}
+        )
+
+        tmp_lib_path = _find_compiled_library(cache_dir, tmp_name)
+        if tmp_lib_path is None:
+            raise RuntimeError(f"The compilation of {tmp_c_file} did not produce any library")
+        lib_path = os.path.join(cache_dir, lib_name + os.path.splitext(tmp_lib_path)[1])
+        os.replace(tmp_lib_path, lib_path)
+        for file in glob(os.path.join(cache_dir, f"{tmp_name}.*")):
+            os.remove(file)
+
+    return nlpsol("nlpsol", interface.solver_name.lower(), Importer(lib_path, "dll"), options)
+
+
+def _nlp_hash(interface: SolverInterface, options: AnyDict) -> Str:
+    """
+    Compute the key of the nlp in the compiled solver cache, that is a hash of the serialized objective and
+    constraint graph, of the solver and of the solver options
+
+    Parameters
+    ----------
+    interface: SolverInterface
+        A reference to the current interface
+    options: dict
+        The options to send to nlpsol
+
+    Returns
+    -------
+    The hexadecimal hash of the nlp
+    """
+
+    nlp = Function("nlp", [interface.nlp["x"]], [interface.nlp["f"], interface.nlp["g"]])
+
+    key = sha256(nlp.serialize().encode())
+    key.update(f"{casadi.__version__}{interface.solver_name.lower()}".encode())
+    for option in sorted(options.keys()):
+        # Python objects (e.g. the iteration_callback) have no effect on the generated code
+        if isinstance(options[option], (bool, int, float, str, list, tuple)):
+            key.update(f"{option}={options[option]}".encode())
+    return key.hexdigest()
+
+
+def _find_compiled_library(folder: Str, name: Str) -> StrOptional:
+    """
+    Find the shared library (whatever the extension of the current platform) compiled under the name "name"
+
+    Parameters
+    ----------
+    folder: str
+        The folder to search in
+    name: str
+        The name of the library without its extension
+
+    Returns
+    -------
+    The path to the library or None if it was not compiled yet
+    """
+
+    for file in glob(os.path.join(folder, f"{name}.*")):
+        if os.path.splitext(file)[1] in (".so", ".dylib", ".dll"):
+            return file
+    return None
+
+
 def _shake_penalties_tree(ocp, penalties_cx: CX, v: CX, v_bounds: DoubleNpArrayTuple, expand: Bool):
     """
     Remove the dt in the objectives and constraints if they are constant
@@ -268,53 +385,50 @@ def generic_dispatch_bounds(interface, include_g: Bool, include_g_internal: Bool
         If the g_internal bounds should be included
     """
 
-    all_g_dict = {}
-    all_g_bounds_dict = {}
+    # The fragments are collected per node and concatenated once at the end, so the assembly is linear in the number
+    # of constraints
+    all_g_dict = {-1: []}
+    all_g_bounds_dict = {-1: []}
 
-    all_g_dict[-1] = interface.ocp.cx()
-    all_g_bounds_dict[-1] = Bounds("all_g", interpolation=InterpolationType.CONSTANT)
+    def _collect(nlp, penalties, base_idx):
+        penalties, bounds = interface.get_all_penalties(nlp, penalties, get_bounds=True)
+        for (node_idx, node_penalty), node_bounds in zip(penalties.items(), bounds.values()):
+            all_g_dict[base_idx + node_idx].append(node_penalty)
+            all_g_bounds_dict[base_idx + node_idx].append(node_bounds)
 
     if include_g_internal:
         penalties, bounds = interface.get_all_penalties(interface.ocp, interface.ocp.g_internal, get_bounds=True)
-        for (_, node_penalty), node_bounds in zip(penalties.items(), bounds.values()):
-            all_g_dict[-1] = vertcat(all_g_dict[-1], node_penalty)
-            all_g_bounds_dict[-1].concatenate(node_bounds)
+        all_g_dict[-1].extend(penalties.values())
+        all_g_bounds_dict[-1].extend(bounds.values())
 
     if include_g:
         penalties, bounds = interface.get_all_penalties(interface.ocp, interface.ocp.g, get_bounds=True)
-        for (_, node_penalty), node_bounds in zip(penalties.items(), bounds.values()):
-            all_g_dict[-1] = vertcat(all_g_dict[-1], node_penalty)
-            all_g_bounds_dict[-1].concatenate(node_bounds)
+        all_g_dict[-1].extend(penalties.values())
+        all_g_bounds_dict[-1].extend(bounds.values())
 
     base_idx = 0
     for nlp in interface.ocp.nlp:
         for i in range(nlp.ns + 1):
-            all_g_dict[base_idx + i] = interface.ocp.cx()
-            all_g_bounds_dict[base_idx + i] = Bounds(
-                f"g_phase{len(all_g_dict)}", interpolation=InterpolationType.CONSTANT
-            )
+            all_g_dict[base_idx + i] = []
+            all_g_bounds_dict[base_idx + i] = []
 
         if include_g_internal:
-            penalties, bounds = interface.get_all_penalties(nlp, nlp.g_internal, get_bounds=True)
-            for (node_idx, node_penalty), node_bounds in zip(penalties.items(), bounds.values()):
-                all_g_dict[base_idx + node_idx] = vertcat(all_g_dict[base_idx + node_idx], node_penalty)
-                all_g_bounds_dict[base_idx + node_idx].concatenate(node_bounds)
+            _collect(nlp, nlp.g_internal, base_idx)
 
         if include_g:
-            penalties, bounds = interface.get_all_penalties(nlp, nlp.g, get_bounds=True)
-            for (node_idx, node_penalty), node_bounds in zip(penalties.items(), bounds.values()):
-                all_g_dict[base_idx + node_idx] = vertcat(all_g_dict[base_idx + node_idx], node_penalty)
-                all_g_bounds_dict[base_idx + node_idx].concatenate(node_bounds)
+            _collect(nlp, nlp.g, base_idx)
 
         base_idx += nlp.ns + 1
 
-    all_g = interface.ocp.cx()
+    all_g_fragments = []
+    all_g_bounds_fragments = []
+    for key in sorted(all_g_dict.keys()):
+        all_g_fragments.extend(all_g_dict[key])
+        all_g_bounds_fragments.extend(all_g_bounds_dict[key])
+
+    all_g = vertcat(interface.ocp.cx(), *all_g_fragments)
     all_g_bounds = Bounds("all_g", interpolation=InterpolationType.CONSTANT)
-    keys = list(all_g_dict.keys())
-    keys.sort()
-    for key in keys:
-        all_g = vertcat(all_g, all_g_dict[key])
-        all_g_bounds.concatenate(all_g_bounds_dict[key])
+    all_g_bounds.concatenate(*all_g_bounds_fragments)
 
     if isinstance(all_g_bounds.min, (SX, MX)) or isinstance(all_g_bounds.max, (SX, MX)):
         raise RuntimeError(f"{interface.solver_name} doesn't support SX/MX types in constraints bounds")
@@ -330,32 +444,27 @@ def generic_dispatch_obj_func(interface) -> CX:
     SX | MX
         The objective function
     """
-    all_J_dict = {}
 
-    all_J_dict[-1] = interface.ocp.cx()
-    for _, node_penalty in interface.get_all_penalties(interface.ocp, interface.ocp.J_internal).items():
-        all_J_dict[-1] = vertcat(all_J_dict[-1], node_penalty)
-    for _, node_penalty in interface.get_all_penalties([], interface.ocp.J).items():
-        all_J_dict[-1] = vertcat(all_J_dict[-1], node_penalty)
+    all_J_dict = {-1: []}
+    all_J_dict[-1].extend(interface.get_all_penalties(interface.ocp, interface.ocp.J_internal).values())
+    all_J_dict[-1].extend(interface.get_all_penalties([], interface.ocp.J).values())
 
     phase_node_counts = 0
     for nlp in interface.ocp.nlp:
         for i in range(nlp.ns + 1):
-            all_J_dict[phase_node_counts + i] = interface.ocp.cx()
+            all_J_dict[phase_node_counts + i] = []
 
         for node_idx, node_penalty in interface.get_all_penalties(nlp, nlp.J_internal).items():
-            all_J_dict[node_idx + phase_node_counts] = vertcat(all_J_dict[node_idx + phase_node_counts], node_penalty)
+            all_J_dict[node_idx + phase_node_counts].append(node_penalty)
         for node_idx, node_penalty in interface.get_all_penalties(nlp, nlp.J).items():
-            all_J_dict[node_idx + phase_node_counts] = vertcat(all_J_dict[node_idx + phase_node_counts], node_penalty)
+            all_J_dict[node_idx + phase_node_counts].append(node_penalty)
 
         phase_node_counts += nlp.ns + 1
 
-    all_J = interface.ocp.cx()
-    keys = list(all_J_dict.keys())
-    keys.sort()
-    for key in keys:
-        all_J = vertcat(all_J, all_J_dict[key])
-    return all_J
+    all_J_fragments = []
+    for key in sorted(all_J_dict.keys()):
+        all_J_fragments.extend(all_J_dict[key])
+    return vertcat(interface.ocp.cx(), *all_J_fragments)
 
 
 def generic_get_all_penalties(
@@ -388,11 +497,10 @@ def generic_get_all_penalties(
     for penalty in penalties:
         if penalty and penalty.node_idx:
             highest_index = max(highest_index, *penalty.node_idx)
-    out = {i: interface.ocp.cx() for i in range(highest_index + 1)}
-    if get_bounds:
-        out_bounds = {
-            i: Bounds(f"penalty_{i}", interpolation=InterpolationType.CONSTANT) for i in range(highest_index + 1)
-        }
+
+    # Each node accumulates its fragments in a list which is concatenated once all the penalties are parsed
+    out_fragments = {i: [] for i in range(highest_index + 1)}
+    out_bounds_fragments = {i: [] for i in range(highest_index + 1)}
 
     ocp = interface.ocp
     for penalty in penalties:
@@ -405,52 +513,43 @@ def generic_get_all_penalties(
             if penalty.target is not None and len(penalty.target.shape) != 2:
                 raise NotImplementedError("multi_thread penalty with target shape != [n x m] is not implemented yet")
 
-            t0 = nlp.cx()
-            x = nlp.cx()
-            u = nlp.cx()
-            a = nlp.cx()
-            d = None
-            weight = DM()
-            target = DM()
-            if get_bounds:
-                bound_tp = Bounds(f"penalty_multi_thread_{penalty.name}", interpolation=InterpolationType.CONSTANT)
+            t0 = []
+            x = []
+            u = []
+            a = []
+            d = []
+            weight = []
+            target = []
             for idx in range(len(penalty.node_idx)):
                 t0_tp, x_tp, u_tp, p, a_tp, d_tp, weight_tp, target_tp = _get_weighted_function_inputs(
                     penalty, idx, ocp, nlp, scaled
                 )
 
-                t0 = horzcat(t0, t0_tp)
-                if idx != 0 and x_tp.shape[0] != x.shape[0]:
-                    tp = ocp.cx.nan(x.shape[0], 1)
-                    tp[: x_tp.shape[0], :] = x_tp
-                    x_tp = tp
-                x = horzcat(x, x_tp)
-                if idx != 0 and u_tp.shape[0] != u.shape[0]:
-                    tp = ocp.cx.nan(u.shape[0], 1)
-                    tp[: u_tp.shape[0], :] = u_tp
-                    u_tp = tp
-                u = horzcat(u, u_tp)
-                if idx != 0 and a_tp.shape[0] != a.shape[0]:
-                    tp = ocp.cx.nan(a.shape[0], 1)
-                    tp[: a_tp.shape[0], :] = a_tp
-                    a_tp = tp
-                a = horzcat(a, a_tp)
-                d = horzcat(d, d_tp) if d is not None else d_tp
-                weight = horzcat(weight, weight_tp)
-                target = horzcat(target, target_tp)
+                t0.append(t0_tp)
+                x.append(_pad_with_nan(ocp, x_tp, x[0].shape[0]) if x else x_tp)
+                u.append(_pad_with_nan(ocp, u_tp, u[0].shape[0]) if u else u_tp)
+                a.append(_pad_with_nan(ocp, a_tp, a[0].shape[0]) if a else a_tp)
+                if d_tp is not None:
+                    d.append(d_tp)
+                weight.append(weight_tp)
+                target.append(target_tp)
                 if get_bounds:
                     if penalty.bounds is None:
                         raise RuntimeError("Cannot get bounds if penalty.bounds is None")
-                    bound_tp.concatenate(penalty.bounds)
+                    out_bounds_fragments[0].append(penalty.bounds)
+
+            t0 = horzcat(nlp.cx(), *t0)
+            x = horzcat(nlp.cx(), *x)
+            u = horzcat(nlp.cx(), *u)
+            a = horzcat(nlp.cx(), *a)
+            d = horzcat(*d) if d else None
+            weight = horzcat(DM(), *weight)
+            target = horzcat(DM(), *target)
 
             # We can call penalty.weighted_function[0] since multi-thread declares all the node at [0]
-            out[0] = vertcat(
-                out[0], sum2(reshape(penalty.weighted_function[0](t0, phases_dt, x, u, p, a, d, weight, target), -1, 1))
+            out_fragments[0].append(
+                sum2(reshape(penalty.weighted_function[0](t0, phases_dt, x, u, p, a, d, weight, target), -1, 1))
             )
-            if get_bounds:
-                if penalty.bounds is None:
-                    raise RuntimeError("Cannot get bounds if penalty.bounds is None")
-                out_bounds[0].concatenate(bound_tp)
         else:
             for idx in range(len(penalty.node_idx)):
                 if nlp:
@@ -460,20 +559,50 @@ def generic_get_all_penalties(
                 t0, x, u, p, a, d, weight, target = _get_weighted_function_inputs(penalty, idx, ocp, nlp, scaled)
 
                 node_idx = penalty.node_idx[idx]
-                out[node_idx] = vertcat(
-                    out[node_idx],
-                    sum2(penalty.weighted_function[node_idx](t0, phases_dt, x, u, p, a, d, weight, target)),
+                out_fragments[node_idx].append(
+                    sum2(penalty.weighted_function[node_idx](t0, phases_dt, x, u, p, a, d, weight, target))
                 )
                 if get_bounds:
                     if penalty.bounds is None:
                         raise RuntimeError("Cannot get bounds if penalty.bounds is None")
-                    out_bounds[node_idx].concatenate(penalty.bounds)
+                    out_bounds_fragments[node_idx].append(penalty.bounds)
 
+    out = {i: vertcat(ocp.cx(), *fragments) for i, fragments in out_fragments.items()}
     if get_bounds:
+        out_bounds = {}
+        for i, fragments in out_bounds_fragments.items():
+            out_bounds[i] = Bounds(f"penalty_{i}", interpolation=InterpolationType.CONSTANT)
+            out_bounds[i].concatenate(*fragments)
         out = (out, out_bounds)
     return out
 
 
+def _pad_with_nan(ocp, value: CX, n_rows: Int) -> CX:
+    """
+    Pad a column vector with NaN so it has the requested number of rows. This is used by the multi_thread penalties
+    when the nodes do not share the same dimension (e.g. the last node has no collocation points)
+
+    Parameters
+    ----------
+    ocp:
+        A reference to the ocp
+    value: CX
+        The column vector to pad
+    n_rows: int
+        The number of rows expected
+
+    Returns
+    -------
+    The padded vector
+    """
+
+    if value.shape[0] == n_rows:
+        return value
+    tp = ocp.cx.nan(n_rows, 1)
+    tp[: value.shape[0], :] = value
+    return tp
+
+
 def _get_weighted_function_inputs(penalty, penalty_idx: Int, ocp, nlp: NonLinearProgram, scaled: Bool):
     t0 = PenaltyHelpers.t0(penalty, penalty_idx, lambda p_idx, n_idx: ocp.node_time(phase_idx=p_idx, node_idx=n_idx))
 
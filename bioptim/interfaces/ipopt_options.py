@@ -11,6 +11,7 @@ from ..misc.parameters_types import (
     Int,
     Float,
     Str,
+    StrOptional,
     AnyDictOptional,
 )
 
@@ -79,6 +80,9 @@ class IPOPT(GenericSolver):
         The valid range for this integer option is 0 ≤ print_level ≤ 12 and its default value is 5.
     _c_compile: bool
         True if you want to compile in C the code.
+    _c_compile_cache_dir: str
+        The folder where the compiled solvers are stored and reloaded from (only used if _c_compile is True). If None,
+        the solver is compiled at each solve
     _check_derivatives_for_naninf: bool
         If true, the Hessian will be checked for nan/inf values. If false this computational problem is silent.
     """
@@ -111,6 +115,7 @@ class IPOPT(GenericSolver):
     _bound_frac: Float = 0.01
     _print_level: Int = 5
     _c_compile: Bool = False
+    _c_compile_cache_dir: StrOptional = None
     _check_derivatives_for_naninf: Str = "no"  # "yes"
 
     @property
@@ -209,6 +214,10 @@ class IPOPT(GenericSolver):
     def c_compile(self) -> Bool:
         return self._c_compile
 
+    @property
+    def c_compile_cache_dir(self) -> StrOptional:
+        return self._c_compile_cache_dir
+
     @property
     def check_derivatives_for_naninf(self) -> Bool:
         return self._check_derivatives_for_naninf
@@ -285,6 +294,9 @@ class IPOPT(GenericSolver):
     def set_c_compile(self, val: Bool) -> None:
         self._c_compile = val
 
+    def set_c_compile_cache_dir(self, val: StrOptional) -> None:
+        self._c_compile_cache_dir = val
+
     def set_check_derivatives_for_naninf(self, val: Bool) -> None:
         string_val = "yes" if val else "no"
         self._check_derivatives_for_naninf = string_val
@@ -340,7 +352,14 @@ class IPOPT(GenericSolver):
     def as_dict(self, solver):
         solver_options = self.__dict__
         options = {}
-        non_python_options = ["_c_compile", "type", "show_online_optim", "online_optim", "show_options"]
+        non_python_options = [
+            "_c_compile",
+            "_c_compile_cache_dir",
+            "type",
+            "show_online_optim",
+            "online_optim",
+            "show_options",
+        ]
         for key in solver_options:
             if key not in non_python_options:
                 ipopt_key = "ipopt." + key[1:]
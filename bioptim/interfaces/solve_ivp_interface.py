@@ -1,7 +1,8 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Callable, Any
 
 import numpy as np
-from casadi import vertcat
+from casadi import horzcat, vertcat
 from scipy.integrate import solve_ivp
 from scipy.interpolate import interp1d
 
@@ -11,6 +12,8 @@ from ..misc.parameters_types import (
     NpArrayList,
     NpArray,
     Float,
+    Int,
+    Bool,
 )
 
 
@@ -25,6 +28,8 @@ def solve_ivp_interface(
     a: NpArrayList,
     d: NpArrayList,
     method: SolutionIntegrator = SolutionIntegrator.SCIPY_RK45,
+    n_pools: Int = 1,
+    use_processes: Bool = False,
 ):
     """
     This function solves the initial value problem with the dynamics_func built by bioptim
@@ -49,6 +54,12 @@ def solve_ivp_interface(
         The way we integrate the solution such as SINGLE, SINGLE_CONTINUOUS, MULTIPLE
     method: SolutionIntegrator
         The integrator to use to solve the OCP
+    n_pools: int
+        The number of workers used to integrate the intervals concurrently. This only applies to Shooting.MULTIPLE,
+        since it is the only shooting where the intervals are independent
+    use_processes: bool
+        If the workers are processes instead of threads (only for the scipy integrators, which are mostly python and
+        therefore bound by the GIL when using threads). The dynamics must then be picklable (serializable by CasADi)
 
     Returns
     -------
@@ -56,25 +67,413 @@ def solve_ivp_interface(
         array of the solution of the system at the times t_eval
     """
 
-    y = []
-    control_type = nlp.control_type
+    is_independent = shooting_type == Shooting.MULTIPLE
 
-    for node in range(nlp.ns):
-        if method == SolutionIntegrator.OCP:
-            t_span = vertcat(t[node][0], t[node][1] - t[node][0])
+    if method == SolutionIntegrator.OCP:
+        if is_independent and _is_mappable(nlp, x, u, a, d):
+            y = _solve_ivp_bioptim_mapped_interface(nlp, t, x, u, p, a, d, n_threads=n_pools)
         else:
-            t_span = t[node]
-        t_eval = np.linspace(
-            float(t_span[0]), float(t_span[1]), nlp.n_states_stepwise_steps(node, nlp.dynamics_type.ode_solver)
+            y = []
+            for node in range(nlp.ns):
+                t_span = vertcat(t[node][0], t[node][1] - t[node][0])
+
+                # If multiple shooting, we need to set the first x0, otherwise use the previous answer
+                x0i = np.array(x[node] if node == 0 or is_independent else y[-1][:, -1])
+                y.append(
+                    _solve_ivp_bioptim_interface(
+                        lambda t, x: nlp.dynamics[node](t, x, u[node], p, a[node], d[node])[1],
+                        x0=x0i,
+                        t_span=np.array(t_span),
+                    )
+                )
+
+    elif method in (
+        SolutionIntegrator.SCIPY_RK45,
+        SolutionIntegrator.SCIPY_RK23,
+        SolutionIntegrator.SCIPY_DOP853,
+        SolutionIntegrator.SCIPY_BDF,
+        SolutionIntegrator.SCIPY_LSODA,
+    ):
+        t_spans = [t[node] for node in range(nlp.ns)]
+        t_evals = [
+            np.linspace(
+                float(t_spans[node][0]),
+                float(t_spans[node][1]),
+                nlp.n_states_stepwise_steps(node, nlp.dynamics_type.ode_solver),
+            )
+            for node in range(nlp.ns)
+        ]
+
+        # The stiff methods benefit from the analytic jacobian of the dynamics, built once per distinct dynamics
+        list_of_jacobians = [None] * nlp.ns
+        if method in (SolutionIntegrator.SCIPY_BDF, SolutionIntegrator.SCIPY_LSODA):
+            jacobians = {}
+            for node in range(nlp.ns):
+                dynamics = list_of_dynamics[node]
+                if id(dynamics) not in jacobians:
+                    jacobians[id(dynamics)] = dynamics.factory(
+                        "dynamics_jacobian", dynamics.name_in(), [f"jac:{dynamics.name_out(0)}:{dynamics.name_in(1)}"]
+                    )
+                list_of_jacobians[node] = jacobians[id(dynamics)]
+
+        if is_independent and n_pools > 1:
+            # Each worker receives a contiguous chunk of intervals so the dynamics are sent once per chunk
+            executor_type = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with executor_type(n_pools) as executor:
+                futures = [
+                    executor.submit(
+                        _solve_ivp_scipy_intervals,
+                        [list_of_dynamics[i] for i in chunk],
+                        [list_of_jacobians[i] for i in chunk],
+                        nlp.control_type,
+                        [t_spans[i] for i in chunk],
+                        [t_evals[i] for i in chunk],
+                        [x[i] for i in chunk],
+                        [u[i] for i in chunk],
+                        p,
+                        [a[i] for i in chunk],
+                        [d[i] for i in chunk],
+                        method.value,
+                        False,
+                    )
+                    for chunk in np.array_split(range(nlp.ns), min(n_pools, nlp.ns))
+                ]
+                y = [result for future in futures for result in future.result()]
+        else:
+            y = _solve_ivp_scipy_intervals(
+                list_of_dynamics,
+                list_of_jacobians,
+                nlp.control_type,
+                t_spans,
+                t_evals,
+                x,
+                u,
+                p,
+                a,
+                d,
+                method.value,
+                not is_independent,
+            )
+
+    else:
+        raise NotImplementedError(f"{method} is not implemented yet")
+
+    y.append(x[-1] if shooting_type == Shooting.MULTIPLE else y[-1][:, -1][:, np.newaxis])
+
+    return y
+
+
+def _solve_ivp_scipy_intervals(
+    list_of_dynamics: list[Callable],
+    list_of_jacobians: list[Callable | None],
+    control_type: ControlType,
+    t_spans: NpArrayList,
+    t_evals: NpArrayList,
+    x: NpArrayList,
+    u: NpArrayList,
+    p: NpArray,
+    a: NpArrayList,
+    d: NpArrayList,
+    method: str,
+    is_chained: Bool,
+) -> NpArrayList:
+    """
+    Integrate consecutive intervals with scipy. This function only receives picklable data so it can be sent to a
+    process pool
+
+    Parameters
+    ----------
+    list_of_jacobians: list[Callable | None]
+        The jacobian of the dynamics with respect to the states for each interval (None to let scipy estimate it)
+    is_chained: bool
+        If each interval starts from the end of the previous one (only x[0] is then used), otherwise each interval
+        starts from its own x
+    """
+
+    y = []
+    for i in range(len(t_spans)):
+        x0i = np.array(x[i] if i == 0 or not is_chained else y[-1][:, -1])
+
+        # Prevent from integrating collocation points
+        if len(x0i.shape) > 1:
+            x0i = x0i[:, 0]
+
+        rhs = CompiledRhs(list_of_dynamics[i], control_type, t_spans[i], u[i], p, a[i], d[i], list_of_jacobians[i])
+        y.append(
+            _solve_ivp_scipy_interface(
+                rhs,
+                x0=x0i,
+                t_span=np.array(t_spans[i]),
+                t_eval=t_evals[i],
+                method=method,
+                jacobian=None if rhs.jacobian_func is None else rhs.jacobian,
+            )
         )
+    return y
+
+
+class CompiledRhs:
+    """
+    The right-hand side of the dynamics of an interval, ready to be called by scipy.solve_ivp. The controls are
+    reduced to their interpolation coefficients and the CasADi dynamics is evaluated in preallocated buffers, so a call
+    only copies the states in and the derivative out
+
+    Attributes
+    ----------
+    dynamics: Function
+        The dynamics (t, x, u, p, a, d) -> dxdt
+    jacobian_func: Function | None
+        The jacobian of the dynamics with respect to the states, None if not provided
+    control_type: ControlType
+        The type of control
+    u0: np.ndarray
+        The control at the beginning of the interval
+    u_slope: np.ndarray | None
+        The variation of the control per unit of time for LINEAR_CONTINUOUS controls, None otherwise
+
+    Methods
+    -------
+    controls(self, t: float) -> np.ndarray
+        The controls at a given time
+    jacobian(self, t: float, x: np.ndarray) -> np.ndarray
+        The jacobian of the dynamics with respect to the states (None if no jacobian_func)
+    """
+
+    def __init__(
+        self,
+        dynamics,
+        control_type: ControlType,
+        t_span: NpArray,
+        u: NpArray,
+        p: NpArray,
+        a: NpArray,
+        d: NpArray,
+        jacobian_func=None,
+    ):
+        """
+        Parameters
+        ----------
+        dynamics: Function
+            The dynamics (t, x, u, p, a, d) -> dxdt
+        control_type: ControlType
+            The type of control
+        t_span: np.ndarray
+            The time span of the interval
+        u: np.ndarray
+            The controls of the interval
+        p: np.ndarray
+            The parameters
+        a: np.ndarray
+            The algebraic states of the interval
+        d: np.ndarray
+            The numerical timeseries of the interval
+        jacobian_func: Function
+            The jacobian of the dynamics with respect to the states
+        """
+
+        self.dynamics = dynamics
+        self.jacobian_func = jacobian_func
+        self.control_type = control_type
+
+        t_span = np.array(t_span, dtype=float).reshape(-1)
+        u = np.array(u, dtype=float)
+        if control_type in (ControlType.CONSTANT, ControlType.CONSTANT_WITH_LAST_NODE):
+            self._t0 = 0
+            self.u0 = u.reshape(-1, order="F")
+            self.u_slope = None
+        elif control_type == ControlType.LINEAR_CONTINUOUS:
+            self._t0 = t_span[0]
+            self.u0 = u[:, 0]
+            self.u_slope = (u[:, 1] - u[:, 0]) / (t_span[1] - t_span[0])
+        else:
+            raise NotImplementedError("Control type not implemented in integration")
+
+        # The buffers in which the dynamics reads its inputs and writes its output. The time input of the bioptim
+        # dynamics is the time span [t, dt], only t changes during the integration
+        self._t = np.zeros(dynamics.nnz_in(0))
+        if self._t.shape[0] > 1:
+            self._t[1:] = t_span[-1] - t_span[0]
+        self._x = np.zeros(dynamics.nnz_in(1))
+        self._u = self.u0.copy()
+        self._p = np.array(p, dtype=float).reshape(-1, order="F")
+        self._a = np.array(a, dtype=float).reshape(-1, order="F")
+        self._d = np.array(d, dtype=float).reshape(-1, order="F")
+        self._out = np.zeros(dynamics.nnz_out(0))
+        self._buffer, self._evaluate = dynamics.buffer()
+        for i, arg in enumerate((self._t, self._x, self._u, self._p, self._a, self._d)):
+            if arg.shape[0] != dynamics.nnz_in(i):
+                raise RuntimeError(
+                    f"The input {dynamics.name_in(i)} of {dynamics.name()} expects {dynamics.nnz_in(i)} values, "
+                    f"but {arg.shape[0]} were provided"
+                )
+            self._buffer.set_arg(i, memoryview(arg))
+        self._buffer.set_res(0, memoryview(self._out))
+
+        sparsity = dynamics.sparsity_out(0)
+        self._out_rows = None if sparsity.is_dense() else np.array(sparsity.row())
+        self._n_out = sparsity.size1()
+
+    def controls(self, t: Float) -> NpArray:
+        """
+        The controls at a given time
+
+        Parameters
+        ----------
+        t: float
+            The time
+
+        Returns
+        -------
+        The controls
+        """
+
+        if self.u_slope is None:
+            return self.u0
+        return self.u0 + self.u_slope * (t - self._t0)
+
+    def __call__(self, t: Float, x: NpArray) -> NpArray:
+        self._t[0] = t
+        self._x[:] = x
+        if self.u_slope is not None:
+            self._u[:] = self.controls(t)
+        self._evaluate()
 
-        # If multiple shooting, we need to set the first x0, otherwise use the previous answer
-        x0i = np.array(x[node] if node == 0 or shooting_type == Shooting.MULTIPLE else y[-1][:, -1])
+        # A copy is returned since scipy keeps the previous derivatives
+        if self._out_rows is None:
+            return self._out.copy()
+        out = np.zeros(self._n_out)
+        out[self._out_rows] = self._out
+        return out
 
+    def jacobian(self, t: Float, x: NpArray) -> NpArray | None:
+        """
+        The jacobian of the dynamics with respect to the states
+
+        Parameters
+        ----------
+        t: float
+            The time
+        x: np.ndarray
+            The states
+
+        Returns
+        -------
+        The jacobian (None if no jacobian_func was provided)
+        """
+
+        if self.jacobian_func is None:
+            return None
+        # The same time span [t, dt] as the dynamics, otherwise casadi would repeat t over the whole input
+        self._t[0] = t
+        return self.jacobian_func(self._t.copy(), x, self.controls(t), self._p, self._a, self._d).full()
+
+
+def _is_mappable(nlp: NonLinearProgram, x: NpArrayList, u: NpArrayList, a: NpArrayList, d: NpArrayList) -> Bool:
+    """
+    If all the intervals of the phase share the same integrator and have inputs of the same shape
+    """
+
+    return all(
+        nlp.dynamics[node] is nlp.dynamics[0]
+        and np.shape(x[node]) == np.shape(x[0])
+        and np.shape(u[node]) == np.shape(u[0])
+        and np.shape(a[node]) == np.shape(a[0])
+        and np.shape(d[node]) == np.shape(d[0])
+        for node in range(nlp.ns)
+    )
+
+
+def _solve_ivp_bioptim_mapped_interface(
+    nlp: NonLinearProgram,
+    t: NpArrayList,
+    x: NpArrayList,
+    u: NpArrayList,
+    p: NpArray,
+    a: NpArrayList,
+    d: NpArrayList,
+    n_threads: Int = 1,
+) -> NpArrayList:
+    """
+    Integrate all the (independent) intervals of a phase with a single call to the integrator of the ocp mapped
+    across the intervals. All the intervals must share the same integrator
+    """
+
+    ns = nlp.ns
+    integrator = nlp.dynamics[0].map(ns, "thread" if n_threads > 1 else "serial", n_threads)
+
+    t_spans = horzcat(*[vertcat(t[node][0], t[node][1] - t[node][0]) for node in range(ns)])
+    x0 = np.concatenate([np.array(x[node]) for node in range(ns)], axis=1)
+    u_all = np.concatenate([np.array(u[node]) for node in range(ns)], axis=1)
+    a_all = np.concatenate([np.array(a[node]) for node in range(ns)], axis=1)
+    d_all = np.concatenate(d[:ns], axis=1) if d[0].size > 0 else np.array([])
+
+    # The outputs of the intervals are concatenated horizontally
+    return np.split(np.array(integrator(t_spans, x0, u_all, p, a_all, d_all)[1]), ns, axis=1)
+
+
+def solve_ivp_batch_interface(
+    dynamics_func: Callable,
+    nlp: NonLinearProgram,
+    t: NpArrayList,
+    x0: NpArray,
+    u: NpArrayList,
+    p: NpArrayList,
+    a: NpArrayList,
+    d: NpArrayList,
+    method: SolutionIntegrator = SolutionIntegrator.SCIPY_RK45,
+    n_threads: Int = 1,
+    lockstep: Bool = True,
+) -> NpArrayList:
+    """
+    This function solves a batch of initial value problems (one per column of x0 and p) with a single shooting. The
+    dynamics is evaluated for the whole batch at once by mapping it across the batch, so the batch shares a single
+    CasADi function
+
+    Parameters
+    ----------
+    dynamics_func: Callable
+        The explicit dynamics (t, x, u, p, a, d) -> dxdt, only used by the scipy integrators
+    nlp: NonLinearProgram
+        The current instance of the NonLinearProgram
+    t : np.ndarray
+        array of time
+    x0 : np.ndarray
+        The initial conditions of the batch (n_states, batch_size)
+    u : np.ndarray
+        arrays of controls u evaluated at t_eval (shared by the batch)
+    p : np.ndarray
+        The parameters of each node for the batch (n_parameters, batch_size)
+    a : np.ndarray
+        array of the algebraic states of the system (shared by the batch)
+    d : np.ndarray
+        array of the numerical timeseries (shared by the batch)
+    method: SolutionIntegrator
+        The integrator to use to solve the OCP
+    n_threads: int
+        The number of threads used to evaluate the mapped dynamics
+    lockstep: bool
+        If the scipy integrators should integrate the whole batch as a single system (sharing the time steps) or each
+        element of the batch on its own (each having its own adaptive time steps). The integrator of the ocp always
+        integrates in lockstep since its time steps are fixed
+
+    Returns
+    -------
+    y: list[np.ndarray]
+        The states of each node, (n_states, n_steps, batch_size)
+    """
+
+    n_states, batch_size = x0.shape
+    parallelization = "thread" if n_threads > 1 else "serial"
+
+    y = []
+    x0i = x0
+    for node in range(nlp.ns):
         if method == SolutionIntegrator.OCP:
-            result = _solve_ivp_bioptim_interface(
-                lambda t, x: nlp.dynamics[node](t, x, u[node], p, a[node], d[node])[1], x0=x0i, t_span=np.array(t_span)
-            )
+            t_span = vertcat(t[node][0], t[node][1] - t[node][0])
+            integrator = nlp.dynamics[node].map(batch_size, parallelization, n_threads)
+            # The mapped outputs are concatenated horizontally, sample after sample
+            result = np.array(integrator(t_span, x0i, u[node], p[node], a[node], d[node])[1])
+            result = result.reshape((n_states, batch_size, -1)).transpose((0, 2, 1))
 
         elif method in (
             SolutionIntegrator.SCIPY_RK45,
@@ -83,28 +482,61 @@ def solve_ivp_interface(
             SolutionIntegrator.SCIPY_BDF,
             SolutionIntegrator.SCIPY_LSODA,
         ):
-            # Prevent from integrating collocation points
-            if len(x0i.shape) > 1:
-                x0i = x0i[:, 0]
-
-            result = _solve_ivp_scipy_interface(
-                lambda t, x: np.array(
-                    list_of_dynamics[node](
-                        t, x, _control_function(control_type, t, t_span, u[node]), p, a[node], d[node]
-                    )
-                )[:, 0],
-                x0=x0i,
-                t_span=np.array(t_span),
-                t_eval=t_eval,
-                method=method.value,
+            t_span = t[node]
+            t_eval = np.linspace(
+                float(t_span[0]), float(t_span[1]), nlp.n_states_stepwise_steps(node, nlp.dynamics_type.ode_solver)
             )
 
+            if lockstep:
+                mapped_dynamics = dynamics_func.map(batch_size, parallelization, n_threads)
+                result = _solve_ivp_scipy_interface(
+                    lambda t, x, node=node, t_span=t_span: np.array(
+                        mapped_dynamics(
+                            t,
+                            x.reshape((n_states, batch_size), order="F"),
+                            _control_function(nlp.control_type, t, t_span, u[node]),
+                            p[node],
+                            a[node],
+                            d[node],
+                        )
+                    ).reshape(-1, order="F"),
+                    x0=x0i.reshape(-1, order="F"),
+                    t_span=np.array(t_span),
+                    t_eval=t_eval,
+                    method=method.value,
+                )
+                result = result.reshape((n_states, batch_size, -1), order="F").transpose((0, 2, 1))
+            else:
+                result = np.stack(
+                    [
+                        _solve_ivp_scipy_interface(
+                            lambda t, x, node=node, t_span=t_span, i=i: np.array(
+                                dynamics_func(
+                                    t,
+                                    x,
+                                    _control_function(nlp.control_type, t, t_span, u[node]),
+                                    p[node][:, i],
+                                    a[node],
+                                    d[node],
+                                )
+                            )[:, 0],
+                            x0=x0i[:, i],
+                            t_span=np.array(t_span),
+                            t_eval=t_eval,
+                            method=method.value,
+                        )
+                        for i in range(batch_size)
+                    ],
+                    axis=2,
+                )
+
         else:
             raise NotImplementedError(f"{method} is not implemented yet")
 
         y.append(result)
+        x0i = result[:, -1, :]
 
-    y.append(x[-1] if shooting_type == Shooting.MULTIPLE else y[-1][:, -1][:, np.newaxis])
+    y.append(x0i[:, np.newaxis, :])
 
     return y
 
@@ -115,7 +547,9 @@ def _solve_ivp_scipy_interface(
     x0: NpArray,
     t_eval: NpArray,
     method: SolutionIntegrator = SolutionIntegrator.SCIPY_RK45,
+    jacobian: Callable = None,
 ):
+    options = {} if jacobian is None else {"jac": jacobian}
     result: Any = solve_ivp(
         dynamics,
         y0=x0,
@@ -124,6 +558,7 @@ def _solve_ivp_scipy_interface(
         ),
         t_eval=t_eval,
         method=method,
+        **options,
     )
     return result.y
 
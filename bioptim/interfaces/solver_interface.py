@@ -47,6 +47,7 @@ class SolverInterface:
         self.shaked_objectives = None
         self.pre_shake_tree_constraints = None
         self.shaked_constraints = None
+        self.all_g_bounds = None
         self.shaked_ocp_solver = None
 
     def configure(self, **options):
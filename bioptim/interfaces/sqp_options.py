@@ -12,6 +12,7 @@ from ..misc.parameters_types import (
     Int,
     Float,
     Str,
+    StrOptional,
     AnyDict,
     AnyDictOptional,
 )
@@ -90,6 +91,7 @@ class SQP_METHOD(GenericSolver):
     online_optim: OnlineOptim | None = None
     show_options: AnyDictOptional = None
     _c_compile: Bool = False
+    _c_compile_cache_dir: StrOptional = None
     _beta: Float = 0.8
     _c1: Float = 1e-4
     _hessian_approximation: Str = "exact"  # "exact", "limited-memory"
@@ -107,6 +109,10 @@ class SQP_METHOD(GenericSolver):
     def c_compile(self) -> Bool:
         return self._c_compile
 
+    @property
+    def c_compile_cache_dir(self) -> StrOptional:
+        return self._c_compile_cache_dir
+
     @property
     def beta(self) -> Float:
         return self._beta
@@ -158,6 +164,9 @@ class SQP_METHOD(GenericSolver):
     def set_c_compile(self, c_compile: Bool) -> None:
         self._c_compile = c_compile
 
+    def set_c_compile_cache_dir(self, c_compile_cache_dir: StrOptional) -> None:
+        self._c_compile_cache_dir = c_compile_cache_dir
+
     def set_beta(self, beta: Float) -> None:
         """
         Line-search parameter, restoration factor of stepsize
@@ -255,7 +264,14 @@ class SQP_METHOD(GenericSolver):
     def as_dict(self, solver) -> AnyDict:
         solver_options = self.__dict__
         options = {}
-        non_python_options = ["_c_compile", "type", "show_online_optim", "online_optim", "show_options"]
+        non_python_options = [
+            "_c_compile",
+            "_c_compile_cache_dir",
+            "type",
+            "show_online_optim",
+            "online_optim",
+            "show_options",
+        ]
         for key in solver_options:
             if key not in non_python_options:
                 sqp_key = key[1:]
@@ -360,8 +360,8 @@ class Bounds(OptionGeneric):
     check_and_adjust_dimensions(self, n_elements: int, n_shooting: int)
         Sanity check if the dimension of the matrix are sounds when compare to the number
         of required elements and time. If the function exit, then everything is okay
-    concatenate(self, other: "Bounds")
-        Vertical concatenate of two Bounds
+    concatenate(self, *others: "Bounds")
+        Vertical concatenate of Bounds
     scale(self, scaling: float | np.ndarray)
         Scaling a Bound
     __getitem__(self, slice_list: slice) -> "Bounds"
@@ -435,30 +435,51 @@ class Bounds(OptionGeneric):
         self.t = self.min.t
         self.n_shooting = self.min.n_shooting
 
-    def concatenate(self, other: "Bounds"):
+    def concatenate(self, *others: "Bounds"):
         """
-        Vertical concatenate of two Bounds
+        Vertical concatenate of Bounds. All the Bounds are stacked in one go so concatenating many pieces is linear in
+        the final size
 
         Parameters
         ----------
-        other: Bounds
+        others: Bounds
             The Bounds to concatenate with
         """
 
-        if not isinstance(self.min, (MX, SX)) and not isinstance(other.min, (MX, SX)):
-            self.min = PathCondition(np.concatenate((self.min, other.min)), interpolation=self.min.type)
-        else:
-            self.min = PathCondition(vertcat(self.min, other.min), interpolation=self.min.type)
-        if not isinstance(self.max, (MX, SX)) and not isinstance(other.max, (MX, SX)):
-            self.max = PathCondition(np.concatenate((self.max, other.max)), interpolation=self.max.type)
-        else:
-            self.max = PathCondition(vertcat(self.max, other.max), interpolation=self.max.type)
+        if not others:
+            return
+
+        self.min = self._concatenate_path_conditions([self.min] + [other.min for other in others], self.min.type)
+        self.max = self._concatenate_path_conditions([self.max] + [other.max for other in others], self.max.type)
 
         self.type = self.min.type
         self.t = self.min.t
         self.extra_params = self.min.extra_params
         self.n_shooting = self.min.n_shooting
 
+    @staticmethod
+    def _concatenate_path_conditions(
+        path_conditions: list[PathCondition], interpolation: InterpolationType
+    ) -> PathCondition:
+        """
+        Vertically stack a list of PathCondition into a single one
+
+        Parameters
+        ----------
+        path_conditions: list[PathCondition]
+            The PathCondition to stack
+        interpolation: InterpolationType
+            The interpolation type of the resulting PathCondition
+
+        Returns
+        -------
+        The stacked PathCondition
+        """
+
+        if any(isinstance(path_condition, (MX, SX)) for path_condition in path_conditions):
+            return PathCondition(vertcat(*path_conditions), interpolation=interpolation)
+        return PathCondition(np.concatenate(path_conditions), interpolation=interpolation)
+
     def scale(self, scaling: Float | NpArray):
         """
         Scaling a Bound
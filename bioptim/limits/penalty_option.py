@@ -76,6 +76,9 @@ class PenaltyOption(OptionGeneric):
         If the penalty is from the user or from bioptim (internal)
     multi_thread: bool
         If the penalty is multithreaded
+    is_mappable: bool
+        If the non threaded function of the penalty can be mapped over all its nodes (set when the penalty is built,
+        regardless of the number of threads of the ocp)
 
     Methods
     -------
@@ -88,6 +91,8 @@ class PenaltyOption(OptionGeneric):
         If the function returns, all is okay
     _set_penalty_function(self, controller: list[PenaltyController], fcn: MX | SX)
         Finalize the preparation of the penalty (setting function and weighted_function)
+    _can_be_mapped(self, controller: PenaltyController) -> bool
+        If the penalty of the current node can be mapped over all the nodes of the penalty
     add_target_to_plot(self, controller: PenaltyController, combine_to: str)
         Interface to the plot so it can be properly added to the proper plot
     _finish_add_target_to_plot(self, controller: PenaltyController)
@@ -230,6 +235,7 @@ class PenaltyOption(OptionGeneric):
         self.is_stochastic = is_stochastic
 
         self.multi_thread = multi_thread
+        self.is_mappable = None
 
     def set_penalty(self, penalty: CX, controllers: PenaltyController | list[PenaltyController]):
         """
@@ -642,7 +648,21 @@ class PenaltyOption(OptionGeneric):
         )
         self.weighted_function_non_threaded[node] = self.weighted_function[node]
 
-        if controller.ocp.n_threads > 1 and self.multi_thread and len(self.node_idx) > 1:
+        if self.is_mappable is None:
+            # Must be evaluated before multi_thread is overridden below
+            self.is_mappable = (
+                bool(self.multi_thread)
+                and not self.is_multinode_penalty
+                and len(self.node_idx) > 1
+                and self._can_be_mapped(controller)
+            )
+
+        if (
+            controller.ocp.n_threads > 1
+            and self.multi_thread
+            and len(self.node_idx) > 1
+            and self._can_be_mapped(controller)
+        ):
             self.function[node] = self.function[node].map(len(self.node_idx), "thread", controller.ocp.n_threads)
             self.weighted_function[node] = self.weighted_function[node].map(
                 len(self.node_idx), "thread", controller.ocp.n_threads
@@ -654,6 +674,34 @@ class PenaltyOption(OptionGeneric):
             self.function[node] = self.function[node].expand()
             self.weighted_function[node] = self.weighted_function[node].expand()
 
+    def _can_be_mapped(self, controller: PenaltyController) -> Bool:
+        """
+        If the penalty of the current node can be mapped over all the nodes of the penalty, that is if the graph of the
+        penalty is the same at each node and only the values it is called with differ. This is always true with
+        PhaseDynamics.SHARED_DURING_THE_PHASE. With PhaseDynamics.ONE_PER_NODE, it is true when all the nodes share the
+        same integrator (see OdeSolverBase.integrator_structural_key). Otherwise, the penalty is evaluated node by node
+
+        Parameters
+        ----------
+        controller: PenaltyController
+            The penalty node elements
+
+        Returns
+        -------
+        If the penalty can be mapped
+        """
+
+        nlp = controller.get_nlp
+        if nlp.control_type == ControlType.LINEAR_CONTINUOUS and nlp.dynamics_type.ode_solver.is_direct_collocation:
+            # The collocation continuity with piece-wise linear controls is not mappable
+            return False
+
+        if nlp.phase_dynamics == PhaseDynamics.SHARED_DURING_THE_PHASE:
+            return True
+
+        integrators = {id(nlp.dynamics[node]) for node in self.node_idx if node < len(nlp.dynamics)}
+        return len(integrators) <= 1
+
     def _check_sanity_of_penalty_interactions(self, controller: PenaltyController):
         if self.is_multinode_penalty and self.explicit_derivative:
             raise ValueError("multinode_penalty and explicit_derivative cannot be true simultaneously")
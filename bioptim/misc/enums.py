@@ -251,6 +251,18 @@ class MagnitudeType(Enum):
     ABSOLUTE = "absolute"
 
 
+class MultiStartStatus(Enum):
+    """
+    The outcome of a combination of a multi-start
+    """
+
+    SOLVED = "solved"
+    SKIPPED = "skipped"
+    PRUNED = "pruned"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+
+
 class MultiCyclicCycleSolutions(Enum):
     """
     Selection of extra solution for multi cyclic receding horizon optimization
@@ -10,7 +10,7 @@ from biorbd_casadi import (
 )
 from casadi import SX, MX, vertcat, horzcat, norm_fro, Function, DM
 
-from ..utils import _var_mapping, bounds_from_ranges, cache_function, check_contacts
+from ..utils import _var_mapping, bounds_from_ranges, cache_function, check_contacts, function_cache_key
 from ...limits.path_conditions import Bounds
 from ...misc.mapping import BiMapping, BiMappingList
 from ...misc.enums import ContactType
@@ -41,6 +41,7 @@ class BiorbdModel:
         parameters: ParameterList = None,
         external_force_set: ExternalForceSetTimeSeries | ExternalForceSetVariables = None,
         contact_types: list[ContactType] | tuple[ContactType] = (),
+        function_cache_folder: str = None,
         **kwargs,
     ):
         """
@@ -55,6 +56,11 @@ class BiorbdModel:
             The external forces to add to the model
         contact_types: list[ContactType] | tuple[ContactType]
             The type of contacts tu use in the model's dynamics
+        function_cache_folder: str
+            If provided, the CasADi functions of the model are serialized in this folder and reloaded by any other
+            model built from the same file (e.g. in another process). This persistent cache is ignored if the model
+            is not given as a path, or if parameters or an external_force_set are provided since they modify the
+            model beyond its file
         """
         super().__init__(**kwargs)  # For multiple inheritance compatibility
 
@@ -77,6 +83,17 @@ class BiorbdModel:
         self.biorbd_external_forces_set = self._dispatch_forces() if self.external_force_set else None
 
         self._cached_functions = {}
+        self.function_cache_folder = function_cache_folder
+        self._function_cache_key = None
+        if (
+            function_cache_folder is not None
+            and isinstance(bio_model, str)
+            and parameters is None
+            and external_force_set is None
+        ):
+            self._function_cache_key = function_cache_key(
+                self.path, biorbd.__version__, tuple(contact.name for contact in contact_types)
+            )
 
     @property
     def contact_types(self):
@@ -158,7 +175,11 @@ class BiorbdModel:
         return BiorbdModel(self.path)
 
     def serialize(self) -> tuple[Callable, dict]:
-        return BiorbdModel, dict(bio_model=self.path, external_force_set=self.external_force_set)
+        return BiorbdModel, dict(
+            bio_model=self.path,
+            external_force_set=self.external_force_set,
+            function_cache_folder=self.function_cache_folder,
+        )
 
     @property
     def friction_coefficients(self) -> MX | SX | np.ndarray:
@@ -171,6 +192,8 @@ class BiorbdModel:
     def set_friction_coefficients(self, new_friction_coefficients) -> None:
         if isinstance(new_friction_coefficients, (DM, np.ndarray)) and np.any(new_friction_coefficients < 0):
             raise ValueError("Friction coefficients must be positive")
+        # The model no longer matches its file
+        self._function_cache_key = None
         if isinstance(new_friction_coefficients, Parameter):
             self._friction_coefficients = new_friction_coefficients.cx
         else:
@@ -194,6 +217,8 @@ class BiorbdModel:
         return casadi_fun
 
     def set_gravity(self, new_gravity: Parameter | MX | np.ndarray) -> None:
+        # The model no longer matches its file
+        self._function_cache_key = None
         if isinstance(new_gravity, Parameter):
             self.model.setGravity(new_gravity.mx)
         else:
@@ -189,6 +189,8 @@ class HolonomicBiorbdModel(BiorbdModel):
 
         if parameters is not None:
             raise NotImplementedError("HolonomicBiorbdModel does not support parameters yet")
+        if self.function_cache_folder is not None:
+            raise NotImplementedError("HolonomicBiorbdModel does not support function_cache_folder yet")
 
         self._cached_functions = {}
 
@@ -1,4 +1,11 @@
+import hashlib
+import os
+import tempfile
 from functools import wraps
+
+import casadi
+from casadi import Function
+
 from ..limits.path_conditions import Bounds
 from ..misc.mapping import BiMapping, BiMappingList
 from ..misc.enums import ContactType
@@ -73,7 +80,10 @@ def bounds_from_ranges(model, key: str, mapping: BiMapping | BiMappingList = Non
 
 
 def cache_function(method):
-    """Decorator to cache CasADi functions automatically"""
+    """
+    Decorator to cache CasADi functions automatically. The functions are kept in the _cached_functions of the model
+    and, if the model defines a function_cache_folder, are also serialized on the disk so other processes reuse them
+    """
 
     def make_hashable(value):
         """
@@ -94,8 +104,12 @@ def cache_function(method):
         if key in self._cached_functions:
             return self._cached_functions[key]
 
-        # Call the original function to create the CasADi function
-        casadi_fun = method(self, *args, **kwargs)
+        # Try the persistent cache, otherwise call the original function to create the CasADi function
+        file_path = _function_cache_file_path(self, key, method.__qualname__)
+        casadi_fun = _load_cached_function(file_path)
+        if casadi_fun is None:
+            casadi_fun = method(self, *args, **kwargs)
+            _save_cached_function(file_path, casadi_fun)
 
         # Store in the cache
         self._cached_functions[key] = casadi_fun
@@ -104,6 +118,78 @@ def cache_function(method):
     return wrapper
 
 
+def function_cache_key(model_path: str, *extra) -> str:
+    """
+    Compute the key identifying a model in the persistent cache of the @cache_function decorator. The key changes
+    whenever the content of the model file, the extra information or the version of casadi changes
+
+    Parameters
+    ----------
+    model_path: str
+        The path to the model file
+    extra
+        Any other information that changes the functions produced by the model (e.g. the contact types)
+
+    Returns
+    -------
+    The hexadecimal digest of the model
+    """
+
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as file:
+        digest.update(file.read())
+    digest.update(repr((casadi.__version__,) + extra).encode())
+    return digest.hexdigest()
+
+
+def _function_cache_file_path(model, key: tuple, method_qualname: str) -> str | None:
+    """
+    The file of the persistent cache for a given @cache_function key, or None if the persistent cache is disabled for
+    this model (no function_cache_folder or a model that cannot be identified from its file only). The class of the
+    model and the qualified name of the method are part of the digest so a subclass overriding a method (or a model
+    of another class built from the same file) never loads the function of another class
+    """
+
+    folder = getattr(model, "function_cache_folder", None)
+    model_key = getattr(model, "_function_cache_key", None)
+    if folder is None or model_key is None:
+        return None
+
+    name, args, kwargs = key
+    # The kwargs are sorted since the iteration order of a frozenset is not stable between processes
+    model_type = f"{type(model).__module__}.{type(model).__qualname__}"
+    digest = hashlib.sha256(
+        repr((model_key, model_type, method_qualname, args, sorted(kwargs, key=repr))).encode()
+    ).hexdigest()
+    return os.path.join(folder, f"{name}_{digest}.casadi")
+
+
+def _load_cached_function(file_path: str | None) -> Function | None:
+    if file_path is None or not os.path.isfile(file_path):
+        return None
+
+    with open(file_path, "r") as file:
+        return Function.deserialize(file.read())
+
+
+def _save_cached_function(file_path: str | None, casadi_fun) -> None:
+    if file_path is None or not isinstance(casadi_fun, Function):
+        return
+
+    try:
+        serialized = casadi_fun.serialize()
+    except RuntimeError:
+        # Some functions (e.g. those wrapping a Callback) cannot be serialized, they are simply kept in memory
+        return
+
+    # Write to a temporary file first so concurrent processes never read a partially written function
+    folder = os.path.dirname(file_path)
+    os.makedirs(folder, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=folder, delete=False) as file:
+        file.write(serialized)
+    os.replace(file.name, file_path)
+
+
 def check_contacts(contact_types: list[ContactType] | tuple[ContactType], model):
 
     # Check the type and that there is only one of them
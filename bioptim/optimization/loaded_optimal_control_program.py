@@ -0,0 +1,196 @@
+import pickle
+from time import perf_counter
+
+import casadi
+import numpy as np
+from casadi import Function, MX, nlpsol
+
+from .vector_layout import unstack_from_index_map
+from ..interfaces import Solver
+from ..interfaces.abstract_options import GenericSolver
+from ..misc.enums import SolverType
+from ..misc.parameters_types import AnyDict, AnyList, DoubleNpArrayTuple, NpArray, Str
+
+
+class LoadedOptimalControlProgram:
+    """
+    A fully built optimal control program reloaded from the disk (see OptimalControlProgram.save). Neither the models
+    nor the penalties are rebuilt, the problem is solved directly from the serialized CasADi graph of the nlp. The
+    bounds and the initial guess can be changed before solving by modifying bounds_vectors and init_vector
+
+    Attributes
+    ----------
+    nlp_function: Function
+        The CasADi function of the nlp, f, g = nlp_function(v) where v is the vector of the decision variables
+    bounds_vectors: tuple[np.ndarray, np.ndarray]
+        The min and max bounds of the decision variables
+    init_vector: np.ndarray
+        The initial guess of the decision variables
+    g_bounds: tuple[np.ndarray, np.ndarray]
+        The min and max bounds of the constraints
+    index_map: dict
+        The map of the decision variables in the vector (see VectorLayout.index_map)
+    penalties: list[dict]
+        The metadata (name, kind, phase, node_idx and if it is internal) of all the penalties of the program
+    n_phases: int
+        The number of phases of the program
+    version: dict
+        The version of all the underlying software when the program was saved
+    options_common: dict
+        Options irrelevant of a specific ocp (to be compatible with the solver options)
+    limits: dict
+        The declaration of the bounds solver-friendly of the last solve
+    nlp_solver: nlpsol
+        The CasADi solver of the last solve, reused as long as the solver and its options do not change
+
+    Methods
+    -------
+    load(path: str) -> LoadedOptimalControlProgram
+        Load a program previously saved with OptimalControlProgram.save
+    solve(self, solver: GenericSolver = None) -> dict
+        Solve the program
+    unstack(self, vector: np.ndarray) -> dict
+        Split a vector of decision variables into its blocks (see VectorLayout.unstack)
+    """
+
+    def __init__(
+        self,
+        nlp_function: Function,
+        bounds_vectors: DoubleNpArrayTuple,
+        init_vector: NpArray,
+        g_bounds: DoubleNpArrayTuple,
+        index_map: AnyDict,
+        penalties: AnyList,
+        n_phases: int,
+        version: AnyDict,
+    ):
+        """
+        Parameters
+        ----------
+        nlp_function: Function
+            The CasADi function of the nlp, f, g = nlp_function(v)
+        bounds_vectors: tuple[np.ndarray, np.ndarray]
+            The min and max bounds of the decision variables
+        init_vector: np.ndarray
+            The initial guess of the decision variables
+        g_bounds: tuple[np.ndarray, np.ndarray]
+            The min and max bounds of the constraints
+        index_map: dict
+            The map of the decision variables in the vector
+        penalties: list[dict]
+            The metadata of all the penalties of the program
+        n_phases: int
+            The number of phases of the program
+        version: dict
+            The version of all the underlying software when the program was saved
+        """
+
+        self.nlp_function = nlp_function
+        self.bounds_vectors = bounds_vectors
+        self.init_vector = init_vector
+        self.g_bounds = g_bounds
+        self.index_map = index_map
+        self.penalties = penalties
+        self.n_phases = n_phases
+        self.version = version
+
+        self.options_common = {}
+        self.limits = {}
+        self.nlp_solver = None
+        self._nlp_solver_options = None
+
+    @classmethod
+    def load(cls, path: Str) -> "LoadedOptimalControlProgram":
+        """
+        Load a program previously saved with OptimalControlProgram.save
+
+        Parameters
+        ----------
+        path: str
+            The path of the file to load
+
+        Returns
+        -------
+        The loaded program
+        """
+
+        with open(path, "rb") as file:
+            data = pickle.load(file)
+
+        if data["version"]["casadi"] != casadi.__version__:
+            raise RuntimeError(
+                f"The program was saved with casadi {data['version']['casadi']}, but casadi {casadi.__version__} is "
+                f"installed. Please rebuild the OptimalControlProgram and save it again."
+            )
+
+        return cls(
+            nlp_function=Function.deserialize(data["nlp_function"]),
+            bounds_vectors=data["bounds_vectors"],
+            init_vector=data["init_vector"],
+            g_bounds=data["g_bounds"],
+            index_map=data["index_map"],
+            penalties=data["penalties"],
+            n_phases=data["n_phases"],
+            version=data["version"],
+        )
+
+    def solve(self, solver: GenericSolver = None) -> AnyDict:
+        """
+        Solve the program
+
+        Parameters
+        ----------
+        solver: GenericSolver
+            The solver which will be used to solve the program (Ipopt, Fatrop or SqpMethod). Default is Ipopt
+
+        Returns
+        -------
+        The output of the solver (x, f, g, lam_x, lam_g, status, iter, real_time_to_optimize and solver)
+        """
+
+        if solver is None:
+            solver = Solver.IPOPT()
+        if solver.type not in (SolverType.IPOPT, SolverType.FATROP, SolverType.SQP):
+            raise RuntimeError(f"Solver {solver.type} is not available for a loaded OptimalControlProgram")
+
+        self.limits = {
+            "lbx": self.bounds_vectors[0],
+            "ubx": self.bounds_vectors[1],
+            "lbg": self.g_bounds[0],
+            "ubg": self.g_bounds[1],
+            "x0": self.init_vector,
+        }
+
+        # Only the bounds and initial guess can change between two solves, so the solver is built once
+        options = (solver.type, solver.as_dict(self))
+        if self.nlp_solver is None or self._nlp_solver_options != options:
+            v = MX.sym("v", self.nlp_function.size1_in(0), 1)
+            f, g = self.nlp_function(v)
+            self.nlp_solver = nlpsol("solver", solver.type.value.lower(), {"x": v, "f": f, "g": g}, options[1])
+            self._nlp_solver_options = options
+
+        tic = perf_counter()
+        out = self.nlp_solver.call(self.limits)
+        out = {key: np.array(value) for key, value in out.items()}
+        out["real_time_to_optimize"] = perf_counter() - tic
+        out["iter"] = self.nlp_solver.stats()["iter_count"]
+        # To match acados convention (0 = success, 1 = error)
+        out["status"] = int(not self.nlp_solver.stats()["success"])
+        out["solver"] = solver.type.value
+        return out
+
+    def unstack(self, vector: NpArray) -> AnyDict:
+        """
+        Split a vector of decision variables into its blocks (see VectorLayout.unstack)
+
+        Parameters
+        ----------
+        vector: np.ndarray
+            The vector of decision variables (e.g. the "x" output of solve)
+
+        Returns
+        -------
+        A dictionary with the same keys as index_map
+        """
+
+        return unstack_from_index_map(self.index_map, vector)
@@ -1,19 +1,45 @@
-from multiprocessing import Pool
-from itertools import product
-from typing import Any
+import json
+import os
+import pickle
+import time
+from collections import deque
+from itertools import count, product
+from math import inf
+from multiprocessing import get_context
+from queue import Empty
+from typing import Any, Iterator
 
+from ..gui.online_callback_abstract import OnlineCallbackAbstract
 from ..optimization.optimal_control_program import OptimalControlProgram
 from ..interfaces import Solver
 from ..optimization.solution.solution import Solution
+from ..misc.enums import MultiStartStatus, SolverType
 
 from ..misc.parameters_types import (
     Int,
     AnyTuple,
     AnyDict,
+    AnyIterable,
     AnyList,
+    Bool,
     Callable,
+    Float,
+    FloatOptional,
+    IntOptional,
+    IntList,
+    StrListOptional,
+    StrOptional,
 )
 
+# The ocps prepared by the current process when the combinations are applied with the update_ocp_callback. Each worker
+# has its own, reset when the worker starts, and keeps it for all the combinations it solves
+_prepared_ocps = {}
+
+
+def _reset_prepared_ocps() -> None:
+    global _prepared_ocps
+    _prepared_ocps = {}
+
 
 class MultiStart:
     """
@@ -24,6 +50,8 @@ class MultiStart:
     -------
     solve()
         Run the multi-start in the pools for multi-threading
+    solve_iter() -> Iterator
+        Run the multi-start and yield the result of each combination as soon as it is done
     """
 
     def __init__(
@@ -34,6 +62,16 @@ class MultiStart:
         should_solve_callback: tuple[Callable, AnyDict] | None = None,
         solver: Solver = None,
         n_pools: Int = 1,
+        update_ocp_callback: tuple[Callable, AnyDict] | None = None,
+        structural_parameters: StrListOptional = None,
+        task_timeout: FloatOptional = None,
+        max_retries: Int = 1,
+        manifest_path: StrOptional = None,
+        priority_callback: tuple[Callable, AnyDict] | None = None,
+        prune_tolerance: FloatOptional = None,
+        prune_min_iterations: Int = 10,
+        n_converged_to_stop: IntOptional = None,
+        convergence_tolerance: Float = 1e-6,
     ):
         """
         Parameters
@@ -55,6 +93,39 @@ class MultiStart:
             The solver to use for the ocp. Default is IPOPT
         n_pools: int
             The number of pools to be used for multi-threading. If 1 is sent, then the built-in for loop is used
+        update_ocp_callback: Callable
+            If sent, the ocp is not prepared again for each combination. It is prepared once (per pool and per values
+            of the structural_parameters), then this function applies each combination to it, usually with
+            update_initial_guess, update_bounds or update_objectives_target. The inputs are the ocp and the combination
+            of the combinatorial_parameters. Since the same ocp is solved again, its solver is reused
+        structural_parameters: list[str]
+            The names of the combinatorial_parameters that cannot be applied by the update_ocp_callback (e.g. the
+            model or the number of shooting nodes). An ocp is prepared for each of their values
+        task_timeout: float
+            The maximum time (in seconds) given to a combination when n_pools > 1. The worker solving a combination for
+            longer is killed and replaced, and the combination is reported as MultiStartStatus.TIMEOUT
+        max_retries: int
+            The number of times a combination is sent again when the worker solving it crashes (n_pools > 1). After
+            that, it is reported as MultiStartStatus.FAILED and the multi-start goes on with the other combinations
+        manifest_path: str
+            If sent, the outcome of each combination is appended to this file (one json per line) as soon as it is
+            known. When the multi-start is run again, the combinations already solved, skipped or pruned are not run
+            again
+        priority_callback: Callable
+            If sent, the combinations are solved by increasing value of what this function returns (e.g. a cheap
+            estimate of their cost). The inputs are the combination of the combinatorial_parameters
+        prune_tolerance: float
+            If sent, a solve is stopped (and reported as MultiStartStatus.PRUNED) as soon as the objective of its
+            current iterate is worse than the best converged objective found so far (by any worker) by more than this
+            relative tolerance. This is a heuristic, the objective of an iterate is not a lower bound of what the solve
+            would converge to. Only available with IPOPT
+        prune_min_iterations: int
+            The number of iterations a solve is given before it can be pruned
+        n_converged_to_stop: int
+            If sent, the multi-start stops once this number of combinations converged to an objective within the
+            convergence_tolerance of the best one. The other combinations are not run (nor written in the manifest)
+        convergence_tolerance: float
+            The relative tolerance on the objective for a converged combination to count in n_converged_to_stop
         """
         # errors : post, prep,
         if not isinstance(combinatorial_parameters, dict):
@@ -75,12 +146,63 @@ class MultiStart:
             raise ValueError("should_solve_callback first argument must be a dictionary")
         if not isinstance(n_pools, int):
             raise ValueError("n_pools must be an int")
+        if task_timeout is not None and (not isinstance(task_timeout, (int, float)) or task_timeout <= 0):
+            raise ValueError("task_timeout must be a positive float")
+        if not isinstance(max_retries, int) or max_retries < 0:
+            raise ValueError("max_retries must be a positive int")
+        if manifest_path is not None and not isinstance(manifest_path, str):
+            raise ValueError("manifest_path must be an str")
+        if priority_callback is not None:
+            if not isinstance(priority_callback, tuple):
+                raise ValueError("priority_callback must be a tuple")
+            if not isinstance(priority_callback[0], Callable):
+                raise ValueError("priority_callback first argument must be a Callable")
+            if not isinstance(priority_callback[1], dict):
+                raise ValueError("priority_callback second argument must be a dictionary")
+        if prune_tolerance is not None:
+            if not isinstance(prune_tolerance, (int, float)) or prune_tolerance < 0:
+                raise ValueError("prune_tolerance must be a positive float")
+            if solver is not None and solver.type != SolverType.IPOPT:
+                raise ValueError("prune_tolerance is only available with IPOPT")
+        if not isinstance(prune_min_iterations, int) or prune_min_iterations < 0:
+            raise ValueError("prune_min_iterations must be a positive int")
+        if n_converged_to_stop is not None and (not isinstance(n_converged_to_stop, int) or n_converged_to_stop < 1):
+            raise ValueError("n_converged_to_stop must be a strictly positive int")
+        if not isinstance(convergence_tolerance, (int, float)) or convergence_tolerance < 0:
+            raise ValueError("convergence_tolerance must be a positive float")
+        if update_ocp_callback is not None:
+            if not isinstance(update_ocp_callback, tuple):
+                raise ValueError("update_ocp_callback must be a tuple")
+            if not isinstance(update_ocp_callback[0], Callable):
+                raise ValueError("update_ocp_callback first argument must be a Callable")
+            if not isinstance(update_ocp_callback[1], dict):
+                raise ValueError("update_ocp_callback second argument must be a dictionary")
+        structural_parameters = [] if structural_parameters is None else list(structural_parameters)
+        if not all(name in combinatorial_parameters for name in structural_parameters):
+            raise ValueError(
+                f"structural_parameters must be keys of combinatorial_parameters "
+                f"({list(combinatorial_parameters.keys())})"
+            )
 
         self.prepare_ocp_callback = prepare_ocp_callback
         self.post_optimization_callback = post_optimization_callback
         self.should_solve_callback = should_solve_callback
         self.solver = solver if solver else Solver.IPOPT()
         self.n_pools = n_pools
+        self.update_ocp_callback = update_ocp_callback
+        self.task_timeout = task_timeout
+        self.max_retries = max_retries
+        self.manifest_path = manifest_path
+        self.priority_callback = priority_callback
+        self.prune_tolerance = prune_tolerance
+        self.prune_min_iterations = prune_min_iterations
+        self.n_converged_to_stop = n_converged_to_stop
+        self.convergence_tolerance = convergence_tolerance
+        # The best converged objective found by any worker during the current solve (shared with the workers)
+        self._best_objective = None
+        self.structural_parameters_index = [
+            list(combinatorial_parameters.keys()).index(name) for name in structural_parameters
+        ]
         self.combined_ocp_parameters = self._generate_parameters_combinations(combinatorial_parameters)
         # self.save_folder = save_folder
 
@@ -96,20 +218,342 @@ class MultiStart:
             combined_args_to_list += [[instance for instance in combined_args[i]]]
         return combined_args_to_list
 
-    def _prepare_and_solve_ocp(self, ocp_parameters: AnyList) -> None:
-        if self.should_solve_callback is None or self.should_solve_callback[0](
+    def _prepare_ocp(self, ocp_parameters: AnyList) -> OptimalControlProgram:
+        """
+        Get the ocp of a combination, either prepared for it or (if an update_ocp_callback is sent) prepared once for
+        its structural parameters and updated with it
+        """
+
+        if self.update_ocp_callback is None:
+            return self.prepare_ocp_callback(*ocp_parameters)
+
+        key = tuple(ocp_parameters[i] for i in self.structural_parameters_index)
+        if key not in _prepared_ocps:
+            _prepared_ocps[key] = self.prepare_ocp_callback(*ocp_parameters)
+        ocp = _prepared_ocps[key]
+        self.update_ocp_callback[0](ocp, *ocp_parameters, **self.update_ocp_callback[1])
+        return ocp
+
+    def _prepare_and_solve_ocp(self, ocp_parameters: AnyList) -> tuple[MultiStartStatus, Any, FloatOptional]:
+        """
+        Solve a combination (unless the should_solve_callback says otherwise)
+
+        Returns
+        -------
+        The status of the combination, what the post_optimization_callback returned and the objective if the solve
+        converged
+        """
+
+        if self.should_solve_callback is not None and not self.should_solve_callback[0](
             *ocp_parameters, **self.should_solve_callback[1]
         ):
-            sol = self.prepare_ocp_callback(*ocp_parameters).solve(self.solver)
-            self.post_optimization_callback[0](sol, *ocp_parameters, **self.post_optimization_callback[1])
+            return MultiStartStatus.SKIPPED, None, None
+
+        ocp = self._prepare_ocp(ocp_parameters)
+        pruning_callback = self._pruning_callback(ocp) if self.prune_tolerance is not None else None
+        sol = ocp.solve(self.solver)
+        if pruning_callback is not None and pruning_callback.pruned:
+            return MultiStartStatus.PRUNED, None, None
+
+        objective = None
+        if sol.status == 0:
+            objective = float(sol.cost)
+            with self._best_objective.get_lock():
+                self._best_objective.value = min(self._best_objective.value, objective)
+
+        return (
+            MultiStartStatus.SOLVED,
+            self.post_optimization_callback[0](sol, *ocp_parameters, **self.post_optimization_callback[1]),
+            objective,
+        )
+
+    def _pruning_callback(self, ocp: OptimalControlProgram) -> "_PruningCallback":
+        """
+        Get the iteration callback which prunes the solves of this ocp. It is declared before the solver of the ocp is
+        created, so a prepared ocp keeps the same one for all the combinations it solves
+        """
+
+        ocp.set_ocp_solver(self.solver)
+        callback = ocp.ocp_solver.options_common.get("iteration_callback")
+        if not isinstance(callback, _PruningCallback):
+            callback = _PruningCallback(ocp, self._best_objective, self.prune_tolerance, self.prune_min_iterations)
+            ocp.ocp_solver.options_common["iteration_callback"] = callback
+        callback.reset(self._best_objective)
+        return callback
+
+    @staticmethod
+    def _manifest_key(ocp_parameters: AnyList) -> str:
+        return repr(list(ocp_parameters))
+
+    def _read_manifest(self) -> set:
+        """
+        The keys of the combinations already solved, skipped or pruned according to the manifest
+        """
+
+        done = set()
+        if self.manifest_path is None or not os.path.exists(self.manifest_path):
+            return done
+
+        completed = (MultiStartStatus.SOLVED.value, MultiStartStatus.SKIPPED.value, MultiStartStatus.PRUNED.value)
+        with open(self.manifest_path, "r") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # The last line may have been cut if the previous run was killed while writing it
+                if entry["status"] in completed:
+                    done.add(entry["parameters"])
+        return done
+
+    def _write_manifest(self, ocp_parameters: AnyList, status: MultiStartStatus) -> None:
+        if self.manifest_path is None:
+            return
+        with open(self.manifest_path, "a") as file:
+            file.write(json.dumps({"parameters": self._manifest_key(ocp_parameters), "status": status.value}) + "\n")
+            file.flush()
+
+    def solve_iter(self) -> Iterator[tuple[AnyList, MultiStartStatus, Any]]:
+        """
+        Run the multi-start and yield the result of each combination as soon as it is done (in the order they finish
+        when n_pools > 1). The combinations already completed according to the manifest are not run again
+
+        Returns
+        -------
+        For each combination, its parameters, its status and what the post_optimization_callback returned (the error
+        message if it failed)
+        """
+
+        done = self._read_manifest()
+        pending = [
+            ocp_parameters
+            for ocp_parameters in self.combined_ocp_parameters
+            if self._manifest_key(ocp_parameters) not in done
+        ]
+        if self.priority_callback is not None:
+            pending.sort(
+                key=lambda ocp_parameters: self.priority_callback[0](*ocp_parameters, **self.priority_callback[1])
+            )
+
+        self._best_objective = get_context().Value("d", inf)
+        objectives = []
+        results = self._solve_in_loop(pending) if self.n_pools == 1 else self._solve_in_workers(pending)
+        try:
+            for ocp_parameters, status, value, objective in results:
+                self._write_manifest(ocp_parameters, status)
+                yield ocp_parameters, status, value
+
+                if objective is not None:
+                    objectives.append(objective)
+                if self._should_stop(objectives):
+                    break
+        finally:
+            results.close()
+
+    def _should_stop(self, objectives: list[Float]) -> Bool:
+        """
+        If enough combinations converged close enough to the best objective
+        """
+
+        if self.n_converged_to_stop is None or len(objectives) < self.n_converged_to_stop:
+            return False
+
+        best = min(objectives)
+        threshold = best + self.convergence_tolerance * max(1.0, abs(best))
+        return sum(objective <= threshold for objective in objectives) >= self.n_converged_to_stop
 
     def solve(self) -> None:
         """
         Run the multi-start in the pools for multi-threading
         """
-        if self.n_pools == 1:
-            for ocp_parameters in self.combined_ocp_parameters:
-                self._prepare_and_solve_ocp(ocp_parameters)
-        else:
-            with Pool(self.n_pools) as p:
-                p.map(self._prepare_and_solve_ocp, self.combined_ocp_parameters)
+
+        for _ in self.solve_iter():
+            pass
+
+    def _solve_in_loop(self, pending: list[AnyList]) -> Iterator[tuple[AnyList, MultiStartStatus, Any, FloatOptional]]:
+        _reset_prepared_ocps()
+        try:
+            for ocp_parameters in pending:
+                yield ocp_parameters, *self._prepare_and_solve_ocp(ocp_parameters)
+        finally:
+            _reset_prepared_ocps()
+
+    def _solve_in_workers(
+        self, pending: list[AnyList]
+    ) -> Iterator[tuple[AnyList, MultiStartStatus, Any, FloatOptional]]:
+        """
+        Dispatch the combinations to persistent worker processes. Each worker receives the multi-start once when it
+        starts (so it keeps its prepared ocps) and then only the combinations, one at a time. A worker which dies or
+        exceeds the task_timeout is replaced without stopping the others
+        """
+
+        context = get_context()
+        results = context.Queue()
+        tasks = deque(enumerate(pending))
+        attempts = [0] * len(pending)
+        # Each worker started gets a new id, so the results sent by the workers which were replaced are recognized
+        worker_ids = count()
+        workers = [_Worker(context, self, results, next(worker_ids)) for _ in range(min(self.n_pools, len(pending)))]
+
+        try:
+            n_remaining = len(pending)
+            while n_remaining:
+                for worker in workers:
+                    if worker.task is None and tasks:
+                        worker.send(tasks.popleft())
+
+                # Collect everything that is ready before looking for dead workers, so a worker that exited right
+                # after sending its result is not taken for a crashed one
+                received = []
+                try:
+                    received.append(results.get(timeout=0.1))
+                    while True:
+                        received.append(results.get_nowait())
+                except Empty:
+                    pass
+
+                for worker_id, task_index, status, value, objective in received:
+                    worker = next((worker for worker in workers if worker.worker_id == worker_id), None)
+                    if worker is None or worker.task is None or worker.task[0] != task_index:
+                        # A worker killed (or found dead) right after sending its result, its combination was
+                        # already reported or sent again
+                        continue
+                    worker.task = None
+                    n_remaining -= 1
+                    yield pending[task_index], status, value, objective
+
+                for worker_index, worker in enumerate(workers):
+                    if worker.task is None:
+                        continue
+
+                    task_index = worker.task[0]
+                    if not worker.process.is_alive():
+                        attempts[task_index] += 1
+                        outcome = None
+                        if attempts[task_index] > self.max_retries:
+                            outcome = (
+                                MultiStartStatus.FAILED,
+                                f"The worker crashed (exit code {worker.process.exitcode})",
+                            )
+                        else:
+                            tasks.appendleft(worker.task)
+                    elif self.task_timeout is not None and time.time() - worker.start_time > self.task_timeout:
+                        worker.process.kill()
+                        outcome = (MultiStartStatus.TIMEOUT, f"The solve took more than {self.task_timeout} s")
+                    else:
+                        continue
+
+                    worker.process.join()
+                    workers[worker_index] = _Worker(context, self, results, next(worker_ids))
+                    if outcome is not None:
+                        n_remaining -= 1
+                        yield pending[task_index], *outcome, None
+        finally:
+            for worker in workers:
+                worker.stop()
+
+
+class _Worker:
+    """
+    A process of the multi-start with the combination it is currently solving
+    """
+
+    def __init__(self, context, multi_start: MultiStart, results, worker_id: Int):
+        self.worker_id = worker_id
+        self.tasks = context.SimpleQueue()
+        self.task = None
+        self.start_time = None
+        self.process = context.Process(
+            target=_worker_loop, args=(multi_start, self.tasks, results, worker_id), daemon=True
+        )
+        self.process.start()
+
+    def send(self, task: AnyTuple) -> None:
+        self.task = task
+        self.start_time = time.time()
+        self.tasks.put(task)
+
+    def stop(self) -> None:
+        if self.process.is_alive():
+            if self.task is None:
+                self.tasks.put(None)
+                self.process.join(timeout=1)
+            if self.process.is_alive():
+                self.process.kill()
+        self.process.join()
+
+
+def _worker_loop(multi_start: MultiStart, tasks, results, worker_id: Int) -> None:
+    """
+    The main loop of a worker: solve the combinations it receives until it receives None
+    """
+
+    _reset_prepared_ocps()
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+
+        task_index, ocp_parameters = task
+        try:
+            status, value, objective = multi_start._prepare_and_solve_ocp(ocp_parameters)
+        except Exception as e:
+            status, value, objective = MultiStartStatus.FAILED, f"{type(e).__name__}: {e}", None
+
+        try:
+            pickle.dumps(value)
+        except Exception:
+            value = None  # What the post_optimization_callback returns is only sent back if it can be
+        results.put((worker_id, task_index, status, value, objective))
+
+
+class _PruningCallback(OnlineCallbackAbstract):
+    """
+    The IPOPT iteration callback which stops a solve when its objective is worse than the best converged objective
+    found so far by the multi-start
+
+    Attributes
+    ----------
+    best_objective: multiprocessing.Value
+        The best converged objective, shared by all the workers
+    tolerance: float
+        The relative tolerance over the best objective
+    min_iterations: int
+        The number of iterations before a solve can be pruned
+    iteration: int
+        The number of iterations of the current solve
+    pruned: bool
+        If the current solve was stopped by this callback
+    """
+
+    def __init__(self, ocp, best_objective, tolerance: Float, min_iterations: Int):
+        super().__init__(ocp)
+        self.best_objective = best_objective
+        self.tolerance = tolerance
+        self.min_iterations = min_iterations
+        self.iteration = 0
+        self.pruned = False
+
+    def reset(self, best_objective) -> None:
+        """
+        Prepare the callback for a new solve
+        """
+
+        self.best_objective = best_objective
+        self.iteration = 0
+        self.pruned = False
+
+    def close(self) -> None:
+        pass
+
+    def eval(self, arg: AnyIterable, enforce: Bool = False) -> IntList:
+        if enforce:
+            # This is the final call made after the solve, not an iteration
+            return [0]
+
+        self.iteration += 1
+        best = self.best_objective.value
+        if self.iteration > self.min_iterations and best != inf:
+            if float(arg[1]) > best + self.tolerance * max(1.0, abs(best)):
+                self.pruned = True
+                return [1]
+        return [0]
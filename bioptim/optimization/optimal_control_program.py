@@ -1,12 +1,14 @@
 from math import inf
+import pickle
 from typing import Any
 
 import biorbd_casadi as biorbd
 import casadi
 import numpy as np
-from casadi import MX, SX, sum1, horzcat
+from casadi import MX, SX, Function, sum1, horzcat
 from matplotlib import pyplot as plt
 
+from .loaded_optimal_control_program import LoadedOptimalControlProgram
 from .non_linear_program import NonLinearProgram as NLP
 from .optimization_vector import OptimizationVectorHelper
 from .vector_layout import VectorLayout, OrderingStrategy
@@ -116,6 +118,15 @@ class OptimalControlProgram:
         A reference to the ocp solver
     version: dict
         The version of all the underlying software. This is important when loading a previous ocp
+    are_objectives_modified: bool
+        If the objective functions were modified since the last solve, meaning their graph must be dispatched again.
+        Changing the bounds or the initial guess does not modify it
+    are_constraints_modified: bool
+        If the constraints were modified since the last solve, meaning their graph must be dispatched again.
+        Changing the bounds or the initial guess does not modify it
+    vectors_computation_count: dict[str, int]
+        The number of times the variables_vector, bounds_vectors and init_vector were actually computed (and not
+        returned from the cache)
 
     Methods
     -------
@@ -144,6 +155,10 @@ class OptimalControlProgram:
         Create all the plots associated with the OCP
     solve(self, solver: Solver) -> Solution
         Call the solver to actually solve the ocp
+    save(self, path: str)
+        Save the fully built ocp so it can be reloaded and solved without being rebuilt
+    load(path: str) -> LoadedOptimalControlProgram
+        Load an ocp previously saved with save
     _define_time(self, phase_time: float | tuple, objective_functions: ObjectiveList, constraints: ConstraintList)
         Declare the phase_time vector in v. If objective_functions or constraints defined a time optimization,
         a sanity check is perform and the values of initial guess and bounds for these particular phases
@@ -253,6 +268,10 @@ class OptimalControlProgram:
 
         self._check_bioptim_version()
 
+        self._cached_vectors = {"variables_vector": None, "bounds_vectors": None, "init_vector": None}
+        self.vectors_computation_count = {"variables_vector": 0, "bounds_vectors": 0, "init_vector": 0}
+        self._stepwise_states_functions = None
+
         bio_model = self._initialize_model(bio_model)
 
         self._check_and_set_threads(n_threads)
@@ -312,6 +331,8 @@ class OptimalControlProgram:
             integrated_value_functions,
         )
         self._is_warm_starting = False
+        self.are_objectives_modified = True
+        self.are_constraints_modified = True
 
         # Do not copy singleton since x_scaling was already dealt with before
         NLP.add(self, "x_scaling", x_scaling, True)
@@ -760,18 +781,74 @@ class OptimalControlProgram:
 
     def _prepare_vector_layout(self, ordering_strategy: OrderingStrategy | None) -> None:
         self.vector_layout = VectorLayout(self, ordering=ordering_strategy)
+        self._invalidate_vectors_cache()
+
+    def _invalidate_vectors_cache(self, variables: Bool = True, bounds: Bool = True, init: Bool = True) -> None:
+        """
+        Discard the cached vectors so they are computed again at their next access
+
+        Parameters
+        ----------
+        variables: bool
+            If the variables_vector should be discarded
+        bounds: bool
+            If the bounds_vectors should be discarded
+        init: bool
+            If the init_vector should be discarded
+        """
+
+        if variables:
+            self._cached_vectors["variables_vector"] = None
+            self._stepwise_states_functions = None
+        if bounds:
+            self._cached_vectors["bounds_vectors"] = None
+        if init:
+            self._cached_vectors["init_vector"] = None
+
+    def _get_cached_vector(self, name: Str, compute: Callable) -> Any:
+        """
+        Get a vector from the cache, computing it if it was invalidated since its last access
+
+        Parameters
+        ----------
+        name: str
+            The name of the vector in the cache
+        compute: Callable
+            The function that computes the vector from the ocp
+
+        Returns
+        -------
+        The requested vector
+        """
+
+        if self._cached_vectors[name] is None:
+            self._cached_vectors[name] = compute(self)
+            self.vectors_computation_count[name] += 1
+        return self._cached_vectors[name]
 
     @property
     def variables_vector(self) -> CX:
-        return OptimizationVectorHelper.vector(self)
+        return self._get_cached_vector("variables_vector", OptimizationVectorHelper.vector)
+
+    @property
+    def stepwise_states_functions(self) -> list[Function]:
+        """
+        The functions giving the states at each step of each node of a phase, as computed by the integrators of the
+        continuity constraints (see OptimizationVectorHelper.stepwise_states_functions). They are built at the first
+        access and kept until the decision variables change
+        """
+
+        if self._stepwise_states_functions is None:
+            self._stepwise_states_functions = OptimizationVectorHelper.stepwise_states_functions(self)
+        return self._stepwise_states_functions
 
     @property
     def bounds_vectors(self) -> DoubleNpArrayTuple:
-        return OptimizationVectorHelper.bounds_vectors(self)
+        return self._get_cached_vector("bounds_vectors", OptimizationVectorHelper.bounds_vectors)
 
     @property
     def init_vector(self) -> NpArray:
-        return OptimizationVectorHelper.init_vector(self)
+        return self._get_cached_vector("init_vector", OptimizationVectorHelper.init_vector)
 
     @classmethod
     def from_loaded_data(cls, data: AnyDict) -> "OptimalControlProgram":
@@ -794,6 +871,95 @@ class OptimalControlProgram:
 
         return cls(**data)
 
+    def save(self, path: Str, expand_during_shake_tree: Bool = False) -> None:
+        """
+        Save the fully built ocp so it can be reloaded (see OptimalControlProgram.load) and solved without rebuilding
+        the models, the dynamics and the penalties. The nlp is stored as a serialized CasADi Function, alongside the
+        bounds and initial guess of the decision variables, the bounds of the constraints, the index map of the
+        VectorLayout and the metadata of the penalties. The penalties are shaken as they are before a solve, so the
+        time steps which are constant (min == max) at the moment of saving are constant in the saved nlp
+
+        Parameters
+        ----------
+        path: str
+            The path of the file to save to
+        expand_during_shake_tree: bool
+            If the tree should be expanded during the shake phase
+        """
+
+        from ..interfaces.ipopt_interface import IpoptInterface
+        from ..interfaces.interface_utils import _shake_penalties_tree
+
+        interface = IpoptInterface(self)
+        v = self.variables_vector
+        v_bounds = self.bounds_vectors
+        objectives = _shake_penalties_tree(self, interface.dispatch_obj_func(), v, v_bounds, expand_during_shake_tree)
+        constraints, constraints_bounds = interface.dispatch_bounds()
+        constraints = _shake_penalties_tree(self, constraints, v, v_bounds, expand_during_shake_tree)
+        nlp_function = Function("nlp", [v], [sum1(objectives), constraints], ["v"], ["f", "g"])
+
+        data = {
+            "version": self.version,
+            "nlp_function": nlp_function.serialize(),
+            "bounds_vectors": v_bounds,
+            "init_vector": self.init_vector,
+            "g_bounds": (np.array(constraints_bounds.min), np.array(constraints_bounds.max)),
+            "index_map": self.vector_layout.index_map,
+            "penalties": self._penalties_metadata(),
+            "n_phases": self.n_phases,
+        }
+        with open(path, "wb") as file:
+            pickle.dump(data, file)
+
+    @staticmethod
+    def load(path: Str) -> LoadedOptimalControlProgram:
+        """
+        Load an ocp previously saved with OptimalControlProgram.save. The returned program can be solved right away,
+        but it does not hold any model, so it cannot be modified other than its bounds and initial guess
+
+        Parameters
+        ----------
+        path: str
+            The path of the file to load
+
+        Returns
+        -------
+        The loaded program
+        """
+
+        return LoadedOptimalControlProgram.load(path)
+
+    def _penalties_metadata(self) -> list[AnyDict]:
+        """
+        Describe all the penalties of the ocp
+
+        Returns
+        -------
+        The name, kind (objective or constraint), phase (-1 for the penalties that are not phase dependent), node
+        indices and if the penalty is internal, of all the penalties
+        """
+
+        all_penalties = [(-1, "objective", self.J_internal + self.J), (-1, "constraint", self.g_internal + self.g)]
+        for nlp in self.nlp:
+            all_penalties.append((nlp.phase_idx, "objective", nlp.J_internal + nlp.J))
+            all_penalties.append((nlp.phase_idx, "constraint", nlp.g_internal + nlp.g))
+
+        metadata = []
+        for phase, kind, penalties in all_penalties:
+            for penalty in penalties:
+                if not penalty:
+                    continue
+                metadata.append(
+                    {
+                        "name": penalty.name,
+                        "kind": kind,
+                        "phase": phase,
+                        "node_idx": list(penalty.node_idx),
+                        "internal": penalty.penalty_type == PenaltyType.INTERNAL,
+                    }
+                )
+        return metadata
+
     def _set_kinematic_phase_mapping(self) -> AnyTuple:
         """
         To add phase_mapping for different kinematic number of states in the ocp. It maps the degrees of freedom
@@ -931,6 +1097,7 @@ class OptimalControlProgram:
 
         else:
             raise RuntimeError("new_objective_function must be a Objective or an ObjectiveList")
+        self.are_objectives_modified = True
 
     def update_parameter_objectives(self, new_objective_function: ParameterObjective | ParameterObjectiveList) -> None:
         """
@@ -952,6 +1119,7 @@ class OptimalControlProgram:
 
         else:
             raise RuntimeError("new_objective_function must be a ParameterObjective or an ParameterObjectiveList")
+        self.are_objectives_modified = True
 
     def update_objectives_target(
         self, target: NpArray, phase: IntOptional = None, list_index: IntOptional = None
@@ -978,6 +1146,8 @@ class OptimalControlProgram:
             raise ValueError("'phase' must be defined")
 
         ObjectiveFunction.update_target(self.nlp[phase] if phase >= 0 else self, list_index, target)
+        # The target is a constant of the objective graph, so the objectives (but not the constraints) are rebuilt
+        self.are_objectives_modified = True
 
     def update_constraints(self, new_constraints: Constraint | ConstraintList) -> None:
         """
@@ -998,6 +1168,7 @@ class OptimalControlProgram:
                     self._modify_penalty(constraint)
         else:
             raise RuntimeError("new_constraint must be a Constraint or a ConstraintList")
+        self.are_constraints_modified = True
 
     def update_parameter_constraints(self, new_constraint: ParameterConstraint | ParameterConstraintList) -> None:
         """
@@ -1018,6 +1189,7 @@ class OptimalControlProgram:
                     self._modify_parameter_penalty(constraint)
         else:
             raise RuntimeError("new_constraint must be a ParameterConstraint or a ParameterConstraintList")
+        self.are_constraints_modified = True
 
     def _declare_parameters(self, parameters: ParameterList) -> None:
         """
@@ -1034,6 +1206,7 @@ class OptimalControlProgram:
 
         self.parameters = ParameterContainer(use_sx=(self.cx == SX))
         self.parameters.initialize(parameters)
+        self._invalidate_vectors_cache()
 
     def update_bounds(
         self,
@@ -1097,6 +1270,7 @@ class OptimalControlProgram:
 
         for nlp in self.nlp:
             nlp.update_bounds_on_plots()
+        self._invalidate_vectors_cache(variables=False, init=False)
 
     def update_initial_guess(
         self,
@@ -1157,6 +1331,7 @@ class OptimalControlProgram:
 
             for key in parameter_init.keys():
                 self.parameter_init.add(key, parameter_init[key], phase=0)
+        self._invalidate_vectors_cache(variables=False, bounds=False)
 
     def add_plot(self, fig_name: Str, update_function: Callable, phase: Int = -1, **parameters: Any) -> None:
         """
@@ -1653,6 +1828,7 @@ class OptimalControlProgram:
         self.dt_parameter_initial_guess = InitialGuess(
             "dt_initial_guess", initial_guess=[v for v in dt_initial_guess.values()]
         )
+        self._invalidate_vectors_cache()
 
     def _define_numerical_timeseries(self, dynamics: DynamicsOptions | DynamicsOptionsList | None) -> None:
         """
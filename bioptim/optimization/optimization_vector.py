@@ -1,11 +1,12 @@
 import numpy as np
-from casadi import vertcat, DM, SX, MX
+from casadi import vertcat, horzcat, DM, SX, MX, Function
 
 from ..misc.parameters_types import (
     AnyTuple,
     CX,
     DMList,
     FloatList,
+    Int,
     NpArray,
     DoubleNpArrayTuple,
 )
@@ -39,6 +40,10 @@ class OptimizationVectorHelper:
         Declare and parse the initial guesses for all the variables (v vector)
     add_parameter(self, param: Parameter)
         Add a parameter to the parameters pool
+    stepwise_states_functions(ocp: "OptimalControlProgram") -> list[Function]
+        The states at each step of each node, as computed by the integrators of the continuity constraints
+    control_duplication_sources(nlps: list["NonLinearProgram"]) -> list
+        The (phase, node) of the decision controls to stack horizontally at each control node
     control_duplication(controls: dict, nlps: list["NonLinearProgram"]) -> dict
         Duplicate the controls for linear continuous control types.
     """
@@ -238,46 +243,106 @@ class OptimizationVectorHelper:
         # Starts at zero
         out = []
         for dt, nlp in zip(phase_dt, ocp.nlp):
-            phase_step_times = []
-            for node in range(nlp.ns):
-                phase_step_times.append(nlp.dynamics[node].step_times_from_dt(vertcat(dt * node, dt)))
+            step_times_functions = [nlp.dynamics[node].step_times_from_dt for node in range(nlp.ns)]
+            if nlp.ns > 1 and len({f.size1_out(0) for f in step_times_functions}) == 1:
+                # All the intervals have the same number of steps, so they are all computed in a single mapped call
+                t_span = vertcat(DM(np.arange(nlp.ns)).T * dt, DM.ones(1, nlp.ns) * dt)
+                step_times = step_times_functions[0].map(nlp.ns)(t_span)
+                phase_step_times = [step_times[:, node] for node in range(nlp.ns)]
+            else:
+                phase_step_times = [f(vertcat(dt * node, dt)) for node, f in enumerate(step_times_functions)]
             phase_step_times.append(DM(dt * nlp.ns))
             out.append(phase_step_times)
         return out
 
+    @staticmethod
+    def stepwise_states_functions(ocp: "OptimalControlProgram") -> list[Function]:
+        """
+        The states at each step of each node, as computed by the integrators of the continuity constraints (their
+        xall output), as functions of the vector of the decision variables. Evaluating them gives the stepwise states
+        of a solution in a single call per phase, without reintegrating it
+
+        Returns
+        -------
+        One function per phase, (v, d) -> (xall of each interval, states of the last node), where d is the numerical
+        timeseries of each node stacked horizontally
+        """
+        from ..interfaces.interface_utils import get_numerical_timeseries
+
+        v = ocp.variables_vector
+        parameters = ocp.parameters.scaled.cx  # The integrators of the continuity constraints use scaled parameters
+        sources = OptimizationVectorHelper.control_duplication_sources(ocp.nlp)
+
+        def unscaled_controls(nlp: "NonLinearProgram", node: Int) -> CX:
+            if not nlp.controls.keys():
+                return nlp.U_scaled[node]
+            return nlp.U_scaled[node] * np.concatenate([nlp.u_scaling[key].scaling for key in nlp.controls.keys()])
+
+        functions = []
+        for p, nlp in enumerate(ocp.nlp):
+            n_timeseries = get_numerical_timeseries(ocp, p, 0, 0).shape[0]
+            d = nlp.cx.sym("d", n_timeseries, nlp.ns + 1)
+
+            outputs = []
+            for node in range(nlp.ns):
+                u = horzcat(*[unscaled_controls(ocp.nlp[phase], n) for phase, n in sources[p][node]])
+                a = nlp.A[node] if nlp.A else nlp.A_scaled[node]
+                t_span = vertcat(ocp.node_time(phase_idx=p, node_idx=node), nlp.dt)
+                d_node = d[:, node] if n_timeseries else nlp.cx()
+                outputs.append(nlp.dynamics[node](t_span, nlp.X[node], u, parameters, a, d_node)[1])
+            outputs.append(nlp.X[nlp.ns])
+
+            functions.append(Function(f"stepwise_states_phase{p}", [v, d], outputs))
+        return functions
+
+    @staticmethod
+    def control_duplication_sources(nlps: list["NonLinearProgram"]) -> list:
+        """
+        The (phase, node) of the decision controls to stack horizontally at each control node. This is only different
+        from the node itself for ControlType.LINEAR_CONTINUOUS, where the control of the next node is appended
+
+        Returns
+        -------
+        The sources as [phase][node] = list[tuple[phase, node]]
+        """
+
+        sources = []
+        for p, nlp in enumerate(nlps):
+            phase_sources = []
+            for node in range(nlp.n_controls_nodes):
+
+                # NOTE: hardcoded that phases are sequential 0->1->2 ... not 0->2->3 + 0->1
+                is_last_phase = p == (len(nlps) - 1)
+                is_last_node = node == (nlp.n_controls_nodes - 1)
+
+                # NOTE: only different of 1 for ControlType.LINEAR_CONTINUOUS
+                n_cols = nlp.control_type.nb_interpolation_points(
+                    has_no_successor_phase=is_last_phase,
+                    is_last_node=is_last_node,
+                )
+
+                # NOTE: hardcoded that the next phase is the next in the list. Not a graph.
+                if is_last_node and not is_last_phase:
+                    next_source = (p + 1, 0)
+                else:
+                    next_source = (p, node + 1)
+
+                phase_sources.append([(p, node)] + [next_source] * (n_cols - 1))
+            sources.append(phase_sources)
+
+        return sources
+
     @staticmethod
     def control_duplication(controls: dict, nlps: list["NonLinearProgram"]) -> dict:
         """Duplicate the controls for linear continuous control types."""
-        for p, (controls_p, nlp) in enumerate(zip(controls, nlps)):
-            for key in controls_p.keys():
-                controls_p_key = controls_p[key]
-                for node in range(nlp.n_controls_nodes):
-
-                    # NOTE: hardcoded that phases are sequential 0->1->2 ... not 0->2->3 + 0->1
-                    is_last_phase = p == (len(nlps) - 1)
-                    is_last_node = node == (nlp.n_controls_nodes - 1)
-
-                    # NOTE: only different of 1 for ControlType.LINEAR_CONTINUOUS
-                    n_cols = nlp.control_type.nb_interpolation_points(
-                        has_no_successor_phase=is_last_phase,
-                        is_last_node=is_last_node,
-                    )
-
-                    # NOTE: hardcoded that the next phase is the next in the list. Not a graph.
-                    if is_last_node and not is_last_phase:
-                        phase_next_node = p + 1
-                        next_node = 0
-                    else:
-                        phase_next_node = p
-                        next_node = node + 1
-
-                    current_control = controls_p_key[node]
-                    for i in range(1, n_cols):
-                        next_control = controls[phase_next_node][key][next_node]
-                        current_control = np.hstack((current_control, next_control))
-
-                    controls_p_key[node] = current_control
-                controls_p[key] = controls_p_key
-            controls[p] = controls_p
-
-        return controls
+        sources = OptimizationVectorHelper.control_duplication_sources(nlps)
+        return [
+            {
+                key: [
+                    np.hstack([controls[source_phase][key][source_node] for source_phase, source_node in node_sources])
+                    for node_sources in sources[p]
+                ]
+                for key in controls_p.keys()
+            }
+            for p, controls_p in enumerate(controls)
+        ]
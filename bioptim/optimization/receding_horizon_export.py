@@ -0,0 +1,275 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+import numpy as np
+
+from ..misc.parameters_types import AnyDict, AnyDictOptional, AnyList, Bool, Int, Str
+
+
+class ExportSink(ABC):
+    """
+    The receiver of the frames exported after each window of a receding horizon optimization. The final solution is
+    built from the states, controls and parameters sequences, so any sink must be able to give them back
+
+    Methods
+    -------
+    clear(self)
+        Remove all the frames (called at the beginning of each solve)
+    append(self, states: dict, controls: dict, parameters: dict)
+        Receive the frame exported from a window
+    append_final_states(self, states: dict)
+        Receive the states of the last node of the last window
+    states(self) -> Sequence
+        The states of each frame, then the final states
+    controls(self) -> Sequence
+        The controls of each frame
+    parameters(self) -> Sequence
+        The parameters of each frame
+    """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Remove all the frames (called at the beginning of each solve)
+        """
+
+    @abstractmethod
+    def append(self, states: AnyDict, controls: AnyDict, parameters: AnyDict) -> None:
+        """
+        Receive the frame exported from a window
+        """
+
+    @abstractmethod
+    def append_final_states(self, states: AnyDict) -> None:
+        """
+        Receive the states of the last node of the last window
+        """
+
+    @property
+    @abstractmethod
+    def states(self) -> Sequence:
+        """
+        The states of each frame, then the final states
+        """
+
+    @property
+    @abstractmethod
+    def controls(self) -> Sequence:
+        """
+        The controls of each frame
+        """
+
+    @property
+    @abstractmethod
+    def parameters(self) -> Sequence:
+        """
+        The parameters of each frame
+        """
+
+
+class MemoryExportSink(ExportSink):
+    """
+    Keep the exported frames in memory (the default behavior of the receding horizon optimizations)
+    """
+
+    def __init__(self):
+        self._states = []
+        self._controls = []
+        self._parameters = []
+
+    def clear(self) -> None:
+        self._states = []
+        self._controls = []
+        self._parameters = []
+
+    def append(self, states: AnyDict, controls: AnyDict, parameters: AnyDict) -> None:
+        self._states.append(states)
+        self._controls.append(controls)
+        self._parameters.append(parameters)
+
+    def append_final_states(self, states: AnyDict) -> None:
+        self._states.append(states)
+
+    @property
+    def states(self) -> AnyList:
+        return self._states
+
+    @property
+    def controls(self) -> AnyList:
+        return self._controls
+
+    @property
+    def parameters(self) -> AnyList:
+        return self._parameters
+
+
+class FileExportSink(ExportSink):
+    """
+    Write the exported frames to an append-only binary file, so the memory used does not grow with the number of
+    windows. Each frame is one record of float64: a header (is_window, number of states columns, number of controls
+    columns), the states and the controls (column-major, keys in order) and the parameters. The keys and their number
+    of rows are written once in a json file next to it. The frames are read back lazily from a memory map of the file
+
+    Attributes
+    ----------
+    path: str
+        The path of the binary file
+    layout_path: str
+        The path of the json file describing the keys of the records
+    """
+
+    HEADER_SIZE = 3
+
+    def __init__(self, path: Str):
+        """
+        Parameters
+        ----------
+        path: str
+            The path of the binary file. It is overwritten when the receding horizon optimization starts
+        """
+
+        self.path = path
+        self.layout_path = f"{path}.json"
+        self._layout = None
+        self._offsets = None
+        self._window_records = None
+        self._size = 0
+        self._memmap = None
+
+        if os.path.exists(self.path) and os.path.exists(self.layout_path):
+            with open(self.layout_path, "r") as file:
+                self._layout = json.load(file)
+
+    def clear(self) -> None:
+        open(self.path, "wb").close()
+        if os.path.exists(self.layout_path):
+            os.remove(self.layout_path)
+        self._layout = None
+        self._offsets = []
+        self._window_records = []
+        self._size = 0
+        self._memmap = None
+
+    def append(self, states: AnyDict, controls: AnyDict, parameters: AnyDict) -> None:
+        if self._layout is None:
+            self._layout = {
+                "states": [[key, int(value.shape[0])] for key, value in states.items()],
+                "controls": [[key, int(value.shape[0])] for key, value in controls.items()],
+                "parameters": [[key, int(np.size(value))] for key, value in parameters.items()],
+            }
+            with open(self.layout_path, "w") as file:
+                json.dump(self._layout, file)
+
+        self._write(True, states, controls, parameters)
+
+    def append_final_states(self, states: AnyDict) -> None:
+        self._write(False, states, {}, {})
+
+    def _write(self, is_window: Bool, states: AnyDict, controls: AnyDict, parameters: AnyDict) -> None:
+        n_states_columns = states[self._layout["states"][0][0]].shape[1] if self._layout["states"] else 0
+        n_controls_columns = (
+            controls[self._layout["controls"][0][0]].shape[1] if controls and self._layout["controls"] else 0
+        )
+
+        record = [np.array([float(is_window), n_states_columns, n_controls_columns])]
+        record += [np.asarray(states[key], dtype=float).ravel(order="F") for key, _ in self._layout["states"]]
+        if is_window:
+            record += [np.asarray(controls[key], dtype=float).ravel(order="F") for key, _ in self._layout["controls"]]
+            record += [np.asarray(parameters[key], dtype=float).ravel() for key, _ in self._layout["parameters"]]
+        record = np.concatenate(record)
+
+        with open(self.path, "ab") as file:
+            record.tofile(file)
+
+        if self._offsets is not None:
+            if is_window:
+                self._window_records.append(len(self._offsets))
+            self._offsets.append(self._size)
+            self._size += record.shape[0]
+        self._memmap = None
+
+    def _record_size(self, offset: Int) -> Int:
+        is_window, n_states_columns, n_controls_columns = self._data[offset : offset + self.HEADER_SIZE]
+        size = self.HEADER_SIZE + int(n_states_columns) * sum(rows for _, rows in self._layout["states"])
+        if is_window:
+            size += int(n_controls_columns) * sum(rows for _, rows in self._layout["controls"])
+            size += sum(rows for _, rows in self._layout["parameters"])
+        return size
+
+    @property
+    def _data(self) -> np.ndarray:
+        if self._memmap is None:
+            self._memmap = np.memmap(self.path, dtype=float, mode="r") if os.path.getsize(self.path) else np.zeros(0)
+        return self._memmap
+
+    def _index(self) -> None:
+        """
+        Find where each record starts (only needed when the file was written by another sink)
+        """
+
+        if self._offsets is not None:
+            return
+
+        self._offsets = []
+        self._window_records = []
+        self._size = 0
+        while self._size < self._data.shape[0]:
+            if self._data[self._size]:
+                self._window_records.append(len(self._offsets))
+            self._offsets.append(self._size)
+            self._size += self._record_size(self._size)
+
+    def _read(self, record: Int, variable_type: Str) -> AnyDict:
+        offset = self._offsets[record]
+        is_window, n_states_columns, n_controls_columns = self._data[offset : offset + self.HEADER_SIZE]
+        offset += self.HEADER_SIZE
+
+        out = {}
+        for current_type, n_columns in (
+            ("states", int(n_states_columns)),
+            ("controls", int(n_controls_columns)),
+            ("parameters", None),
+        ):
+            for key, rows in self._layout[current_type]:
+                size = rows if n_columns is None else rows * n_columns
+                if current_type == variable_type:
+                    values = np.array(self._data[offset : offset + size])
+                    out[key] = values if n_columns is None else values.reshape((rows, n_columns), order="F")
+                offset += size
+            if current_type == variable_type or not is_window:
+                break
+        return out
+
+    @property
+    def states(self) -> Sequence:
+        return _RecordsView(self, None, "states")
+
+    @property
+    def controls(self) -> Sequence:
+        return _RecordsView(self, "window", "controls")
+
+    @property
+    def parameters(self) -> Sequence:
+        return _RecordsView(self, "window", "parameters")
+
+
+class _RecordsView(Sequence):
+    """
+    The frames of a FileExportSink, read from the file only when they are accessed
+    """
+
+    def __init__(self, sink: FileExportSink, records: str | None, variable_type: Str):
+        sink._index()
+        self._sink = sink
+        self._records = sink._window_records if records == "window" else list(range(len(sink._offsets)))
+        self._variable_type = variable_type
+
+    def __len__(self) -> Int:
+        return len(self._records)
+
+    def __getitem__(self, index: Int) -> AnyDictOptional:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._sink._read(self._records[index], self._variable_type)
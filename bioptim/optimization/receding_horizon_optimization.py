@@ -6,6 +6,7 @@ from casadi import SX
 import numpy as np
 
 from .optimal_control_program import OptimalControlProgram
+from .receding_horizon_export import ExportSink, MemoryExportSink
 from ..optimization.solution.solution import Solution
 from ..dynamics.configure_problem import DynamicsOptions, DynamicsOptionsList
 from ..dynamics.ode_solvers import OdeSolver
@@ -95,6 +96,7 @@ class RecedingHorizonOptimization(OptimalControlProgram):
             self.nb_intermediate_frames = self.nlp[0].dynamics_type.ode_solver.polynomial_degree + 1
         else:
             self.nb_intermediate_frames = 1
+        self._window_shift = None
 
     def solve(
         self,
@@ -106,6 +108,7 @@ class RecedingHorizonOptimization(OptimalControlProgram):
         max_consecutive_failing: Int = inf,
         update_function_extra_params: AnyDictOptional = None,
         get_all_iterations: Bool = False,
+        export_sink: ExportSink | None = None,
         **advance_options,
     ) -> Solution | AnyTuple:
         """
@@ -138,6 +141,9 @@ class RecedingHorizonOptimization(OptimalControlProgram):
             Any parameters to pass to the update function
         get_all_iterations: bool
             If an extra output value that includes all the individual solution should be returned
+        export_sink: ExportSink
+            The receiver of the frame exported from each window, from which the final solution is built. Default keeps
+            them in memory (MemoryExportSink), a FileExportSink streams them to an append-only file instead
         advance_options: Any
             The extra options to pass to the advancing methods
 
@@ -150,9 +156,8 @@ class RecedingHorizonOptimization(OptimalControlProgram):
             raise NotImplementedError("MHE is only available for 1 phase program")
 
         sol = None
-        states = []
-        controls = []
-        parameters = []
+        export_sink = MemoryExportSink() if export_sink is None else export_sink
+        export_sink.clear()
 
         solver_all_iter = Solver.ACADOS() if solver is None else solver
         if solver_first_iter is None and solver is not None:
@@ -200,10 +205,7 @@ class RecedingHorizonOptimization(OptimalControlProgram):
                 real_time = perf_counter()  # Reset timer to skip the compiling time (so skip the first call to solve)
 
             # Solve and save the current window of interest
-            _states, _controls, _parameters = self.export_data(sol)
-            states.append(_states)
-            controls.append(_controls)
-            parameters.append(_parameters)
+            export_sink.append(*self.export_data(sol))
             # Solve and save the full window of the OCP
             if get_all_iterations:
                 all_solutions.append(sol)
@@ -212,12 +214,14 @@ class RecedingHorizonOptimization(OptimalControlProgram):
 
             self.total_optimization_run += 1
 
-        states.append({key: sol.decision_states()[key][-1] for key in sol.decision_states().keys()})
+        export_sink.append_final_states({key: sol.decision_states()[key][-1] for key in sol.decision_states().keys()})
         real_time = perf_counter() - real_time
 
         # Prepare the modified ocp that fits the solution dimension
         dt = sol.t_span()[0][-1]
-        final_sol = self._initialize_solution(float(dt), states, controls, parameters)
+        final_sol = self._initialize_solution(
+            float(dt), export_sink.states, export_sink.controls, export_sink.parameters
+        )
         final_sol.solver_time_to_optimize = total_time
         final_sol.real_time_to_optimize = real_time
 
@@ -286,6 +290,9 @@ class RecedingHorizonOptimization(OptimalControlProgram):
         return Solution.from_initial_guess(solution_ocp, [np.array([dt]), x_init, u_init, p_init, a_init])
 
     def advance_window(self, sol: Solution, steps: Int = 0, **advance_options) -> None:
+        if self._advance_window_in_place(sol, **advance_options):
+            return
+
         state_bounds_have_changed = self.advance_window_bounds_states(sol, **advance_options)
         control_bounds_have_changed = self.advance_window_bounds_controls(sol, **advance_options)
         if self.ocp_solver.opts.type != SolverType.ACADOS:
@@ -305,6 +312,128 @@ class RecedingHorizonOptimization(OptimalControlProgram):
                 self.parameter_init if init_parameter_have_changed else None,
             )
 
+    def _can_advance_window_in_place(self) -> Bool:
+        """
+        If the window can be advanced by shifting the cached bounds and initial guess vectors. It is the case when
+        the default advancing methods are used on a program which is not collocated and the bounds and initial guesses
+        already have the types the previous windows gave them (so advancing them does not change their dimensions)
+        """
+
+        cls = RecedingHorizonOptimization
+        uses_default_advance = all(
+            getattr(type(self), name) is getattr(cls, name)
+            for name in (
+                "advance_window_bounds_states",
+                "advance_window_bounds_controls",
+                "advance_window_initial_guess_states",
+                "advance_window_initial_guess_controls",
+                "advance_window_initial_guess_parameters",
+            )
+        )
+        if not uses_default_advance or self.ocp_solver.opts.type == SolverType.ACADOS:
+            return False
+
+        nlp = self.nlp[0]
+        return (
+            self.nb_intermediate_frames == 1
+            and self._cached_vectors["bounds_vectors"] is not None
+            and self._cached_vectors["init_vector"] is not None
+            and all(
+                key in nlp.x_init.keys() and nlp.x_init[key].type == InterpolationType.EACH_FRAME
+                for key in nlp.states.keys()
+            )
+            and all(nlp.u_init[key].type == InterpolationType.EACH_FRAME for key in nlp.u_init.keys())
+            and all(
+                nlp.x_bounds[key].type == InterpolationType.CONSTANT_WITH_FIRST_AND_LAST_DIFFERENT
+                for key in nlp.x_bounds.keys()
+            )
+        )
+
+    def _window_shift_indices(self) -> AnyDict:
+        """
+        The indices (in the vector of the decision variables) to copy from the solution of a window to the bounds
+        and the initial guess of the next one. They mirror the default advancing methods: the bounds of the first
+        node are set to the second node and the initial guess of each node is set to the next node (the last node
+        being repeated). The same indices are also given per key (one column per node) so the bounds and initial
+        guess objects can be updated without merging the solution. They are computed once per vector layout
+        """
+
+        if self._window_shift is not None and self._window_shift[0] is self.vector_layout:
+            return self._window_shift[1]
+
+        nlp = self.nlp[0]
+        index_map = self.vector_layout.index_map
+
+        def rows(key: tuple, variables, keys) -> np.ndarray:
+            block = np.arange(index_map[key][0].start, index_map[key][0].stop)
+            return np.array([block[i] for k in keys for i in variables[k].index], dtype=int)
+
+        bounds_keys = [key for key in nlp.states.keys() if key in nlp.x_bounds.keys()]
+        init_destination, init_source = [], []
+        init_per_key = {}
+        for variable_type, variables, keys in (
+            ("states", nlp.states, nlp.states.keys()),
+            ("controls", nlp.controls, nlp.u_init.keys()),
+        ):
+            nodes = sorted(n for p, t, n in (k for k in index_map if len(k) == 3) if p == 0 and t == variable_type)
+            sources = [(0, variable_type, min(node + 1, nodes[-1])) for node in nodes]
+            for node, source in zip(nodes, sources):
+                init_destination.append(rows((0, variable_type, node), variables, keys))
+                init_source.append(rows(source, variables, keys))
+            init_per_key[variable_type] = {
+                key: np.stack([rows(source, variables, [key]) for source in sources], axis=1) for key in keys
+            }
+
+        parameters = index_map[("global", "parameters")][0]
+        init_destination.append(np.arange(parameters.start, parameters.stop))
+        init_source.append(np.arange(parameters.start, parameters.stop))
+
+        shift = {
+            "bounds_destination": rows((0, "states", 0), nlp.states, bounds_keys),
+            "bounds_source": rows((0, "states", 1), nlp.states, bounds_keys),
+            "init_destination": np.concatenate(init_destination),
+            "init_source": np.concatenate(init_source),
+            "x_bounds": {key: rows((0, "states", 1), nlp.states, [key]) for key in bounds_keys},
+            "x_init": init_per_key["states"],
+            "u_init": init_per_key["controls"],
+        }
+        self._window_shift = (self.vector_layout, shift)
+        return shift
+
+    def _advance_window_in_place(self, sol: Solution, **advance_options) -> Bool:
+        """
+        Advance the window by writing the shifted solution directly in the cached bounds and initial guess vectors
+        that are sent to the solver, instead of dispatching the whole bounds and initial guess again. The bounds and
+        initial guess objects are still updated (in place, from the same gather) so they stay the reference if the
+        vectors are rebuilt. The solution is therefore never merged, which is what the default advancing methods do
+
+        Returns
+        -------
+        If the window was advanced (otherwise the generic path must be used)
+        """
+
+        if not self._can_advance_window_in_place():
+            return False
+
+        nlp = self.nlp[0]
+        shift = self._window_shift_indices()
+        vector = np.asarray(sol.vector, dtype=float).reshape(-1)
+
+        # The vector is scaled while the bounds and initial guess objects are not
+        for key, index in shift["x_bounds"].items():
+            nlp.x_bounds[key][:, 0] = vector[index] * nlp.x_scaling[key].scaling[:, 0]
+        for key, index in shift["x_init"].items():
+            nlp.x_init[key].init[:, :] = vector[index] * nlp.x_scaling[key].scaling
+        for key, index in shift["u_init"].items():
+            nlp.u_init[key].init[:, :] = vector[index] * nlp.u_scaling[key].scaling
+        self.advance_window_initial_guess_parameters(sol, **advance_options)
+
+        min_bounds, max_bounds = self._cached_vectors["bounds_vectors"]
+        min_bounds[shift["bounds_destination"], 0] = vector[shift["bounds_source"]]
+        max_bounds[shift["bounds_destination"], 0] = vector[shift["bounds_source"]]
+        self._cached_vectors["init_vector"][shift["init_destination"], 0] = vector[shift["init_source"]]
+        return True
+
     def advance_window_bounds_states(self, sol: Solution, **advance_options) -> Bool:
         states = sol.decision_states(to_merge=SolutionMerge.NODES)
 
@@ -0,0 +1,259 @@
+import json
+import os
+
+import numpy as np
+
+from .solution_data import SolutionData, SolutionMerge
+from ...misc.parameters_types import AnyDict, AnyList, Bool, Int, NpArray, Str, StrOptional
+
+ARCHIVE_FORMAT_VERSION = 1
+ARCHIVE_METADATA_FILE = "metadata.json"
+
+
+def save_archive(path: Str, arrays: AnyDict, metadata: AnyDict) -> None:
+    """
+    Write a solution archive, that is a folder with one .npy file per array (so they can be memory-mapped) and a json
+    file for the metadata
+
+    Parameters
+    ----------
+    path: str
+        The folder to save to
+    arrays: dict
+        The arrays to save (None values are skipped)
+    metadata: dict
+        The metadata (made of built-in types only)
+    """
+
+    os.makedirs(path, exist_ok=True)
+    saved = []
+    for name, value in arrays.items():
+        if value is None:
+            continue
+        np.save(os.path.join(path, f"{name}.npy"), np.asarray(value, dtype=float))
+        saved.append(name)
+
+    metadata = {"format_version": ARCHIVE_FORMAT_VERSION, "arrays": saved, **metadata}
+    with open(os.path.join(path, ARCHIVE_METADATA_FILE), "w") as file:
+        json.dump(metadata, file)
+
+
+class LoadedSolution:
+    """
+    A solution reloaded from an archive (see Solution.save) without the ocp. The arrays are memory-mapped, so only the
+    values which are actually requested are read from the disk
+
+    Attributes
+    ----------
+    path: str
+        The folder of the archive
+    metadata: dict
+        The metadata of the archive (layout of the vector, number of nodes, solver stats and versions)
+    vector: np.ndarray
+        The vector of the decision variables
+    constraints: np.ndarray
+        The values of the constraints
+    lam_g: np.ndarray
+        The Lagrange multipliers of the constraints
+    lam_p: np.ndarray
+        The Lagrange multipliers of the parameters
+    lam_x: np.ndarray
+        The Lagrange multipliers of the decision variables
+    inf_pr: np.ndarray
+        The unscaled constraint violation at each iteration
+    inf_du: np.ndarray
+        The scaled dual infeasibility at each iteration
+    phases_dt: np.ndarray
+        The time step of each phase
+    cost: float
+        The value of the cost function
+    status: int
+        Optimization success status (Ipopt: 0=Succeeded, 1=Failed)
+    iterations: int
+        The number of iterations that were required to solve the program
+    solver_time_to_optimize: float
+        The time spent in the solver
+    real_time_to_optimize: float
+        The total time to solve the program
+    n_phases: int
+        The number of phases
+
+    Methods
+    -------
+    load(path: str, mmap_mode: str = "r") -> LoadedSolution
+        Load a solution archive
+    stepwise_time(self) -> list
+        The time of the steps of each node
+    decision_states(self, scaled: bool = False, to_merge: SolutionMerge | list[SolutionMerge] = None)
+        Returns the decision states
+    stepwise_controls(self, scaled: bool = False, to_merge: SolutionMerge | list[SolutionMerge] = None)
+        Returns the controls
+    decision_algebraic_states(self, scaled: bool = False, to_merge: SolutionMerge | list[SolutionMerge] = None)
+        Returns the decision algebraic_states
+    decision_parameters(self, scaled: bool = False) -> dict
+        Returns the decision parameters
+    get(self, variable_type: str, key: str, phase: int = 0, scaled: bool = False) -> np.ndarray
+        Read only one key of one phase
+    """
+
+    def __init__(self, path: Str, metadata: AnyDict, arrays: AnyDict):
+        """
+        Parameters
+        ----------
+        path: str
+            The folder of the archive
+        metadata: dict
+            The metadata of the archive
+        arrays: dict
+            The (memory-mapped) arrays of the archive
+        """
+
+        self.path = path
+        self.metadata = metadata
+
+        self.vector = arrays.get("vector")
+        self.constraints = arrays.get("constraints")
+        self.lam_g = arrays.get("lam_g")
+        self.lam_p = arrays.get("lam_p")
+        self.lam_x = arrays.get("lam_x")
+        self.inf_pr = arrays.get("inf_pr")
+        self.inf_du = arrays.get("inf_du")
+        self.phases_dt = arrays.get("phases_dt")
+        self._times = arrays.get("times")
+
+        stats = metadata["stats"]
+        self.cost = stats["cost"]
+        self.status = stats["status"]
+        self.iterations = stats["iterations"]
+        self.solver_time_to_optimize = stats["solver_time_to_optimize"]
+        self.real_time_to_optimize = stats["real_time_to_optimize"]
+        self.n_phases = len(metadata["n_nodes"])
+
+        self._data = {}
+
+    @classmethod
+    def load(cls, path: Str, mmap_mode: StrOptional = "r") -> "LoadedSolution":
+        """
+        Load a solution archive
+
+        Parameters
+        ----------
+        path: str
+            The folder of the archive
+        mmap_mode: str
+            The memory-map mode of the arrays (see numpy.load). None reads them fully
+
+        Returns
+        -------
+        The loaded solution
+        """
+
+        metadata = read_archive_metadata(path)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode) for name in metadata["arrays"]}
+        return cls(path, metadata, arrays)
+
+    def _solution_data(self, variable_type: Str) -> SolutionData:
+        if variable_type not in self._data:
+            self._data[variable_type] = SolutionData.from_layout(
+                self.vector, self.metadata["layout"][variable_type], self.metadata["n_nodes"]
+            )
+        return self._data[variable_type]
+
+    def _to_dict(self, variable_type: Str, scaled: Bool, to_merge: SolutionMerge | list[SolutionMerge]):
+        data = self._solution_data(variable_type).to_dict(to_merge=to_merge, scaled=scaled)
+        if not isinstance(data, list):
+            return data
+        return data if len(data) > 1 else data[0]
+
+    def stepwise_time(self) -> AnyList:
+        """
+        The time of the steps of each node, as [phase][node], relative to the beginning of the phase
+        """
+
+        out = []
+        offset = 0
+        for phase_sizes in self.metadata["times_sizes"]:
+            phase_times = []
+            for size in phase_sizes:
+                phase_times.append(np.array(self._times[offset : offset + size]).reshape(-1, 1))
+                offset += size
+            out.append(phase_times)
+        return out if len(out) > 1 else out[0]
+
+    def decision_states(self, scaled: Bool = False, to_merge: SolutionMerge | list[SolutionMerge] = None):
+        """
+        Returns the decision states (see Solution.decision_states)
+        """
+        return self._to_dict("x", scaled, to_merge)
+
+    def stepwise_controls(self, scaled: Bool = False, to_merge: SolutionMerge | list[SolutionMerge] = None):
+        """
+        Returns the controls (see Solution.stepwise_controls)
+        """
+        return self._to_dict("u", scaled, to_merge)
+
+    def decision_algebraic_states(self, scaled: Bool = False, to_merge: SolutionMerge | list[SolutionMerge] = None):
+        """
+        Returns the decision algebraic_states (see Solution.decision_algebraic_states)
+        """
+        return self._to_dict("a", scaled, to_merge)
+
+    def decision_parameters(self, scaled: Bool = False) -> AnyDict:
+        """
+        Returns the decision parameters (see Solution.decision_parameters)
+        """
+        data = self._solution_data("p").to_dict(scaled=scaled)[0]
+        return {key: data[key][0][:, 0] for key in data.keys()}
+
+    def get(self, variable_type: Str, key: Str, phase: Int = 0, scaled: Bool = False) -> NpArray:
+        """
+        Read only one key of one phase, the rest of the archive is left on the disk
+
+        Parameters
+        ----------
+        variable_type: str
+            The type of variable (x for states, u for controls, a for algebraic states, p for parameters)
+        key: str
+            The name of the variable
+        phase: int
+            The phase of the variable
+        scaled: bool
+            If the values should be scaled (as the solver received them) or not
+
+        Returns
+        -------
+        The values of all the nodes stacked horizontally
+        """
+
+        if variable_type not in self.metadata["layout"]:
+            raise ValueError(f"variable_type must be one of {list(self.metadata['layout'].keys())}")
+        data = self._solution_data(variable_type)
+        data = data.scaled if scaled else data.unscaled
+        if phase >= len(data):
+            raise ValueError(f"The archive only has {len(data)} phase(s)")
+        return np.concatenate(list(data[phase][key]), axis=1)
+
+
+def read_archive_metadata(path: Str) -> AnyDict:
+    """
+    Read the metadata of a solution archive
+
+    Parameters
+    ----------
+    path: str
+        The folder of the archive
+
+    Returns
+    -------
+    The metadata
+    """
+
+    with open(os.path.join(path, ARCHIVE_METADATA_FILE), "r") as file:
+        metadata = json.load(file)
+
+    if metadata.get("format_version") != ARCHIVE_FORMAT_VERSION:
+        raise RuntimeError(
+            f"The solution archive format {metadata.get('format_version')} is not supported "
+            f"(expected {ARCHIVE_FORMAT_VERSION})"
+        )
+    return metadata
@@ -1,15 +1,16 @@
 from copy import deepcopy
 from typing import Any
 
-from casadi import vertcat, DM, Function
+from casadi import vertcat, horzcat, DM, Function
 from matplotlib import pyplot as plt
 import numpy as np
 from scipy import interpolate as sci_interp
 
-from .solution_data import SolutionData, SolutionMerge, TimeAlignment, TimeResolution
+from .loaded_solution import LoadedSolution, save_archive
+from .solution_data import SolutionData, SolutionMerge, TimeAlignment, TimeResolution, vector_data_layout
 from ..optimization_vector import OptimizationVectorHelper
 from ...dynamics.ode_solvers import OdeSolver
-from ...interfaces.solve_ivp_interface import solve_ivp_interface
+from ...interfaces.solve_ivp_interface import solve_ivp_interface, solve_ivp_batch_interface
 from ...limits.path_conditions import InitialGuess, InitialGuessList
 from ...limits.penalty_helpers import PenaltyHelpers
 from ...limits.penalty_option import PenaltyOption
@@ -34,6 +35,7 @@ from ...misc.parameters_types import (
     AnyListOptional,
     AnyDict,
     AnyTuple,
+    DoubleIntTuple,
     FloatTuple,
     AnyIterable,
     NpArray,
@@ -84,11 +86,19 @@ class Solution:
         The data structure that holds the algebraic_states variables
     phases_dt: list
         The time step for each phases
+    _merged_penalty_data: tuple
+        The scaled states, controls and algebraic_states merged by keys, shared by all the penalty evaluations
+    _interpolants: dict
+        The interpolants of the stepwise states, for each (scaled, merge_phases) requested
 
     Methods
     -------
     copy(self, skip_data: bool = False) -> Any
         Create a deepcopy of the Solution
+    save(self, path: str)
+        Save the solution to an archive which can be memory-mapped and partially loaded
+    load(path: str, ocp: OptimalControlProgram = None, mmap_mode: str = "r") -> Solution | LoadedSolution
+        Load a solution archive previously saved with Solution.save
     @property
     controls(self) -> list | dict
         Returns the controls scaled and unscaled in list if more than one phases, otherwise it returns the only dict
@@ -97,6 +107,8 @@ class Solution:
         Integrate the states unscaled
     interpolate(self, n_frames: int | list | tuple) -> Solution
         Interpolate the states unscaled
+    interpolant(self, scaled: bool = False, merge_phases: bool = True) -> interp1d | list[interp1d]
+        The interpolant of the states, which can be evaluated at any time
     merge_phases(self) -> Solution
         Get a data structure where all the phases are merged into one
     _merge_phases(self, skip_states: bool = False, skip_controls: bool = False) -> tuple
@@ -165,6 +177,8 @@ class Solution:
 
         # Penalties
         self._cost, self._detailed_cost, self.constraints = cost, None, constraints
+        self._merged_penalty_data = None
+        self._interpolants = {}
 
         # Solver options
         self.status, self.iterations = status, iterations
@@ -183,13 +197,11 @@ class Solution:
             self.phases_dt = OptimizationVectorHelper.extract_phase_dt(ocp, vector)
             self._stepwise_times = OptimizationVectorHelper.extract_step_times(ocp, vector)
 
-            x, u, p, a = self.ocp.vector_layout.unstack_to_dicts(vector)
-            u = OptimizationVectorHelper.control_duplication(u, ocp.nlp)
-
-            self._decision_states = SolutionData.from_scaled(ocp, x, "x")
-            self._stepwise_controls = SolutionData.from_scaled(ocp, u, "u")
-            self._parameters = SolutionData.from_scaled(ocp, p, "p")
-            self._decision_algebraic_states = SolutionData.from_scaled(ocp, a, "a")
+            # The data are lazy views of the vector, they are only extracted (and unscaled) when they are requested
+            self._decision_states = SolutionData.from_vector(ocp, vector, "x")
+            self._stepwise_controls = SolutionData.from_vector(ocp, vector, "u")
+            self._parameters = SolutionData.from_vector(ocp, vector, "p")
+            self._decision_algebraic_states = SolutionData.from_vector(ocp, vector, "a")
 
     @classmethod
     def from_dict(cls, ocp: "OptimalControlProgram", sol: AnyDict):
@@ -461,8 +473,13 @@ class Solution:
         if to_merge is None or isinstance(to_merge, SolutionMerge):
             to_merge = [to_merge]
 
-        # Make sure to not return internal structure
-        times_tp = deepcopy(self._stepwise_times)
+        # Make sure to not return internal structure (merging the nodes already creates new arrays, so only the lists
+        # must be copied)
+        merge_nodes = SolutionMerge.NODES in to_merge or SolutionMerge.ALL in to_merge
+        if merge_nodes:
+            times_tp = [list(phase_times) for phase_times in self._stepwise_times]
+        else:
+            times_tp = deepcopy(self._stepwise_times)
 
         # Select the appropriate time matrix
         phases_tf = []
@@ -520,17 +537,19 @@ class Solution:
                     if j == len(times[i]) - 1 and i != len(times) - 1:
                         del times[i][j]
 
-        if continuous:
-            for phase_idx, phase_time in enumerate(times):
-                if phase_idx == 0:
-                    continue
-                previous_tf = sum(phases_tf[:phase_idx])
-                times[phase_idx] = [t + previous_tf for t in phase_time]
+        if merge_nodes:
+            # Concatenate the nodes first so the offset of the phase is added once to the whole phase
+            times = [
+                np.concatenate([np.array(t, dtype=float).reshape(-1, 1) for t in phase_time]) for phase_time in times
+            ]
 
-        if SolutionMerge.NODES in to_merge or SolutionMerge.ALL in to_merge:
-            for phase_idx in range(len(times)):
-                np.concatenate((np.concatenate(times[phase_idx][:-1]), times[phase_idx][-1]))
-                times[phase_idx] = np.concatenate((np.concatenate(times[phase_idx][:-1]), times[phase_idx][-1]))
+        if continuous:
+            previous_tf = np.cumsum([float(tf) for tf in phases_tf])
+            for phase_idx in range(1, len(times)):
+                if merge_nodes:
+                    times[phase_idx] = times[phase_idx] + previous_tf[phase_idx - 1]
+                else:
+                    times[phase_idx] = [t + previous_tf[phase_idx - 1] for t in times[phase_idx]]
 
         if (
             SolutionMerge.PHASES in to_merge and SolutionMerge.NODES not in to_merge
@@ -567,9 +586,14 @@ class Solution:
             return data
         return data if len(data) > 1 else data[0]
 
-    def stepwise_states(self, scaled: Bool = False, to_merge: SolutionMerge | list[SolutionMerge] = None):
+    def stepwise_states(
+        self,
+        scaled: Bool = False,
+        to_merge: SolutionMerge | list[SolutionMerge] = None,
+        from_integrator_outputs: Bool = False,
+    ):
         """
-        Returns the stepwise integrated states
+        Returns the stepwise integrated states. They are computed at the first call and cached in the Solution
 
         Parameters
         ----------
@@ -578,6 +602,10 @@ class Solution:
             model needs temps). If you don't know what it means, you probably want the unscaled version.
         to_merge: SolutionMerge | list[SolutionMerge]
             The type of merge to perform. If None, then no merge is performed.
+        from_integrator_outputs: bool
+            If the states should be read from the outputs of the integrators of the continuity constraints (one call
+            of OptimalControlProgram.stepwise_states_functions per phase) instead of reintegrating the solution. Both
+            give the same values, this is only faster when the same ocp produces many solutions (e.g. online plots)
 
         Returns
         -------
@@ -585,7 +613,10 @@ class Solution:
         """
 
         if self._stepwise_states is None:
-            self._integrate_stepwise()
+            if from_integrator_outputs:
+                self._stepwise_states_from_integrator_outputs()
+            else:
+                self._integrate_stepwise()
 
         data = self._stepwise_states.to_dict(to_merge=to_merge, scaled=scaled)
         if not isinstance(data, list):
@@ -738,6 +769,99 @@ class Solution:
             new._parameters = deepcopy(self._parameters)
         return new
 
+    def save(self, path: Str) -> None:
+        """
+        Save the solution to an archive, that is a folder with one .npy file per array (the vector of the decision
+        variables, the constraints, the Lagrange multipliers, the infeasibilities, the phase time steps and the time
+        grid) and a json file describing the layout of the vector and the solver stats. The archive can be reloaded
+        with or without the ocp (see Solution.load), and its arrays are memory-mapped when reloaded
+
+        Parameters
+        ----------
+        path: str
+            The folder to save to
+        """
+
+        if self.vector is None:
+            raise RuntimeError("Only a solution holding a vector of the decision variables can be saved")
+
+        times = [
+            [np.array(node_times, dtype=float).reshape(-1) for node_times in phase] for phase in self._stepwise_times
+        ]
+        arrays = {
+            "vector": self.vector,
+            "constraints": self.constraints,
+            "lam_g": self.lam_g,
+            "lam_p": self.lam_p,
+            "lam_x": self.lam_x,
+            "inf_pr": self.inf_pr,
+            "inf_du": self.inf_du,
+            "phases_dt": np.array(self.phases_dt, dtype=float).reshape(-1),
+            "times": np.concatenate([node_times for phase in times for node_times in phase]),
+        }
+
+        metadata = {
+            "version": self.ocp.version,
+            "n_nodes": [nlp.n_states_nodes for nlp in self.ocp.nlp],
+            "layout": {variable_type: vector_data_layout(self.ocp, variable_type) for variable_type in "xuap"},
+            "times_sizes": [[int(node_times.shape[0]) for node_times in phase] for phase in times],
+            "stats": {
+                "cost": _optional_float(self._cost),
+                "status": None if self.status is None else int(self.status),
+                "iterations": None if self.iterations is None else int(self.iterations),
+                "solver_time_to_optimize": _optional_float(self.solver_time_to_optimize),
+                "real_time_to_optimize": _optional_float(self.real_time_to_optimize),
+            },
+        }
+        save_archive(path, arrays, metadata)
+
+    @staticmethod
+    def load(
+        path: Str, ocp: "OptimalControlProgram" = None, mmap_mode: StrOptional = "r"
+    ) -> "Solution | LoadedSolution":
+        """
+        Load a solution archive previously saved with Solution.save
+
+        Parameters
+        ----------
+        path: str
+            The folder of the archive
+        ocp: OptimalControlProgram
+            The ocp the solution was computed with. If None, a LoadedSolution is returned, which gives access to the
+            data of the archive without deserializing nor rebuilding the ocp
+        mmap_mode: str
+            The memory-map mode of the arrays (see numpy.load). None reads them fully
+
+        Returns
+        -------
+        A Solution if ocp is provided, a LoadedSolution otherwise
+        """
+
+        loaded = LoadedSolution.load(path, mmap_mode=mmap_mode)
+        if ocp is None:
+            return loaded
+
+        if loaded.vector.shape[0] != ocp.vector_layout.total_size:
+            raise ValueError(
+                f"The archive holds {loaded.vector.shape[0]} decision variables, but the ocp has "
+                f"{ocp.vector_layout.total_size}"
+            )
+        return Solution(
+            ocp=ocp,
+            vector=loaded.vector.reshape(-1, 1),
+            cost=None if loaded.cost is None else DM(loaded.cost),
+            constraints=loaded.constraints,
+            lam_g=loaded.lam_g,
+            lam_p=loaded.lam_p,
+            lam_x=loaded.lam_x,
+            inf_pr=loaded.inf_pr,
+            inf_du=loaded.inf_du,
+            solver_time_to_optimize=loaded.solver_time_to_optimize,
+            real_time_to_optimize=loaded.real_time_to_optimize,
+            iterations=loaded.iterations,
+            status=loaded.status,
+        )
+
     def _prepare_integrate(self, integrator: SolutionIntegrator) -> AnyTuple:
         """
         Prepare the variables for the states integration and checks if the integrator is compatible with the ocp.
@@ -791,6 +915,8 @@ class Solution:
         to_merge: SolutionMerge | list[SolutionMerge] = None,
         duplicated_times: Bool = True,
         return_time: Bool = False,
+        n_pools: Int = 1,
+        use_processes: Bool = False,
     ) -> Any:
         """
         Create a deepcopy of the Solution
@@ -809,6 +935,13 @@ class Solution:
             Default is True.
         return_time: bool
             If the time vector should be returned, default is False.
+        n_pools: int
+            The number of workers integrating the intervals concurrently with Shooting.MULTIPLE (the intervals of the
+            other shootings depend on each other). With SolutionIntegrator.OCP, the intervals of a phase are integrated
+            with a single call to the integrator mapped over n_pools threads
+        use_processes: bool
+            If the workers of the scipy integrators are processes instead of threads. The scipy integrators call back
+            into python at each step, so threads cannot run them concurrently
 
         Returns
         -------
@@ -841,6 +974,8 @@ class Solution:
                 d=d,
                 p=params,
                 method=integrator,
+                n_pools=n_pools,
+                use_processes=use_processes,
             )
 
             out[p] = {}
@@ -872,9 +1007,32 @@ class Solution:
         integrator: SolutionIntegrator = SolutionIntegrator.OCP,
         to_merge: SolutionMerge | list[SolutionMerge] = None,
         size: Int = 100,
+        n_threads: Int = 1,
+        lockstep: Bool = False,
     ) -> AnyDict | AnyList:
         """
         Integrated the states with different noise values sampled from the covariance matrix.
+        The noises are parameters of the dynamics, so all the samples share the same dynamics function which is mapped
+        across the samples.
+
+        Parameters
+        ----------
+        integrator: SolutionIntegrator
+            Use the ode defined by OCP or use a separate integrator provided by scipy
+        to_merge: SolutionMerge | list[SolutionMerge]
+            The type of merge to perform. If None, then no merge is performed.
+        size: int
+            The number of random samples
+        n_threads: int
+            The number of threads used to evaluate the dynamics of the samples
+        lockstep: bool
+            If the scipy integrators should integrate all the samples as a single system (much faster, but the samples
+            share the same adaptive time steps) instead of one sample at a time. The integrator of the ocp always
+            integrates the samples in lockstep
+
+        Returns
+        -------
+        The integrated states of each sample (n_states, n_steps, size)
         """
         from ...optimization.stochastic_optimal_control_program import StochasticOptimalControlProgram
         from ...interfaces.interface_utils import get_numerical_timeseries
@@ -899,13 +1057,13 @@ class Solution:
             out[p] = {}
             for key in self.ocp.nlp[0].states.keys():
                 out[p][key] = [None] * nlp.n_states_nodes
-                for i_node in range(nlp.ns):
-                    out[p][key][i_node] = np.zeros((len(nlp.states[key].index), n_sub_nodes, size))
-                out[p][key][nlp.ns] = np.zeros((len(nlp.states[key].index), 1, size))
 
         cov_matrix = StochasticBioModel.reshape_to_matrix(u[0][0][cov_index, 0], self.ocp.nlp[0].model.matrix_shape_cov)
         first_x = np.random.multivariate_normal(x[0][0][:, 0], cov_matrix, size=size).T
         for p, nlp in enumerate(self.ocp.nlp):
+            if len(nlp.extra_dynamics_func) > 1 or len(nlp.extra_dynamics_defects_func) > 1:
+                raise NotImplementedError("Noisy integration is not available for multiple extra dynamics.")
+
             d = []
             for n_idx in range(nlp.ns + 1):
                 d_tp = get_numerical_timeseries(self.ocp, p, n_idx, 0)
@@ -924,66 +1082,36 @@ class Solution:
                 for i in range(len(params[sensory_noise_index])):
                     sensory_noise[i, :] = np.random.normal(0, params[sensory_noise_index[i]], size=(nlp.ns, size))
 
-            without_noise_idx = [
-                i for i in range(len(params)) if i not in motor_noise_index and i not in sensory_noise_index
-            ]
-            parameters_cx = nlp.parameters.cx[without_noise_idx]
-            parameters = params[without_noise_idx]
-            for i_random in range(size):
-                params_this_time = []
-                list_of_dynamics = []
-                for node in range(nlp.ns):
-                    params_this_time += [nlp.parameters.cx]
-                    params_this_time[node][motor_noise_index, :] = motor_noise[:, node, i_random]
-                    if sensory_noise_index is not None:
-                        params_this_time[node][sensory_noise_index, :] = sensory_noise[:, node, i_random]
-
-                    if len(nlp.extra_dynamics_func) > 1 or len(nlp.extra_dynamics_defects_func) > 1:
-                        raise NotImplementedError("Noisy integration is not available for multiple extra dynamics.")
-                    cas_func = Function(
-                        "noised_extra_dynamics",
-                        [
-                            nlp.time_cx,
-                            nlp.states.cx,
-                            nlp.controls.cx,
-                            parameters_cx,
-                            nlp.algebraic_states.cx,
-                            nlp.numerical_timeseries.cx,
-                        ],
-                        [
-                            nlp.extra_dynamics_func[0](
-                                nlp.time_cx,
-                                nlp.states.cx,
-                                nlp.controls.cx,
-                                params_this_time[node],
-                                nlp.algebraic_states.cx,
-                                nlp.numerical_timeseries.cx,
-                            )
-                        ],
+            # The noises are parameters of the dynamics, each sample gets its own column of parameters
+            noised_params = []
+            for node in range(nlp.ns):
+                params_this_node = np.repeat(np.reshape(params, (-1, 1)), size, axis=1)
+                params_this_node[motor_noise_index, :] = motor_noise[:, node, :]
+                if sensory_noise_index is not None:
+                    params_this_node[sensory_noise_index, :] = sensory_noise[:, node, :]
+                noised_params += [params_this_node]
+
+            integrated_sol = solve_ivp_batch_interface(
+                dynamics_func=nlp.extra_dynamics_func[0],
+                nlp=nlp,
+                t=t_spans[p],
+                x0=first_x,
+                u=u[p],  # No need to add noise on the controls, the extra_dynamics should do it for us
+                p=noised_params,
+                a=a[p],
+                d=d,
+                method=integrator,
+                n_threads=n_threads,
+                lockstep=lockstep,
+            )
+            for i_node in range(nlp.ns + 1):
+                for key in nlp.states.keys():
+                    out[p][key][i_node] = (
+                        integrated_sol[i_node][nlp.states[key].index, :, :]
+                        if n_sub_nodes > 1
+                        else integrated_sol[i_node][nlp.states[key].index, :1, :]
                     )
-                    list_of_dynamics += [cas_func]
-
-                integrated_sol = solve_ivp_interface(
-                    list_of_dynamics=list_of_dynamics,
-                    shooting_type=Shooting.SINGLE,
-                    nlp=nlp,
-                    t=t_spans[p],
-                    x=[np.reshape(first_x[:, i_random], (-1, 1))],
-                    u=u[p],  # No need to add noise on the controls, the extra_dynamics should do it for us
-                    a=a[p],
-                    p=parameters,
-                    d=d,
-                    method=integrator,
-                )
-                for i_node in range(nlp.ns + 1):
-                    for key in nlp.states.keys():
-                        states_integrated = (
-                            integrated_sol[i_node][nlp.states[key].index, :]
-                            if n_sub_nodes > 1
-                            else integrated_sol[i_node][nlp.states[key].index, 0].reshape(-1, 1)
-                        )
-                        out[p][key][i_node][:, :, i_random] = states_integrated
-                first_x[:, i_random] = np.reshape(integrated_sol[-1], (-1,))
+            first_x = integrated_sol[-1][:, 0, :]
         if to_merge:
             out = SolutionData.from_unscaled(self.ocp, out, "x").to_dict(to_merge=to_merge, scaled=False)
 
@@ -1076,6 +1204,29 @@ class Solution:
 
         return [(integrated_states[-1] if shooting_type == Shooting.SINGLE else decision_states[phase_idx][0]) + dx]
 
+    def _stepwise_states_from_integrator_outputs(self) -> None:
+        """
+        Get the stepwise states by evaluating the xall outputs of the integrators of the continuity constraints on the
+        vector of the decision variables (see OptimalControlProgram.stepwise_states_functions)
+        """
+        from ...interfaces.interface_utils import get_numerical_timeseries
+
+        unscaled: list = [None] * len(self.ocp.nlp)
+        for p, (nlp, stepwise_states_function) in enumerate(zip(self.ocp.nlp, self.ocp.stepwise_states_functions)):
+            d = [get_numerical_timeseries(self.ocp, p, n_idx, 0) for n_idx in range(nlp.ns + 1)]
+            d = horzcat(*[DM(d_tp) for d_tp in d]) if d[0].shape != (0, 0) else np.zeros((0, nlp.ns + 1))
+
+            integrated_sol = [np.array(value) for value in stepwise_states_function(self.vector, d)]
+
+            unscaled[p] = {}
+            for key in nlp.states.keys():
+                unscaled[p][key] = [None] * nlp.n_states_nodes
+                for ns, sol_ns in enumerate(integrated_sol):
+                    unscaled[p][key][ns] = sol_ns[nlp.states[key].index, :]
+
+        self._stepwise_states = SolutionData.from_unscaled(self.ocp, unscaled, "x")
+        self._interpolants = {}
+
     def _integrate_stepwise(self) -> None:
         """
         This method integrate to stepwise level the states. That is the states that are used in the dynamics and
@@ -1126,6 +1277,7 @@ class Solution:
                     unscaled[p][key][ns] = sol_ns[nlp.states[key].index, :]
 
         self._stepwise_states = SolutionData.from_unscaled(self.ocp, unscaled, "x")
+        self._interpolants = {}
 
     def _return_time_vector(
         self, to_merge: SolutionMerge | list[SolutionMerge], duplicated_times: Bool
@@ -1175,48 +1327,76 @@ class Solution:
         A Solution data structure with the states integrated. The controls are removed from this structure
         """
 
-        if self._stepwise_states is None:
-            self._integrate_stepwise()
-
-        # Get the states, but do not bother the duplicates now
         if isinstance(n_frames, int):  # So merge phases
-            t_all = [self.stepwise_time(to_merge=[SolutionMerge.ALL])]
-            states = [self._stepwise_states.to_dict(scaled=scaled, to_merge=SolutionMerge.ALL)]
+            interpolants = self._get_interpolants(scaled=scaled, merge_phases=True)
             n_frames = [n_frames]
 
-        elif not isinstance(n_frames, (list, tuple)) or len(n_frames) != len(self._stepwise_states.unscaled):
+        elif not isinstance(n_frames, (list, tuple)) or len(n_frames) != len(self.ocp.nlp):
             raise ValueError(
                 "n_frames should either be an int to merge_phases phases "
                 "or a list of int of the number of phases dimension"
             )
 
         else:
-            t_all = self.stepwise_time(to_merge=[SolutionMerge.NODES])
-            if len(self.ocp.nlp) == 1:
-                t_all = [t_all]
-            states = self._stepwise_states.to_dict(scaled=scaled, to_merge=[SolutionMerge.KEYS, SolutionMerge.NODES])
+            interpolants = self._get_interpolants(scaled=scaled, merge_phases=False)
 
         data = []
-        for p in range(len(states)):
-            data.append({})
-
+        for p, interpolant in enumerate(interpolants):
             nlp = self.ocp.nlp[p]
+            x_interpolated = interpolant(np.linspace(interpolant.x[0], interpolant.x[-1], n_frames[p]))
+            data.append({key: x_interpolated[nlp.states[key].index, :] for key in nlp.states.keys()})
 
-            # Now remove the duplicates
-            t_round = np.round(t_all[p], decimals=8)  # Otherwise, there are some numerical issues with np.unique
-            t, idx = np.unique(t_round, return_index=True)
-            x = states[p][:, idx]
+        return data if len(data) > 1 else data[0]
 
-            x_interpolated = np.ndarray((x.shape[0], n_frames[p]))
-            t_interpolated = np.linspace(t_round[0], t_round[-1], n_frames[p])
-            for j in range(x.shape[0]):
-                s = sci_interp.splrep(t, x[j, :], k=1)
-                x_interpolated[j, :] = sci_interp.splev(t_interpolated, s)[:, 0]
+    def interpolant(self, scaled: Bool = False, merge_phases: Bool = True) -> Any:
+        """
+        The linear interpolant of the states with respect to time. It is built once (for all the states at once) and
+        kept, so it can be evaluated at any number of time points, e.g. to resample the solution to several number of
+        frames, without being rebuilt
 
-            for key in nlp.states.keys():
-                data[p][key] = x_interpolated[nlp.states[key].index, :]
+        Parameters
+        ----------
+        scaled: bool
+            If the states should be scaled or not (see interpolate)
+        merge_phases: bool
+            If the phases should be merged into one interpolant, otherwise there is one interpolant per phase (the
+            time is continuous throughout the whole ocp in both cases)
 
-        return data if len(data) > 1 else data[0]
+        Returns
+        -------
+        The interpolant (scipy.interpolate.interp1d) of each phase, which returns the states (rows ordered as
+        nlp.states) at each requested time (columns)
+        """
+
+        interpolants = self._get_interpolants(scaled=scaled, merge_phases=merge_phases)
+        return interpolants if len(interpolants) > 1 else interpolants[0]
+
+    def _get_interpolants(self, scaled: Bool, merge_phases: Bool) -> list:
+        if self._stepwise_states is None:
+            self._integrate_stepwise()
+
+        if (scaled, merge_phases) in self._interpolants:
+            return self._interpolants[(scaled, merge_phases)]
+
+        # Get the states, but do not bother the duplicates now
+        if merge_phases:
+            t_all = [self.stepwise_time(to_merge=[SolutionMerge.ALL])]
+            states = [self._stepwise_states.to_dict(scaled=scaled, to_merge=SolutionMerge.ALL)]
+        else:
+            t_all = self.stepwise_time(to_merge=[SolutionMerge.NODES])
+            if len(self.ocp.nlp) == 1:
+                t_all = [t_all]
+            states = self._stepwise_states.to_dict(scaled=scaled, to_merge=[SolutionMerge.KEYS, SolutionMerge.NODES])
+
+        interpolants = []
+        for t, x in zip(t_all, states):
+            # Now remove the duplicates
+            t_round = np.round(t, decimals=8)  # Otherwise, there are some numerical issues with np.unique
+            t_unique, idx = np.unique(t_round, return_index=True)
+            interpolants.append(sci_interp.interp1d(t_unique, x[:, idx], kind="linear", axis=1, assume_sorted=True))
+
+        self._interpolants[(scaled, merge_phases)] = interpolants
+        return interpolants
 
     def graphs(
         self,
@@ -1320,20 +1500,34 @@ class Solution:
         else:
             return np.ndarray((0, 1))
 
+    def _get_merged_penalty_data(self) -> AnyTuple:
+        """
+        The scaled states, controls and algebraic_states merged by keys. They are computed once and shared by all the
+        penalties
+
+        Returns
+        -------
+        The merged states, controls and algebraic_states
+        """
+
+        if self._merged_penalty_data is None:
+            self._merged_penalty_data = (
+                self._decision_states.to_dict(to_merge=SolutionMerge.KEYS, scaled=True),
+                self._stepwise_controls.to_dict(to_merge=SolutionMerge.KEYS, scaled=True),
+                self._decision_algebraic_states.to_dict(to_merge=SolutionMerge.KEYS, scaled=True),
+            )
+        return self._merged_penalty_data
+
     def _get_penalty_cost(self, penalty: PenaltyOption) -> FloatTuple:
         from ...interfaces.interface_utils import get_numerical_timeseries
 
-        val = []
-        val_weighted = []
-
         phases_dt = PenaltyHelpers.phases_dt(penalty, self.ocp, lambda p: np.array([self.phases_dt[idx] for idx in p]))
         params = PenaltyHelpers.parameters(
             penalty, 0, lambda p_idx, n_idx, sn_idx: self._dispatch_params(self._parameters.scaled[0])
         )
 
-        merged_x = self._decision_states.to_dict(to_merge=SolutionMerge.KEYS, scaled=True)
-        merged_u = self._stepwise_controls.to_dict(to_merge=SolutionMerge.KEYS, scaled=True)
-        merged_a = self._decision_algebraic_states.to_dict(to_merge=SolutionMerge.KEYS, scaled=True)
+        merged_x, merged_u, merged_a = self._get_merged_penalty_data()
+        inputs = []
         for idx in range(len(penalty.node_idx)):
             t0 = PenaltyHelpers.t0(penalty, idx, lambda p_idx, n_idx: self._stepwise_times[p_idx][n_idx][0])
             x = PenaltyHelpers.states(
@@ -1360,22 +1554,79 @@ class Solution:
 
             weight = PenaltyHelpers.weight(penalty, idx)
             target = PenaltyHelpers.target(penalty, idx)
+            inputs.append((t0, x, u, a, d, weight, target))
+
+        # The nodes whose inputs match the dimensions of the penalty are evaluated together by a single call of the
+        # mapped penalty. The others (or all of them if the penalty cannot be mapped) are evaluated node by node
+        mapped_indices = []
+        if penalty.is_mappable:
+            fcn = penalty.weighted_function_non_threaded[penalty.node_idx[0]]
+            input_idx = (0, 2, 3, 5, 6, 7, 8)  # t, x, u, a, d, weight, target
+            shapes = [fcn.size_in(i) for i in input_idx]
+            for idx, node_inputs in enumerate(inputs):
+                if all(np.size(value) == shape[0] * shape[1] for value, shape in zip(node_inputs, shapes)):
+                    mapped_indices.append(idx)
+        if len(mapped_indices) < 2:
+            mapped_indices = []
+        mapped_indices_set = set(mapped_indices)
 
+        val = []
+        val_weighted = []
+        if mapped_indices:
+            n = len(mapped_indices)
+            t0, x, u, a, d, weight, target = (
+                self._stack_penalty_inputs([inputs[idx][i] for idx in mapped_indices], shape)
+                for i, shape in enumerate(shapes)
+            )
+            node_idx = penalty.node_idx[0]
+            mapped_val = penalty.function_non_threaded[node_idx].map(n)(t0, phases_dt, x, u, params, a, d)
+            mapped_val_weighted = penalty.weighted_function_non_threaded[node_idx].map(n)(
+                t0, phases_dt, x, u, params, a, d, weight, target
+            )
+            val.extend(np.hsplit(np.array(mapped_val), n))
+            val_weighted.extend(np.hsplit(np.array(mapped_val_weighted), n))
+
+        for idx, (t0, x, u, a, d, weight, target) in enumerate(inputs):
+            if idx in mapped_indices_set:
+                continue
             node_idx = penalty.node_idx[idx]
-            val.append(penalty.function_non_threaded[node_idx](t0, phases_dt, x, u, params, a, d))
+            val.append(np.array(penalty.function_non_threaded[node_idx](t0, phases_dt, x, u, params, a, d)))
             val_weighted.append(
-                penalty.weighted_function_non_threaded[node_idx](t0, phases_dt, x, u, params, a, d, weight, target)
+                np.array(
+                    penalty.weighted_function_non_threaded[node_idx](t0, phases_dt, x, u, params, a, d, weight, target)
+                )
             )
 
         if self.ocp.n_threads > 1:
             val = [v[:, 0] for v in val]
             val_weighted = [v[:, 0] for v in val_weighted]
 
-        val = np.nansum(val)
-        val_weighted = np.nansum(val_weighted)
+        val = np.nansum([np.nansum(v) for v in val])
+        val_weighted = np.nansum([np.nansum(v) for v in val_weighted])
 
         return val, val_weighted
 
+    @staticmethod
+    def _stack_penalty_inputs(values: AnyList, shape: DoubleIntTuple) -> NpArray:
+        """
+        Stack the inputs of a penalty at several nodes side by side so they can be sent to the mapped penalty
+
+        Parameters
+        ----------
+        values: list
+            The value of one input of the penalty at each node
+        shape: tuple[int, int]
+            The dimensions of that input in the penalty function
+
+        Returns
+        -------
+        The horizontally stacked values
+        """
+
+        if shape[0] * shape[1] == 0:
+            return np.array([])
+        return np.hstack([np.reshape(np.array(value, dtype=float), shape, order="F") for value in values])
+
     @staticmethod
     def _get_x(ocp, penalty, phase_idx, node_idx, subnodes_idx, merged_x):
         values = merged_x[phase_idx]
@@ -1534,3 +1785,7 @@ class Solution:
             self.print_cost(CostType.CONSTRAINTS)
         else:
             raise ValueError("print can only be called with CostType.OBJECTIVES or CostType.CONSTRAINTS")
+
+
+def _optional_float(value) -> FloatOptional:
+    return None if value is None else float(value)
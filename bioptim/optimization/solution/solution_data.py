@@ -1,4 +1,6 @@
+from collections.abc import Mapping, Sequence
 from enum import Enum, auto
+
 import numpy as np
 from ...misc.parameters_types import (
     Bool,
@@ -7,6 +9,8 @@ from ...misc.parameters_types import (
     IntList,
     AnyList,
     AnyDict,
+    NpArray,
+    Range,
 )
 
 
@@ -71,6 +75,59 @@ class SolutionData:
         n_nodes = [nlp.n_states_nodes for nlp in ocp.nlp]
         return SolutionData(unscaled, _to_scaled_values(unscaled, ocp, variable_type), n_nodes)
 
+    @staticmethod
+    def from_vector(ocp, vector: NpArray, variable_type: Str):
+        """
+        Create a SolutionData that reads its values directly from the vector of the decision variables. The scaled
+        values are views of the vector (nothing is copied until a node is requested) and the unscaled values are
+        computed on demand and cached
+
+        Parameters
+        ----------
+        ocp
+            A reference to the ocp
+        vector: np.ndarray
+            The vector of the decision variables (as sent to the solver), which must not be modified afterward
+        variable_type: str
+            The type of variable to extract (x for states, u for controls, a for algebraic states, p for parameters)
+        """
+        n_nodes = [nlp.n_states_nodes for nlp in ocp.nlp]
+        return SolutionData.from_layout(vector, vector_data_layout(ocp, variable_type), n_nodes)
+
+    @staticmethod
+    def from_layout(vector: NpArray, layout: AnyList, n_nodes: IntList):
+        """
+        Create a SolutionData that reads its values directly from the vector of the decision variables, without
+        needing the ocp (see SolutionData.from_vector)
+
+        Parameters
+        ----------
+        vector: np.ndarray
+            The vector of the decision variables (it can be memory-mapped)
+        layout: list
+            The position of the variables in the vector (see vector_data_layout)
+        n_nodes: list
+            The number of node at each phase
+        """
+        vector = np.asarray(vector, dtype=float).reshape(-1)
+
+        scaled = []
+        unscaled = []
+        for phase_layout in layout:
+            scaled_phase = {}
+            unscaled_phase = {}
+            for key, key_layout in phase_layout.items():
+                blocks = [
+                    [(slice(start, stop), n_cols) for start, stop, n_cols in node_blocks]
+                    for node_blocks in key_layout["blocks"]
+                ]
+                scaled_phase[key] = _NodesView(vector, blocks, key_layout["rows"])
+                unscaled_phase[key] = _NodesView.unscaled(scaled_phase[key], np.array(key_layout["scaling"]))
+            scaled.append(_PhaseView(scaled_phase))
+            unscaled.append(_PhaseView(unscaled_phase))
+
+        return SolutionData(unscaled, scaled, n_nodes)
+
     @staticmethod
     def from_scaled(ocp, scaled: AnyList, variable_type: Str):
         """
@@ -113,7 +170,8 @@ class SolutionData:
             to_merge = [SolutionMerge.KEYS, SolutionMerge.NODES, SolutionMerge.PHASES]
 
         if not to_merge:
-            return data
+            # The lazy views are exposed as the usual dictionaries of lists
+            return [phase.to_dict() if isinstance(phase, _PhaseView) else phase for phase in data]
 
         # Before merging phases, we must go inside the phases
         out = []
@@ -183,6 +241,166 @@ class SolutionData:
         return out
 
 
+class _NodesView(Sequence):
+    """
+    The values of one key at each node of a phase, read from the vector of the decision variables. A node is a view
+    of the vector, unless its value is stacked from several nodes (ControlType.LINEAR_CONTINUOUS) or unscaled, in which
+    case it is computed when first requested and cached
+
+    Attributes
+    ----------
+    vector: np.ndarray
+        The flat vector of the decision variables
+    blocks: list[list[tuple[slice, int]]]
+        The (slice, number of columns) of the blocks of the vector to stack horizontally at each node
+    rows: slice | list
+        The rows of the key in each block
+    source: _NodesView
+        The scaled values to unscale (None if the values are read from the vector)
+    scaling: np.ndarray
+        The scaling of the key (as a column, only used when source is not None)
+    """
+
+    def __init__(self, vector: NpArray, blocks: AnyList, rows: slice | IntList):
+        self.vector = vector
+        self.blocks = blocks
+        if not isinstance(rows, slice):
+            rows = list(rows)
+            if rows and rows == list(range(rows[0], rows[-1] + 1)):
+                rows = slice(rows[0], rows[-1] + 1)  # Basic indexing so the nodes are views of the vector
+        self.rows = rows
+        self.source = None
+        self.scaling = None
+        self._cache = {}
+
+    @classmethod
+    def unscaled(cls, source: "_NodesView", scaling: NpArray) -> "_NodesView":
+        """
+        The unscaled counterpart of scaled values
+
+        Parameters
+        ----------
+        source: _NodesView
+            The scaled values
+        scaling: np.ndarray
+            The scaling of each row of the key
+        """
+
+        out = cls(source.vector, source.blocks, source.rows)
+        out.source = source
+        out.scaling = np.reshape(scaling, (-1, 1))
+        return out
+
+    def __len__(self) -> Int:
+        return len(self.blocks)
+
+    def __getitem__(self, node: Int) -> NpArray:
+        if isinstance(node, slice):
+            return [self[i] for i in range(*node.indices(len(self)))]
+        if node < 0:
+            node += len(self)
+        if not 0 <= node < len(self):
+            raise IndexError("node index out of range")
+
+        if self.source is not None:
+            if node not in self._cache:
+                self._cache[node] = self.source[node] * self.scaling
+            return self._cache[node]
+
+        values = []
+        for block, n_cols in self.blocks[node]:
+            size = block.stop - block.start
+            values.append(self.vector[block].reshape((size // n_cols, n_cols), order="F")[self.rows, :])
+        if len(values) == 1:
+            return values[0]
+
+        if node not in self._cache:
+            self._cache[node] = np.hstack(values)
+        return self._cache[node]
+
+
+class _PhaseView(Mapping):
+    """
+    The lazy values of all the keys of a phase (see _NodesView)
+    """
+
+    def __init__(self, nodes: AnyDict):
+        self._nodes = nodes
+
+    def __getitem__(self, key: Str) -> _NodesView:
+        return self._nodes[key]
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def __len__(self) -> Int:
+        return len(self._nodes)
+
+    def to_dict(self) -> AnyDict:
+        """
+        The values as a dictionary of lists of nodes
+        """
+        return {key: list(nodes) for key, nodes in self._nodes.items()}
+
+
+def vector_data_layout(ocp, variable_type: Str) -> AnyList:
+    """
+    Describe where the values of a type of variable are in the vector of the decision variables. The description only
+    holds built-in types so it can be saved alongside the vector (see Solution.save)
+
+    Parameters
+    ----------
+    ocp
+        A reference to the ocp
+    variable_type: str
+        The type of variable (x for states, u for controls, a for algebraic states, p for parameters)
+
+    Returns
+    -------
+    The layout as [phase][key] = {"blocks": [node][block] = [start, stop, n_cols], "rows": list, "scaling": list}
+    """
+
+    index_map = ocp.vector_layout.index_map
+
+    def describe(node_blocks: AnyList, rows: Range | IntList, scaling) -> AnyDict:
+        return {
+            "blocks": [
+                [[index_map[block][0].start, index_map[block][0].stop, index_map[block][1]] for block in blocks]
+                for blocks in node_blocks
+            ],
+            "rows": [int(row) for row in rows],
+            "scaling": [float(value) for value in scaling.to_array(1)[:, 0]],
+        }
+
+    if variable_type == "p":
+        blocks = [[("global", "parameters")]]
+        return [
+            {
+                key: describe(blocks, ocp.parameters[key].index, ocp.parameters[key].scaling)
+                for key in ocp.parameters.keys()
+            }
+        ]
+
+    from ..optimization_vector import OptimizationVectorHelper
+
+    variable_name = {"x": "states", "u": "controls", "a": "algebraic_states"}[variable_type]
+    if variable_type == "u":
+        sources = OptimizationVectorHelper.control_duplication_sources(ocp.nlp)
+    else:
+        sources = [[[(p, node)] for node in range(nlp.n_states_nodes)] for p, nlp in enumerate(ocp.nlp)]
+
+    layout = []
+    for p, nlp in enumerate(ocp.nlp):
+        variables = getattr(nlp, variable_name)
+        scalings = getattr(nlp, f"{variable_type}_scaling")
+        node_blocks = [
+            [(source_phase, variable_name, source_node) for source_phase, source_node in node_sources]
+            for node_sources in sources[p]
+        ]
+        layout.append({key: describe(node_blocks, variables.key_index(key), scalings[key]) for key in variables.keys()})
+    return layout
+
+
 def _to_unscaled_values(scaled: AnyList, ocp, variable_type: Str) -> AnyList:
     """
     Convert values of scaled solution to unscaled values
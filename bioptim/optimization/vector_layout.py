@@ -155,17 +155,7 @@ class VectorLayout:
         Given flat vector, return dict with same structure as index_map.
         Works for NumPy arrays and CasADi DM.
         """
-        result = {}
-        for i, (key, (sl, n_cols)) in enumerate(self.index_map.items()):
-
-            vec_sliced = vec[sl].toarray() if isinstance(vec[sl], DM) else vec[sl]
-            result[key] = vec_sliced
-
-            v_size = sl.stop - sl.start
-            if v_size != 0:
-                result[key] = result[key].reshape((v_size // n_cols, -1), order="F")
-
-        return result
+        return unstack_from_index_map(self.index_map, vec)
 
     def unstack_to_lists(self, vec):
         """
@@ -286,6 +276,24 @@ class VectorLayout:
                 raise ValueError(f"Unknown key: {key}")
 
 
+def unstack_from_index_map(index_map: dict, vec) -> dict:
+    """
+    Given flat vector and an index map (see VectorLayout.index_map), return dict with same structure as index_map.
+    Works for NumPy arrays and CasADi DM.
+    """
+    result = {}
+    for key, (sl, n_cols) in index_map.items():
+
+        vec_sliced = vec[sl].toarray() if isinstance(vec[sl], DM) else vec[sl]
+        result[key] = vec_sliced
+
+        v_size = sl.stop - sl.start
+        if v_size != 0:
+            result[key] = result[key].reshape((v_size // n_cols, -1), order="F")
+
+    return result
+
+
 def _len_of(shape_like) -> int:
     """Return a single integer length from shape-like (int or tuple)."""
     try:
@@ -81,6 +81,60 @@ def test_plot_check_conditioning_live(phase_dynamics):
     ocp.add_plot_check_conditioning()
 
 
+def test_conditioning_report():
+    from bioptim.examples.getting_started import example_multiphase as ocp_module
+    from bioptim.gui.check_conditioning import (
+        conditioning_report,
+        create_conditioning_plots,
+        evaluate_jacobian_hessian_constraints,
+    )
+
+    bioptim_folder = TestUtils.bioptim_folder()
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/examples/models/cube.bioMod",
+        long_optim=False,
+        expand_dynamics=True,
+    )
+    create_conditioning_plots(ocp)
+
+    jacobian_matrix, jacobian_rank, hess_min_mean_max = evaluate_jacobian_hessian_constraints(ocp.init_vector, ocp)
+    assert jacobian_rank >= np.linalg.matrix_rank(jacobian_matrix.toarray())
+    assert hess_min_mean_max.shape == (jacobian_matrix.shape[0], 3)
+
+    report = conditioning_report(ocp.init_vector, ocp)
+    assert [key for key in report if key[0] == "phase"] == [("phase", 0), ("phase", 1), ("phase", 2)]
+    assert len([key for key in report if key[0] == "node"]) == sum(nlp.ns + 1 for nlp in ocp.nlp)
+    for block in report.values():
+        assert block["jacobian_structural_rank"] <= min(block["n_constraints"], block["n_variables"])
+
+
+def test_plot_check_conditioning_positive_hessian():
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+    from bioptim.gui.check_conditioning import (
+        create_conditioning_plots,
+        evaluate_hessian_objective,
+        update_objective_plot,
+    )
+
+    bioptim_folder = TestUtils.bioptim_folder()
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/examples/models/pendulum.bioMod",
+        final_time=1,
+        n_shooting=10,
+    )
+    create_conditioning_plots(ocp)
+
+    # Only MINIMIZE_CONTROL, so the non-zeros of the hessian are all positive
+    hessian_matrix, _, _ = evaluate_hessian_objective(ocp.init_vector, ocp)
+    assert (hessian_matrix.data[hessian_matrix.data != 0] > 0).all()
+
+    update_objective_plot(ocp.init_vector, ocp)
+    norm = ocp.conditioning_plots["im_objectives_hessian"].norm
+    assert norm.vmin < 0 < norm.vmax
+
+
 @pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
 def test_plot_ipopt_output_live(phase_dynamics):
     if platform.system() == "Windows":
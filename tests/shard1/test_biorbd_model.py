@@ -121,3 +121,61 @@ def test_function_cached():
     marker2 = bio_model.center_of_mass()(bio_model.q, bio_model.parameters)
     assert marker_id2 == id(bio_model._cached_functions[("marker", (), frozenset({("index", 1)}))])
     assert len(bio_model._cached_functions.keys()) == 3
+
+
+def test_function_cached_on_disk(tmp_path):
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    model_path = "/examples/models/pendulum.bioMod"
+    cache_folder = str(tmp_path / "function_cache")
+
+    # First model creates the functions and serializes them
+    bio_model = BiorbdModel(bioptim_folder + model_path, function_cache_folder=cache_folder)
+    q = np.array([0.1, 0.2])
+    com = bio_model.center_of_mass()(q, [])
+    marker = bio_model.marker(index=1)(q, [])
+    assert len(list((tmp_path / "function_cache").iterdir())) == 2
+
+    # A new model built from the same file reloads them from the disk
+    bio_model2 = BiorbdModel(bioptim_folder + model_path, function_cache_folder=cache_folder)
+    npt.assert_almost_equal(bio_model2.center_of_mass()(q, []), com)
+    npt.assert_almost_equal(bio_model2.marker(index=1)(q, []), marker)
+    assert len(list((tmp_path / "function_cache").iterdir())) == 2
+
+    # Other arguments produce other functions
+    bio_model2.marker(index=0)
+    assert len(list((tmp_path / "function_cache").iterdir())) == 3
+
+    # Models that do not match their file only are never cached on the disk
+    bio_model3 = BiorbdModel(biorbd.Model(bioptim_folder + model_path), function_cache_folder=cache_folder)
+    bio_model3.center_of_mass()
+    bio_model3.mass()
+    assert len(list((tmp_path / "function_cache").iterdir())) == 3
+
+
+def test_function_cached_on_disk_subclass(tmp_path):
+    from casadi import Function
+    from bioptim.models.utils import cache_function
+
+    class HeavierBiorbdModel(BiorbdModel):
+        @cache_function
+        def mass(self) -> Function:
+            return Function("mass", [self.parameters], [2 * super().mass()(self.parameters)])
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    model_path = bioptim_folder + "/examples/models/pendulum.bioMod"
+    cache_folder = str(tmp_path / "function_cache")
+
+    mass = float(BiorbdModel(model_path, function_cache_folder=cache_folder).mass()([]))
+    assert len(list((tmp_path / "function_cache").iterdir())) == 1
+
+    # The override does not load the function of the base class from the disk, it serializes its own
+    heavier_mass = float(HeavierBiorbdModel(model_path, function_cache_folder=cache_folder).mass()([]))
+    npt.assert_almost_equal(heavier_mass, 2 * mass)
+    assert len(list((tmp_path / "function_cache").iterdir())) == 2
+
+    # And both are reloaded as they were saved
+    npt.assert_almost_equal(float(BiorbdModel(model_path, function_cache_folder=cache_folder).mass()([])), mass)
+    npt.assert_almost_equal(
+        float(HeavierBiorbdModel(model_path, function_cache_folder=cache_folder).mass()([])), heavier_mass
+    )
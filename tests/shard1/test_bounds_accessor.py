@@ -1,6 +1,6 @@
 import numpy as np
 import numpy.testing as npt
-from bioptim import BoundsList, InterpolationType
+from bioptim import Bounds, BoundsList, InterpolationType
 
 
 def test_accessors_on_bounds_option():
@@ -40,3 +40,26 @@ def test_accessors_on_bounds_option_multidimensional():
         x_bounds["my_key"].max[:],
         np.array([[0, 150, 200], [0, 10, 10], [0, 10, 10], [100, 10, 10], [100, 10, 10], [100, 150, 200]]),
     )
+
+
+def test_bounds_concatenate_many():
+    all_bounds = Bounds("all", interpolation=InterpolationType.CONSTANT)
+    pieces = [
+        Bounds(
+            f"piece_{i}", min_bound=[-i] * (i + 1), max_bound=[i] * (i + 1), interpolation=InterpolationType.CONSTANT
+        )
+        for i in range(4)
+    ]
+    all_bounds.concatenate(*pieces)
+
+    npt.assert_equal(all_bounds.shape, [10, 1])
+    npt.assert_almost_equal(all_bounds.min[:, 0], [0, -1, -1, -2, -2, -2, -3, -3, -3, -3])
+    npt.assert_almost_equal(all_bounds.max[:, 0], [0, 1, 1, 2, 2, 2, 3, 3, 3, 3])
+    assert all_bounds.type == InterpolationType.CONSTANT
+
+    # The pieces are left untouched
+    npt.assert_almost_equal(pieces[1].min[:, 0], [-1, -1])
+
+    # Concatenating nothing is a no-op
+    all_bounds.concatenate()
+    npt.assert_equal(all_bounds.shape, [10, 1])
@@ -1213,3 +1213,59 @@ def test_with_contact_error():
             bioptim_folder + "/examples/models/pendulum.bioMod",
             contact_types=[ContactType.RIGID_EXPLICIT],
         )
+
+
+@pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
+@pytest.mark.parametrize("use_sx", [False, True])
+def test_integrators_are_shared_between_identical_nodes(phase_dynamics, use_sx):
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/examples/models/pendulum.bioMod",
+        final_time=1,
+        n_shooting=10,
+        phase_dynamics=phase_dynamics,
+        use_sx=use_sx,
+    )
+    nlp = ocp.nlp[0]
+
+    # The dynamics is the same at each node, so only one integrator is actually built
+    assert len(nlp.dynamics) == nlp.ns
+    assert len(set(id(integrator) for integrator in nlp.dynamics)) == 1
+
+    # Even though the nodes are built from different symbols, they share the same structure
+    ode_solver = nlp.dynamics_type.ode_solver
+    assert ode_solver.integrator_structural_key(nlp, 0, 0) == ode_solver.integrator_structural_key(nlp, 0, nlp.ns - 1)
+
+
+@pytest.mark.parametrize("control_type", [ControlType.CONSTANT, ControlType.LINEAR_CONTINUOUS])
+def test_one_per_node_dynamics_with_multiple_threads(control_type):
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+    from bioptim import Solver
+
+    bioptim_folder = TestUtils.bioptim_folder()
+
+    solutions = []
+    for n_threads in (1, 2):
+        ocp = ocp_module.prepare_ocp(
+            biorbd_model_path=bioptim_folder + "/examples/models/pendulum.bioMod",
+            final_time=1,
+            n_shooting=10,
+            phase_dynamics=PhaseDynamics.ONE_PER_NODE,
+            control_type=control_type,
+            n_threads=n_threads,
+        )
+
+        # All the nodes share the same integrator, so the continuity is evaluated as a single mapped function
+        continuity = [penalty for penalty in ocp.nlp[0].g_internal if penalty and penalty.name == "STATE_CONTINUITY"]
+        assert len(continuity) == 1
+        assert continuity[0].multi_thread == (n_threads > 1)
+
+        solver = Solver.IPOPT()
+        solver.set_print_level(0)
+        solutions.append(ocp.solve(solver))
+
+    npt.assert_almost_equal(np.array(solutions[1].cost), np.array(solutions[0].cost), decimal=5)
+    npt.assert_almost_equal(solutions[1].vector, solutions[0].vector, decimal=5)
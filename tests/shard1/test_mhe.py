@@ -13,6 +13,8 @@ from bioptim import (
     BoundsList,
     PhaseDynamics,
     SolutionMerge,
+    ExportSink,
+    FileExportSink,
 )
 import numpy as np
 import numpy.testing as npt
@@ -162,3 +164,129 @@ def test_mhe_redim_xbounds_not_implemented(phase_dynamics):
         "CONSTANT or CONSTANT_WITH_FIRST_AND_LAST_DIFFERENT",
     ):
         mhe.solve(update_functions, Solver.IPOPT())
+
+
+def test_file_export_sink(tmp_path):
+    path = str(tmp_path / "frames.bin")
+    sink = FileExportSink(path)
+    sink.clear()
+
+    frames = []
+    for i in range(3):
+        states = {"q": np.random.rand(2, 2), "qdot": np.random.rand(2, 2)}
+        controls = {"tau": np.random.rand(2, 1)}
+        parameters = {"mass": np.array([float(i)])}
+        sink.append(states, controls, parameters)
+        frames.append((states, controls, parameters))
+    final_states = {"q": np.random.rand(2, 1), "qdot": np.random.rand(2, 1)}
+    sink.append_final_states(final_states)
+
+    # The frames are read back from the file, by the same sink or by a new one
+    for reader in (sink, FileExportSink(path)):
+        assert len(reader.states) == 4
+        assert len(reader.controls) == 3
+        assert len(reader.parameters) == 3
+        for i, (states, controls, parameters) in enumerate(frames):
+            npt.assert_almost_equal(reader.states[i]["q"], states["q"])
+            npt.assert_almost_equal(reader.states[i]["qdot"], states["qdot"])
+            npt.assert_almost_equal(reader.controls[i]["tau"], controls["tau"])
+            npt.assert_almost_equal(reader.parameters[i]["mass"], parameters["mass"])
+        npt.assert_almost_equal(reader.states[-1]["q"], final_states["q"])
+
+
+def test_incomplete_export_sink():
+    class ClearOnlyExportSink(ExportSink):
+        def clear(self) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="Can't instantiate abstract class ClearOnlyExportSink"):
+        ClearOnlyExportSink()
+
+
+def test_mhe_export_sink(tmp_path):
+    from bioptim.examples.toy_examples.moving_horizon_estimation import mhe as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    bio_model = TorqueBiorbdModel(bioptim_folder + "/examples/models/cart_pendulum.bioMod")
+
+    nq = bio_model.nb_q
+    torque_max = 5
+    n_frames = 10
+    window_len = 5
+    window_duration = 0.2
+
+    final_time = window_duration / window_len * n_frames
+    target_q, _, _, _ = ocp_module.generate_data(bio_model, final_time, [0, np.pi / 2, 0, 0], torque_max, n_frames, 0)
+    target = ocp_module.states_to_markers(bio_model, target_q)
+
+    def update_functions(mhe, t, _):
+        mhe.update_objectives_target(target=target[:, :, t : t + window_len + 1], list_index=0)
+        return t < n_frames - window_len - 1
+
+    solutions = []
+    for export_sink in (None, FileExportSink(str(tmp_path / "frames.bin"))):
+        mhe = ocp_module.prepare_mhe(
+            bio_model=TorqueBiorbdModel(bioptim_folder + "/examples/models/cart_pendulum.bioMod"),
+            window_len=window_len,
+            window_duration=window_duration,
+            max_torque=torque_max,
+            x_init=np.zeros((nq * 2, window_len + 1)),
+            u_init=np.zeros((nq, window_len)),
+            n_threads=1,
+            expand_dynamics=True,
+        )
+        solutions.append(
+            mhe.solve(update_functions, export_sink=export_sink, **ocp_module.get_solver_options(Solver.IPOPT()))
+        )
+
+    # Streaming the frames to a file gives the same final solution as keeping them in memory
+    in_memory, from_file = solutions
+    for key in ("q", "qdot"):
+        npt.assert_almost_equal(
+            from_file.decision_states(to_merge=SolutionMerge.NODES)[key],
+            in_memory.decision_states(to_merge=SolutionMerge.NODES)[key],
+        )
+    npt.assert_almost_equal(
+        from_file.decision_controls(to_merge=SolutionMerge.NODES)["tau"],
+        in_memory.decision_controls(to_merge=SolutionMerge.NODES)["tau"],
+    )
+
+
+def test_mhe_advance_window_in_place():
+    from bioptim.optimization.optimization_vector import OptimizationVectorHelper
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    bio_model = TorqueBiorbdModel(bioptim_folder + "/examples/models/cart_pendulum.bioMod")
+    nq = bio_model.nb_q
+    ntau = bio_model.nb_tau
+
+    n_cycles = 4
+    window_len = 5
+    window_duration = 0.2
+    x_bounds = BoundsList()
+    x_bounds.add("q", min_bound=-np.ones((nq, 1)), max_bound=np.ones((nq, 1)), interpolation=InterpolationType.CONSTANT)
+    x_bounds.add(
+        "qdot", min_bound=-np.ones((nq, 1)), max_bound=np.ones((nq, 1)), interpolation=InterpolationType.CONSTANT
+    )
+    u_bounds = BoundsList()
+    u_bounds["tau"] = -np.ones((ntau, 1)), np.ones((ntau, 1))
+
+    mhe = MovingHorizonEstimator(bio_model, window_len, window_duration, x_bounds=x_bounds, u_bounds=u_bounds)
+
+    computation_counts = []
+
+    def update_functions(mhe, t, _):
+        if t > 0:
+            # The shifted vectors are the same as if the whole bounds and initial guess were dispatched again
+            v_bounds = OptimizationVectorHelper.bounds_vectors(mhe)
+            npt.assert_almost_equal(mhe.bounds_vectors[0], v_bounds[0])
+            npt.assert_almost_equal(mhe.bounds_vectors[1], v_bounds[1])
+            npt.assert_almost_equal(mhe.init_vector, OptimizationVectorHelper.init_vector(mhe))
+            computation_counts.append(dict(mhe.vectors_computation_count))
+        return t < n_cycles
+
+    mhe.solve(update_functions, Solver.IPOPT())
+
+    # Only the first window changes the type of the bounds and initial guess, the next ones are shifted in place
+    assert computation_counts[1]["bounds_vectors"] == computation_counts[-1]["bounds_vectors"]
+    assert computation_counts[1]["init_vector"] == computation_counts[-1]["init_vector"]
@@ -1808,6 +1808,203 @@ def test_multistart():
     test_memory[f"multistart"] = [building_duration, solving_duration, mem_used]
 
 
+def test_multistart_build_once():
+    from bioptim.examples.getting_started import example_multistart as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    combinatorial_parameters = {
+        "bio_model_path": [bioptim_folder + "/examples/models/pendulum.bioMod"],
+        "final_time": [1],
+        "n_shooting": [5, 10],
+        "seed": [2, 1],
+    }
+
+    results = []
+    for build_once in (False, True):
+        save_folder = f"./Solutions_test_folder_build_once_{build_once}"
+        multi_start = ocp_module.prepare_multi_start(
+            combinatorial_parameters=combinatorial_parameters, save_folder=save_folder, build_once=build_once
+        )
+        prepared = []
+        prepare_ocp = multi_start.prepare_ocp_callback
+        multi_start.prepare_ocp_callback = lambda *args: prepared.append(args) or prepare_ocp(*args)
+        multi_start.solve()
+
+        # The ocp is prepared once per number of shooting nodes when the seeds are applied by updating it
+        assert len(prepared) == (2 if build_once else 4)
+
+        result = {}
+        for n in combinatorial_parameters["n_shooting"]:
+            for s in combinatorial_parameters["seed"]:
+                with open(ocp_module.construct_filepath(save_folder, n, s), "rb") as file:
+                    result[(n, s)] = pickle.load(file)
+        shutil.rmtree(save_folder)
+        results.append(result)
+
+    for key in results[0]:
+        npt.assert_almost_equal(results[1][key]["q"], results[0][key]["q"])
+        npt.assert_almost_equal(results[1][key]["qdot"], results[0][key]["qdot"])
+
+
+def test_multistart_workers_and_manifest():
+    from bioptim import MultiStartStatus
+    from bioptim.examples.getting_started import example_multistart as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    combinatorial_parameters = {
+        "bio_model_path": [bioptim_folder + "/examples/models/pendulum.bioMod"],
+        "final_time": [1],
+        "n_shooting": [5, 10],
+        "seed": [2, 1],
+    }
+    save_folder = "./Solutions_test_folder_workers"
+    manifest_path = f"{save_folder}/manifest.jsonl"
+    multi_start = ocp_module.prepare_multi_start(
+        combinatorial_parameters=combinatorial_parameters,
+        save_folder=save_folder,
+        n_pools=2,
+        manifest_path=manifest_path,
+    )
+
+    results = list(multi_start.solve_iter())
+    assert sorted(result[0] for result in results) == sorted(multi_start.combined_ocp_parameters)
+    assert all(result[1] == MultiStartStatus.SOLVED for result in results)
+    for n in combinatorial_parameters["n_shooting"]:
+        for s in combinatorial_parameters["seed"]:
+            assert os.path.exists(ocp_module.construct_filepath(save_folder, n, s))
+
+    with open(manifest_path, "r") as file:
+        assert len(file.readlines()) == 4
+
+    # Everything is in the manifest, so nothing is run again
+    assert list(multi_start.solve_iter()) == []
+
+    # The combinations which failed are run again
+    with open(manifest_path, "w") as file:
+        file.write('{"parameters": "[0]", "status": "failed"}\n')
+    os.remove(ocp_module.construct_filepath(save_folder, 5, 2))
+    results = list(multi_start.solve_iter())
+    assert len(results) == 4
+    assert sorted(result[1].value for result in results) == ["skipped"] * 3 + ["solved"]
+
+    shutil.rmtree(save_folder)
+
+
+class _FakeMultiStartSolution:
+    status = 0
+    cost = 1.0
+
+
+class _FakeMultiStartOcp:
+    def solve(self, solver):
+        return _FakeMultiStartSolution()
+
+
+def _prepare_misbehaving_ocp(behavior: str, flag_folder: str):
+    if behavior == "crash":
+        os._exit(1)
+    elif behavior == "crash_once":
+        flag = f"{flag_folder}/crashed_once"
+        if not os.path.exists(flag):
+            open(flag, "w").close()
+            os._exit(1)
+    elif behavior == "hang":
+        time.sleep(60)
+    return _FakeMultiStartOcp()
+
+
+def _return_behavior(sol, behavior: str, flag_folder: str):
+    return behavior
+
+
+def _always_solve(*combinatorial_parameters):
+    return True
+
+
+def test_multistart_worker_crash_and_timeout(tmp_path):
+    from bioptim import MultiStart, MultiStartStatus
+
+    manifest_path = str(tmp_path / "manifest.jsonl")
+    multi_start = MultiStart(
+        combinatorial_parameters={"behavior": ["ok", "crash_once", "crash", "hang"], "flag_folder": [str(tmp_path)]},
+        prepare_ocp_callback=_prepare_misbehaving_ocp,
+        post_optimization_callback=(_return_behavior, {}),
+        should_solve_callback=(_always_solve, {}),
+        n_pools=2,
+        task_timeout=2,
+        max_retries=1,
+        manifest_path=manifest_path,
+    )
+
+    tic = time.time()
+    results = {parameters[0]: (status, value) for parameters, status, value in multi_start.solve_iter()}
+    assert time.time() - tic < 30
+
+    # A single crash is retried, a worker which keeps crashing or hangs does not stop the others
+    assert results["ok"] == (MultiStartStatus.SOLVED, "ok")
+    assert results["crash_once"] == (MultiStartStatus.SOLVED, "crash_once")
+    assert results["crash"] == (MultiStartStatus.FAILED, "The worker crashed (exit code 1)")
+    assert results["hang"] == (MultiStartStatus.TIMEOUT, "The solve took more than 2 s")
+
+    with open(manifest_path, "r") as file:
+        assert len(file.readlines()) == 4
+
+    # Only the failed combinations are run again
+    results = {parameters[0]: status for parameters, status, _ in multi_start.solve_iter()}
+    assert results == {"crash": MultiStartStatus.FAILED, "hang": MultiStartStatus.TIMEOUT}
+
+
+def test_multistart_pruning_and_early_stop():
+    from bioptim import MultiStart, MultiStartStatus
+    from bioptim.examples.getting_started import example_multistart as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    combinatorial_parameters = {
+        "bio_model_path": [bioptim_folder + "/examples/models/pendulum.bioMod"],
+        "final_time": [1],
+        "n_shooting": [5, 10],
+        "seed": [2, 1],
+    }
+    save_folder = "./Solutions_test_folder_pruning"
+
+    # The combinations are sorted by the priority and the multi-start stops after the first converged one
+    multi_start = ocp_module.prepare_multi_start(
+        combinatorial_parameters=combinatorial_parameters, save_folder=save_folder
+    )
+    multi_start.priority_callback = (lambda path, final_time, n_shooting, seed: -n_shooting * 10 - seed, {})
+    multi_start.n_converged_to_stop = 1
+    results = list(multi_start.solve_iter())
+    assert len(results) == 1
+    assert results[0][0][2:] == [10, 2]
+    assert results[0][1] == MultiStartStatus.SOLVED
+    shutil.rmtree(save_folder)
+
+    # Without any tolerance, the solves are stopped as soon as they are worse than the best one so far
+    multi_start = ocp_module.prepare_multi_start(
+        combinatorial_parameters=combinatorial_parameters, save_folder=save_folder
+    )
+    multi_start.prune_tolerance = 0
+    multi_start.prune_min_iterations = 0
+    results = list(multi_start.solve_iter())
+    assert len(results) == 4
+    assert results[0][1] == MultiStartStatus.SOLVED
+    assert all(result[1] in (MultiStartStatus.SOLVED, MultiStartStatus.PRUNED) for result in results)
+    for parameters, status, _ in results:
+        file_path = ocp_module.construct_filepath(save_folder, parameters[2], parameters[3])
+        assert os.path.exists(file_path) == (status == MultiStartStatus.SOLVED)
+    shutil.rmtree(save_folder)
+
+    with pytest.raises(ValueError, match="prune_tolerance is only available with IPOPT"):
+        MultiStart(
+            combinatorial_parameters=combinatorial_parameters,
+            prepare_ocp_callback=ocp_module.prepare_ocp,
+            post_optimization_callback=(ocp_module.save_results, {}),
+            should_solve_callback=(ocp_module.should_solve, {}),
+            solver=Solver.SQP_METHOD(),
+            prune_tolerance=0.1,
+        )
+
+
 @pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
 def test_example_variable_scaling(phase_dynamics):
     from bioptim.examples.toy_examples.feature_examples import example_variable_scaling as ocp_module
@@ -1870,6 +2067,120 @@ def test_example_variable_scaling(phase_dynamics):
     test_memory[f"variable_scaling-{phase_dynamics}"] = [building_duration, solving_duration, mem_used]
 
 
+def test_c_compile_cache(tmp_path):
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+
+    if platform.system() == "Windows":
+        pytest.skip("Compiling the solver is not tested on Windows")
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    cache_dir = str(tmp_path / "solvers")
+
+    costs = []
+    for _ in range(2):
+        ocp = ocp_module.prepare_ocp(
+            biorbd_model_path=bioptim_folder + "/examples/models/pendulum.bioMod",
+            final_time=1,
+            n_shooting=10,
+        )
+        solver = Solver.IPOPT()
+        solver.set_c_compile(True)
+        solver.set_c_compile_cache_dir(cache_dir)
+        solver.set_print_level(0)
+        sol = ocp.solve(solver)
+        costs.append(float(sol.cost))
+
+        # Only the compiled library is kept in the cache, the second solve reloads it instead of compiling again
+        assert len(os.listdir(cache_dir)) == 1
+        assert os.listdir(cache_dir)[0].startswith("nlp_")
+
+    npt.assert_almost_equal(costs[0], costs[1])
+
+
+def test_c_compile_cache_on_another_filesystem(tmp_path, monkeypatch):
+    import errno
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+
+    if platform.system() == "Windows":
+        pytest.skip("Compiling the solver is not tested on Windows")
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    model_path = bioptim_folder + "/examples/models/pendulum.bioMod"
+    cache_dir = str(tmp_path / "cache" / "solvers")
+    working_dir = tmp_path / "working_dir"
+    working_dir.mkdir()
+    monkeypatch.chdir(working_dir)
+
+    # Renaming across filesystems is not possible, as if the cache was not on the same one as the working directory
+    replace = os.replace
+
+    def replace_on_same_folder_only(src, dst):
+        if os.path.dirname(os.path.abspath(src)) != os.path.dirname(os.path.abspath(dst)):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace_on_same_folder_only)
+
+    ocp = ocp_module.prepare_ocp(biorbd_model_path=model_path, final_time=1, n_shooting=10)
+    solver = Solver.IPOPT()
+    solver.set_c_compile(True)
+    solver.set_c_compile_cache_dir(cache_dir)
+    solver.set_print_level(0)
+    sol = ocp.solve(solver)
+    assert sol.status == 0
+
+    assert len(os.listdir(cache_dir)) == 1
+    assert os.listdir(cache_dir)[0].startswith("nlp_")
+    # Nothing is left in the working directory
+    assert os.listdir(working_dir) == []
+
+
+def test_save_and_load_ocp(tmp_path):
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    path = str(tmp_path / "pendulum.bo")
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/examples/models/pendulum.bioMod",
+        final_time=1,
+        n_shooting=10,
+    )
+    ocp.save(path)
+
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+    sol = ocp.solve(solver)
+
+    loaded_ocp = OptimalControlProgram.load(path)
+    assert loaded_ocp.n_phases == 1
+    npt.assert_almost_equal(loaded_ocp.init_vector, ocp.init_vector)
+    assert "STATE_CONTINUITY" in [penalty["name"] for penalty in loaded_ocp.penalties]
+
+    out = loaded_ocp.solve(solver)
+    assert out["status"] == 0
+    npt.assert_almost_equal(out["f"], np.array(sol.cost))
+    npt.assert_almost_equal(out["x"], sol.vector)
+
+    # The final time is fixed, so the time step was shaken out of the saved nlp
+    perturbed_vector = np.array(sol.vector)
+    perturbed_vector[0] += 1
+    for value, perturbed_value in zip(loaded_ocp.nlp_function(sol.vector), loaded_ocp.nlp_function(perturbed_vector)):
+        npt.assert_almost_equal(np.array(value), np.array(perturbed_value))
+
+    # Only the initial guess changes between the solves, so the solver is reused
+    nlp_solver = loaded_ocp.nlp_solver
+    loaded_ocp.init_vector = out["x"]
+    out = loaded_ocp.solve(solver)
+    assert loaded_ocp.nlp_solver is nlp_solver
+    npt.assert_almost_equal(out["x"], sol.vector)
+
+    # The vector can be split using the layout of the original ocp
+    unstacked = loaded_ocp.unstack(out["x"])
+    npt.assert_equal(unstacked[(0, "states", 0)].shape, (ocp.nlp[0].states.shape, 1))
+    npt.assert_almost_equal(unstacked[(0, "states", 0)], ocp.vector_layout.unstack(sol.vector)[(0, "states", 0)])
+
+
 def test_memory_and_execution_time():
 
     if platform.system() == "Windows":
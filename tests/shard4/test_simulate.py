@@ -621,6 +621,31 @@ def test_integrate_multiphase(shooting, integrator, ode_solver, phase_dynamics,
             assert len(sol_integrated[i][key][k]) == len(sol_time[i])
 
 
+@pytest.mark.parametrize("use_processes", [False, True])
+@pytest.mark.parametrize("integrator", [SolutionIntegrator.OCP, SolutionIntegrator.SCIPY_RK45])
+def test_integrate_multiple_shooting_in_parallel(integrator, use_processes):
+    from bioptim.examples.getting_started import example_multiphase as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/examples/models/cube.bioMod",
+        long_optim=False,
+        expand_dynamics=True,
+    )
+
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+    sol = ocp.solve(solver)
+
+    opts = {"shooting_type": Shooting.MULTIPLE, "integrator": integrator, "to_merge": SolutionMerge.NODES}
+    sol_integrated = sol.integrate(**opts)
+    sol_integrated_parallel = sol.integrate(**opts, n_pools=3, use_processes=use_processes)
+    for i in range(len(sol_integrated)):
+        for key in sol_integrated[i].keys():
+            npt.assert_almost_equal(sol_integrated_parallel[i][key], sol_integrated[i][key])
+
+
 def test_check_models_comes_from_same_super_class():
     from bioptim.examples.getting_started import example_multiphase as ocp_module
 
@@ -401,3 +401,303 @@ def test_generate_integrate(ode_solver, merge_phase, shooting_type, integrator,
     plt.rcParams["axes.titley"] = 1.0  # y is in axes-relative coordinates.
     plt.rcParams["axes.titlepad"] = -20
     # plt.show()
+
+
+@pytest.mark.parametrize("control_type", [ControlType.CONSTANT, ControlType.LINEAR_CONTINUOUS])
+def test_compiled_rhs(control_type):
+    from casadi import MX, Function, vertcat
+    import numpy as np
+    from bioptim.interfaces.solve_ivp_interface import CompiledRhs, _control_function
+
+    t, x, u, p, a, d = MX.sym("t"), MX.sym("x", 2), MX.sym("u", 1), MX.sym("p", 1), MX.sym("a", 0), MX.sym("d", 0)
+    dynamics = Function(
+        "dynamics",
+        [t, x, u, p, a, d],
+        [vertcat(x[1], -p * x[0] ** 3 + u * t)],
+        ["t", "x", "u", "p", "a", "d"],
+        ["xdot"],
+    )
+    jacobian = dynamics.factory("dynamics_jacobian", dynamics.name_in(), ["jac:xdot:x"])
+
+    t_span = np.array([[0.2], [0.5]])
+    controls = np.array([[1.0, 3.0]]) if control_type == ControlType.LINEAR_CONTINUOUS else np.array([[1.5]])
+    rhs = CompiledRhs(dynamics, control_type, t_span, controls, np.array([[2.0]]), np.array([]), np.array([]), jacobian)
+
+    states = np.array([0.3, -0.4])
+    for time in (0.2, 0.35, 0.5):
+        expected = dynamics(time, states, _control_function(control_type, time, t_span, controls), 2.0, [], [])
+        npt.assert_almost_equal(rhs(time, states), np.array(expected)[:, 0])
+        npt.assert_almost_equal(rhs.jacobian(time, states), [[0, 1], [-6 * states[0] ** 2, 0]])
+
+
+@pytest.mark.parametrize("method", ["BDF", "LSODA"])
+def test_compiled_rhs_jacobian_time_span(method):
+    from casadi import MX, Function, vertcat
+    import numpy as np
+    from scipy.integrate import solve_ivp
+    from bioptim.interfaces.solve_ivp_interface import CompiledRhs
+
+    # Stiff dynamics which depend on both the time and the time step, like the bioptim dynamics which receive [t, dt]
+    t_span_sym, x, u = MX.sym("t_span", 2), MX.sym("x", 2), MX.sym("u", 1)
+    p, a, d = MX.sym("p", 0), MX.sym("a", 0), MX.sym("d", 0)
+    stiffness = 50 * (1 + t_span_sym[0] + 10 * t_span_sym[1])
+    dynamics = Function(
+        "dynamics",
+        [t_span_sym, x, u, p, a, d],
+        [vertcat(x[1], -stiffness * x[0] - 2 * x[1] + u * t_span_sym[0])],
+        ["t", "x", "u", "p", "a", "d"],
+        ["xdot"],
+    )
+    jacobian = dynamics.factory("dynamics_jacobian", dynamics.name_in(), ["jac:xdot:x"])
+
+    t_span = np.array([0.2, 0.5])
+    states = np.array([0.3, -0.4])
+    empty = np.array([])
+    rhs = CompiledRhs(dynamics, ControlType.CONSTANT, t_span, np.array([[1.5]]), empty, empty, empty, jacobian)
+
+    # The jacobian receives the same time step as the dynamics
+    for time in (0.2, 0.35, 0.5):
+        npt.assert_almost_equal(rhs.jacobian(time, states), [[0, 1], [-50 * (1 + time + 10 * 0.3), -2]])
+
+    expected = solve_ivp(rhs, t_span=t_span, y0=states, method="RK45", rtol=1e-10, atol=1e-10).y[:, -1]
+    integrated = solve_ivp(rhs, t_span=t_span, y0=states, method=method, jac=rhs.jacobian, rtol=1e-10, atol=1e-10).y[
+        :, -1
+    ]
+    npt.assert_almost_equal(integrated, expected, decimal=6)
+
+
+@pytest.mark.parametrize("control_type", [ControlType.CONSTANT, ControlType.LINEAR_CONTINUOUS])
+def test_compiled_rhs_with_ocp_dynamics(control_type):
+    from casadi import vertcat
+    import numpy as np
+    from scipy.integrate import solve_ivp
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+    from bioptim.interfaces.solve_ivp_interface import CompiledRhs, _control_function
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/examples/models/pendulum.bioMod",
+        final_time=1,
+        n_shooting=10,
+        control_type=control_type,
+    )
+
+    # The real dynamics of bioptim receive the time span [t, dt]
+    dynamics = ocp.nlp[0].dynamics_func
+    assert dynamics.nnz_in(0) == 2
+
+    t_span = np.array([0.2, 0.3])
+    states = np.array([0.1, 0.2, -0.3, 0.4])
+    controls = np.array([[1.0, 2.0], [0.0, 0.0]])
+    if control_type == ControlType.CONSTANT:
+        controls = controls[:, :1]
+    empty = np.array([])
+    rhs = CompiledRhs(dynamics, control_type, t_span, controls, empty, empty, empty)
+
+    u = _control_function(control_type, 0.25, t_span[:, None], controls)
+    expected = dynamics(vertcat(0.25, t_span[1] - t_span[0]), states, u, empty, empty, empty)
+    npt.assert_almost_equal(rhs(0.25, states), np.array(expected)[:, 0])
+
+    # Same integration as before the dynamics were compiled
+    expected = solve_ivp(
+        lambda t, x: np.array(
+            dynamics(t, x, _control_function(control_type, t, t_span[:, None], controls), empty, empty, empty)
+        )[:, 0],
+        t_span=t_span,
+        y0=states,
+        method="RK45",
+    ).y
+    npt.assert_almost_equal(solve_ivp(rhs, t_span=t_span, y0=states, method="RK45").y, expected)
+
+
+@pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
+@pytest.mark.parametrize("ode_solver", [OdeSolver.RK4, OdeSolver.COLLOCATION])
+def test_cost_mapped_over_nodes(ode_solver, phase_dynamics):
+    # Load pendulum
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/examples/models/pendulum.bioMod",
+        final_time=2,
+        n_shooting=10,
+        ode_solver=ode_solver(),
+        phase_dynamics=phase_dynamics,
+        expand_dynamics=True,
+    )
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+
+    sol = ocp.solve(solver=solver)
+    assert ocp.nlp[0].J[0].is_mappable
+
+    # Recompute the cost from the solution instead of using the value returned by the solver
+    expected_cost = float(sol.cost)
+    sol._cost = None
+    npt.assert_almost_equal(float(sol.cost), expected_cost)
+    npt.assert_almost_equal(sum(cost["cost_value_weighted"] for cost in sol.detailed_cost), expected_cost)
+
+
+@pytest.mark.parametrize("control_type", [ControlType.CONSTANT, ControlType.LINEAR_CONTINUOUS])
+def test_solution_data_are_views_of_the_vector(control_type):
+    import numpy as np
+
+    # Load pendulum
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/examples/models/pendulum.bioMod",
+        final_time=2,
+        n_shooting=10,
+        control_type=control_type,
+    )
+    solver = Solver.IPOPT()
+    solver.set_maximum_iterations(5)
+    solver.set_print_level(0)
+
+    sol = ocp.solve(solver=solver)
+    unstacked = ocp.vector_layout.unstack(sol.vector)
+
+    # The scaled values are read directly from the vector
+    last_q = sol._decision_states.scaled[0]["q"][-1]
+    assert np.shares_memory(last_q, sol.vector)
+    npt.assert_almost_equal(last_q, unstacked[(0, "states", 10)][:2, :])
+
+    states = sol.decision_states()
+    npt.assert_almost_equal(states["q"][-1], last_q)
+    npt.assert_almost_equal(sol.decision_states(to_merge=SolutionMerge.NODES)["qdot"][:, 3:4], states["qdot"][3])
+
+    controls = sol.stepwise_controls()
+    n_cols = 2 if control_type == ControlType.LINEAR_CONTINUOUS else 1
+    assert controls["tau"][0].shape == (2, n_cols)
+    npt.assert_almost_equal(controls["tau"][0][:, :1], unstacked[(0, "controls", 0)])
+    if control_type == ControlType.LINEAR_CONTINUOUS:
+        npt.assert_almost_equal(controls["tau"][0][:, 1:], unstacked[(0, "controls", 1)])
+
+
+def test_save_and_load_solution(tmp_path):
+    import numpy as np
+    from bioptim import LoadedSolution, Solution
+
+    # Load pendulum
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/examples/models/pendulum.bioMod",
+        final_time=2,
+        n_shooting=10,
+    )
+    solver = Solver.IPOPT()
+    solver.set_maximum_iterations(5)
+    solver.set_print_level(0)
+
+    sol = ocp.solve(solver=solver)
+    path = str(tmp_path / "solution")
+    sol.save(path)
+
+    # Without the ocp, the archive is memory-mapped
+    loaded = Solution.load(path)
+    assert isinstance(loaded, LoadedSolution)
+    assert isinstance(loaded.vector, np.memmap)
+    assert loaded.status == sol.status
+    assert loaded.iterations == sol.iterations
+    npt.assert_almost_equal(loaded.cost, float(sol.cost))
+    npt.assert_almost_equal(loaded.lam_g, sol.lam_g)
+    npt.assert_almost_equal(
+        loaded.decision_states(to_merge=SolutionMerge.NODES)["q"],
+        sol.decision_states(to_merge=SolutionMerge.NODES)["q"],
+    )
+    npt.assert_almost_equal(loaded.get("u", "tau"), sol.stepwise_controls(to_merge=SolutionMerge.NODES)["tau"])
+    for loaded_time, time in zip(loaded.stepwise_time(), sol._stepwise_times[0]):
+        npt.assert_almost_equal(loaded_time, np.array(time).reshape(-1, 1))
+
+    # With the ocp, a full Solution is rebuilt
+    reloaded = Solution.load(path, ocp=ocp)
+    npt.assert_almost_equal(reloaded.vector, sol.vector)
+    npt.assert_almost_equal(float(reloaded.cost), float(sol.cost))
+    npt.assert_almost_equal(
+        reloaded.decision_states(to_merge=SolutionMerge.ALL), sol.decision_states(to_merge=SolutionMerge.ALL)
+    )
+
+
+@pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
+@pytest.mark.parametrize("ode_solver", [OdeSolver.RK4, OdeSolver.COLLOCATION])
+def test_stepwise_states_from_integrator_outputs(ode_solver, phase_dynamics):
+    from bioptim import Solution
+
+    # Load pendulum
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/examples/models/pendulum.bioMod",
+        final_time=2,
+        n_shooting=10,
+        ode_solver=ode_solver(),
+        phase_dynamics=phase_dynamics,
+    )
+    solver = Solver.IPOPT()
+    solver.set_maximum_iterations(5)
+    solver.set_print_level(0)
+
+    sol = ocp.solve(solver=solver)
+    states = sol.stepwise_states(to_merge=SolutionMerge.NODES)
+
+    from_outputs = Solution.from_vector(ocp, sol.vector)
+    states_from_outputs = from_outputs.stepwise_states(to_merge=SolutionMerge.NODES, from_integrator_outputs=True)
+    for key in states.keys():
+        npt.assert_almost_equal(states_from_outputs[key], states[key])
+
+    # The functions are built once for the ocp and the states are cached in the solution
+    functions = ocp.stepwise_states_functions
+    Solution.from_vector(ocp, sol.vector).stepwise_states(from_integrator_outputs=True)
+    assert ocp.stepwise_states_functions is functions
+
+    cached = from_outputs._stepwise_states
+    from_outputs.stepwise_states()
+    assert from_outputs._stepwise_states is cached
+
+
+@pytest.mark.parametrize("ode_solver", [OdeSolver.RK4, OdeSolver.COLLOCATION])
+def test_interpolant_is_reused(ode_solver):
+    import numpy as np
+
+    # Load pendulum
+    from bioptim.examples.getting_started import basic_ocp as ocp_module
+
+    bioptim_folder = TestUtils.bioptim_folder()
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/examples/models/pendulum.bioMod",
+        final_time=2,
+        n_shooting=10,
+        ode_solver=ode_solver(),
+    )
+    solver = Solver.IPOPT()
+    solver.set_maximum_iterations(5)
+    solver.set_print_level(0)
+
+    sol = ocp.solve(solver=solver)
+    interpolant = sol.interpolant()
+
+    for n_frames in (5, 20, 101):
+        interpolated = sol.interpolate(n_frames)
+        assert interpolated["q"].shape == (2, n_frames)
+
+        # All the states are interpolated at once and the interpolant is only built once
+        x = interpolant(np.linspace(interpolant.x[0], interpolant.x[-1], n_frames))
+        npt.assert_almost_equal(x[ocp.nlp[0].states["q"].index, :], interpolated["q"])
+        npt.assert_almost_equal(x[ocp.nlp[0].states["qdot"].index, :], interpolated["qdot"])
+        assert sol.interpolant() is interpolant
+
+    # The interpolation starts from the stepwise states
+    states = sol.stepwise_states(to_merge=SolutionMerge.NODES)
+    interpolated = sol.interpolate(7)
+    npt.assert_almost_equal(interpolated["q"][:, 0], states["q"][:, 0])
+    npt.assert_almost_equal(sol.interpolate([7])["q"], interpolated["q"])
@@ -40,6 +40,7 @@ def test_ipopt_solver_options():
     assert solver.bound_frac == 0.01
     assert solver.print_level == 5
     assert solver.c_compile is False
+    assert solver.c_compile_cache_dir is None
     assert solver.check_derivatives_for_naninf == "no"
 
     solver.set_linear_solver("ma57")
@@ -90,6 +91,8 @@ def test_ipopt_solver_options():
     assert solver.print_level == 20
     solver.set_c_compile(True)
     assert solver.c_compile is True
+    solver.set_c_compile_cache_dir("compiled_solvers")
+    assert solver.c_compile_cache_dir == "compiled_solvers"
     solver.set_check_derivatives_for_naninf(True)
     assert solver.check_derivatives_for_naninf == "yes"
 
@@ -124,6 +127,7 @@ def test_ipopt_solver_options():
     assert solver_dict["ipopt.casino_gain"] == 777
     assert solver_dict["ipopt.tol"] == 21
     assert not "_c_compile" in solver_dict
+    assert not "ipopt.c_compile_cache_dir" in solver_dict
     assert not "type" in solver_dict
     assert not "show_online_optim" in solver_dict
     assert not "online_optim" in solver_dict
@@ -18,6 +18,10 @@ from bioptim import (
     PhaseDynamics,
     VariableScaling,
     Parameter,
+    ObjectiveList,
+    ObjectiveFcn,
+    Solver,
+    SolutionMerge,
 )
 from tests.utils import TestUtils
 
@@ -174,6 +178,81 @@ def test_double_update_bounds_and_init(phase_dynamics):
         ocp.nlp[0]._update_bound(bound, "x_bounds", ["hello", "world"], [])
 
 
+def test_vectors_are_cached_until_updated():
+    bioptim_folder = TestUtils.bioptim_folder()
+    bio_model = TorqueBiorbdModel(bioptim_folder + "/examples/models/cube_and_line.bioMod")
+    nq = bio_model.nb_q
+    ocp = OptimalControlProgram(bio_model, 10, 1.0, dynamics=DynamicsOptions())
+    assert ocp.vectors_computation_count == {"variables_vector": 0, "bounds_vectors": 0, "init_vector": 0}
+
+    for _ in range(3):
+        v = ocp.variables_vector
+        v_bounds = ocp.bounds_vectors
+        v_init = ocp.init_vector
+    assert ocp.vectors_computation_count == {"variables_vector": 1, "bounds_vectors": 1, "init_vector": 1}
+    assert ocp.variables_vector is v
+
+    x_bounds = BoundsList()
+    x_bounds["q"] = -np.ones((nq, 1)), np.ones((nq, 1))
+    ocp.update_bounds(x_bounds=x_bounds)
+    assert ocp.bounds_vectors is not v_bounds
+    assert ocp.init_vector is v_init
+    npt.assert_almost_equal(ocp.bounds_vectors[0][1 : nq + 1], -np.ones((nq, 1)))
+    assert ocp.vectors_computation_count == {"variables_vector": 1, "bounds_vectors": 2, "init_vector": 1}
+
+    x_init = InitialGuessList()
+    x_init["q"] = 0.5 * np.ones((nq, 1))
+    ocp.update_initial_guess(x_init=x_init)
+    npt.assert_almost_equal(ocp.init_vector[1 : nq + 1], 0.5 * np.ones((nq, 1)))
+    assert ocp.vectors_computation_count == {"variables_vector": 1, "bounds_vectors": 2, "init_vector": 2}
+
+
+def test_update_bounds_and_init_reuse_solver():
+    bioptim_folder = TestUtils.bioptim_folder()
+    bio_model = TorqueBiorbdModel(bioptim_folder + "/examples/models/cube_and_line.bioMod")
+    nq = bio_model.nb_q
+
+    objective_functions = ObjectiveList()
+    objective_functions.add(ObjectiveFcn.Lagrange.MINIMIZE_CONTROL, key="tau")
+    x_bounds = BoundsList()
+    x_bounds["q"] = -np.ones((nq, 1)), np.ones((nq, 1))
+    x_bounds["qdot"] = -np.ones((nq, 1)), np.ones((nq, 1))
+    ocp = OptimalControlProgram(
+        bio_model, 10, 1.0, dynamics=DynamicsOptions(), x_bounds=x_bounds, objective_functions=objective_functions
+    )
+    assert ocp.are_objectives_modified
+    assert ocp.are_constraints_modified
+
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+    ocp.solve(solver)
+    assert not ocp.are_objectives_modified
+    assert not ocp.are_constraints_modified
+    shaked_ocp_solver = ocp.ocp_solver.shaked_ocp_solver
+
+    def _should_not_be_dispatched():
+        raise RuntimeError("The penalties should not be dispatched again")
+
+    ocp.ocp_solver.dispatch_obj_func = _should_not_be_dispatched
+    ocp.ocp_solver.dispatch_bounds = _should_not_be_dispatched
+
+    # Changing the bounds and the initial guess only modifies the numerical values sent to the solver
+    x_bounds["q"] = -0.5 * np.ones((nq, 1)), 0.5 * np.ones((nq, 1))
+    ocp.update_bounds(x_bounds=x_bounds)
+    x_init = InitialGuessList()
+    x_init["q"] = 0.1 * np.ones((nq, 1))
+    ocp.update_initial_guess(x_init=x_init)
+    sol = ocp.solve(solver)
+    assert ocp.ocp_solver.shaked_ocp_solver is shaked_ocp_solver
+    assert np.all(np.abs(sol.decision_states(to_merge=SolutionMerge.NODES)["q"]) <= 0.5 + 1e-6)
+    npt.assert_almost_equal(ocp.ocp_solver.limits["lbx"], ocp.bounds_vectors[0])
+
+    # Modifying the penalties flags them to be dispatched again
+    ocp.update_objectives(objective_functions)
+    assert ocp.are_objectives_modified
+    assert not ocp.are_constraints_modified
+
+
 @pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
 def test_update_bounds_and_init_with_param(phase_dynamics):
     def my_parameter_function(bio_model, parameter: Parameter, extra_value):
@@ -591,3 +591,11 @@ def test_obstacle_avoidance_direct_collocation(use_sx: bool):
     npt.assert_almost_equal(
         cov[:, -1].reshape(4, 4)[:2, :2], np.array([[0.00147778, -0.00102866], [-0.00102866, 0.00210025]]), decimal=6
     )
+
+    # Same samples, integrated all at once
+    np.random.seed(42)
+    integrated_states_lockstep = sol.noisy_integrate(
+        integrator=SolutionIntegrator.SCIPY_RK45, to_merge=SolutionMerge.NODES, lockstep=True, n_threads=2
+    )
+    assert integrated_states_lockstep["q"].shape == integrated_states["q"].shape
+    npt.assert_almost_equal(np.cov(integrated_states_lockstep["q"][:, -1, :]), integrated_stated_covariance, decimal=3)
@@ -3,6 +3,7 @@ from bioptim.gui.plot import PlotOcp
 from bioptim.gui.online_callback_server import _ResponseHeader
 from bioptim.optimization.optimization_vector import OptimizationVectorHelper
 from casadi import DM
+import logging
 import numpy as np
 
 from ..utils import TestUtils
@@ -43,6 +44,38 @@ def test_serialize_deserialize():
                 assert np.allclose(y_phase, deserialized_y_phase)
 
 
+def test_recv_into_reused_buffers():
+    import socket
+
+    from bioptim.gui.online_callback_server import PlottingServer
+
+    client, server = socket.socketpair()
+    plotting_server = PlottingServer.__new__(PlottingServer)
+    plotting_server._recv_buffers = []
+    plotting_server._logger = logging.getLogger("test_recv_into_reused_buffers")
+
+    all_received = []
+    for n_nodes in (5, 3, 8):
+        xdata = [[np.linspace(0, 1, n_nodes)[:, None]]]
+        ydata = [[np.arange(n_nodes, dtype=float)]]
+        header, data = _serialize_xydata(xdata, ydata)
+        client.sendall(header)
+        client.sendall(data)
+        received = plotting_server._recv_serialize_data(server, False, [len(header), len(data)])
+        all_received.append((n_nodes, _deserialize_xydata(received)))
+
+    # The buffers are only grown for the largest message, and they are reused from one message to the next
+    assert [len(buffer) for buffer in plotting_server._recv_buffers] == [len(header), len(data)]
+
+    # The deserialized data do not change when the buffers receive the next messages
+    for n_nodes, (xdata, ydata) in all_received:
+        np.testing.assert_almost_equal(xdata[0][0], np.linspace(0, 1, n_nodes))
+        np.testing.assert_almost_equal(ydata[0][0], np.arange(n_nodes))
+
+    client.close()
+    server.close()
+
+
 def test_response_header():
     # Make sure all the response have the same length
     response_len = _ResponseHeader.response_len()
@@ -62,3 +95,66 @@ def test_response_header():
     assert not (_ResponseHeader.OK.value == _ResponseHeader.OK.encode().decode())
     assert _ResponseHeader.OK != _ResponseHeader.NOK
     assert _ResponseHeader.NOK == _ResponseHeader.NOK
+
+
+def test_online_callback_server_eval_does_not_parse():
+    import socket
+    import threading
+    import time
+
+    from casadi import nlpsol_out
+    from bioptim.gui.online_callback_server import (
+        OnlineCallbackServer,
+        _MESSAGE_HEADER,
+        _LENGTH_DTYPE,
+        _ServerMessages,
+        _recv_exactly,
+    )
+
+    class SlowPlotter:
+        def parse_data(self, **args):
+            time.sleep(0.1)
+            return [[args["x"][:2]]], [args["x"][:, 0]]
+
+    def recv_xydata(server):
+        message_type, n_data = _MESSAGE_HEADER.unpack(_recv_exactly(server, _MESSAGE_HEADER.size))
+        assert message_type == _ServerMessages.NEW_DATA
+        data_lengths = np.frombuffer(_recv_exactly(server, n_data * _LENGTH_DTYPE.itemsize), dtype=_LENGTH_DTYPE)
+        return _deserialize_xydata([_recv_exactly(server, int(data_len)) for data_len in data_lengths])
+
+    def iterate(value):
+        return [DM(np.full((4, 1), value)) if name in ("x", "lam_x") else DM(0) for name in nlpsol_out()]
+
+    client, server = socket.socketpair()
+    callback = OnlineCallbackServer.__new__(OnlineCallbackServer)
+    callback._socket = client
+    callback._plotter = SlowPlotter()
+    callback._should_wait_ok_to_client_on_new_data = False
+    callback._start_sender()
+
+    # The solver is not blocked while the server is not ready, and only the most recent iterate is sent
+    tic = time.time()
+    for value in range(5):
+        assert callback.eval(iterate(value)) == [0]
+    assert time.time() - tic < 0.1
+    server.sendall(_ResponseHeader.READY_FOR_NEXT_DATA.encode())
+    xdata, ydata = recv_xydata(server)
+    np.testing.assert_almost_equal(ydata[0][0], [4, 4, 4, 4])
+
+    # Enforced data (the last iteration) are waited for
+    received = []
+
+    def serve():
+        server.sendall(_ResponseHeader.READY_FOR_NEXT_DATA.encode())
+        received.append(recv_xydata(server))
+
+    server_thread = threading.Thread(target=serve)
+    server_thread.start()
+    callback.eval(iterate(42), enforce=True)
+    server_thread.join()
+    np.testing.assert_almost_equal(received[0][1][0][0], [42, 42, 42, 42])
+
+    callback.close()
+    callback._sender.join()
+    assert callback.eval(iterate(0)) == [0]
+    server.close()